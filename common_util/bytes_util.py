@@ -4,8 +4,22 @@
 Utilities for Handling Array of Bytes
 '''
 
+import os
+import re
+import mmap
+import stat
+import array
+import struct
+import codecs
 import binascii
+import itertools
 import sys
+from contextlib import contextmanager
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class BytesUtility:
     '''
@@ -20,10 +34,13 @@ class BytesUtility:
         '''
         Compute the XOR of two arrays of bytes.
 
+        The arrays of bytes are XORed a block at a time, with NumPy if it is
+        installed, or otherwise as big integers, instead of byte by byte.
+
         :param b1: Array of bytes 1
         :param b2: Array of bytes 2
-        :type b1: bytes
-        :type b2: bytes
+        :type b1: bytes, or bytes-like object such as bytearray, mmap or memoryview
+        :type b2: bytes, or bytes-like object such as bytearray, mmap or memoryview
 
         :param trancate: If True, XOR of the stream will only be computed until the end
             of the shorter array of bytes. If False, the remaining of the longer array will
@@ -34,20 +51,71 @@ class BytesUtility:
         :return: The XOR of the two arrays of bytes
         :rtype: bytes
         '''
-        result = bytes([v1 ^ v2 for v1, v2 in zip(b1, b2)])
-        
-        if not trancate:
-            b1_len = len(b1)
-            b2_len = len(b2)
-            if b1_len > b2_len:
-                result += b1[b2_len:]
-            elif b1_len < b2_len:
-                result += b2[b1_len:]
-            else:
-                # b1_len == b2_len, so do nothing
-                pass
-            
-        return result
+        result_length = min(len(b1), len(b2)) if trancate else max(len(b1), len(b2))
+        result = bytearray(result_length)
+        BytesUtility.xor_into(b1, b2, result, trancate=trancate)
+        return bytes(result)
+
+    @staticmethod
+    def xor_into(b1: bytes, b2: bytes, out: bytearray, trancate=True):
+        '''
+        Compute the XOR of two arrays of bytes into an array of bytes supplied by
+        the caller, as in xor(), so that no array of bytes is allocated for the
+        result.
+
+        out can be b1 or b2 itself, for XOR in place.
+
+        :param b1: Array of bytes 1
+        :param b2: Array of bytes 2
+        :type b1: bytes, or bytes-like object such as bytearray, mmap or memoryview
+        :type b2: bytes, or bytes-like object such as bytearray, mmap or memoryview
+        :param out: the writable array of bytes to store the result at its start
+        :type out: bytearray, or writable bytes-like object such as memoryview
+
+        :param trancate: see xor()
+        :type trancate: bool, optional
+
+        :raise: ValueError if out is shorter than the result
+
+        :return: the number of bytes of the result stored in out
+        :rtype: int
+        '''
+        b1_len = len(b1)
+        b2_len = len(b2)
+        length = min(b1_len, b2_len)
+        result_length = length if trancate else max(b1_len, b2_len)
+        if len(out) < result_length:
+            raise ValueError(
+                f'the output array of bytes is too short ({len(out)} < {result_length})'
+            )
+        out_view = memoryview(out)
+        if numpy is not None:
+            numpy.bitwise_xor(
+                numpy.frombuffer(b1, dtype=numpy.uint8, count=length),
+                numpy.frombuffer(b2, dtype=numpy.uint8, count=length),
+                out=numpy.frombuffer(out_view, dtype=numpy.uint8, count=length)
+            )
+        else:
+            b1_view = memoryview(b1)
+            b2_view = memoryview(b2)
+            block_size = BytesUtility.xor_block_size
+            for start_pos in range(0, length, block_size):
+                end_pos = min(start_pos + block_size, length)
+                value = int.from_bytes(b1_view[start_pos:end_pos], 'little') \
+                    ^ int.from_bytes(b2_view[start_pos:end_pos], 'little')
+                out_view[start_pos:end_pos] = value.to_bytes(end_pos - start_pos, 'little')
+
+        if b1_len > length:
+            out_view[length:result_length] = memoryview(b1)[length:result_length]
+        elif b2_len > length:
+            out_view[length:result_length] = memoryview(b2)[length:result_length]
+        return result_length
+
+    xor_block_size = 256 * 1024
+    '''
+    The number of bytes to XOR as big integers at a time in xor_into(), when
+    NumPy is not installed.
+    '''
     
     # --- Bytes Extractions
 
@@ -57,7 +125,7 @@ class BytesUtility:
         Check if the given array of bytes has enough number of bytes in it.
 
         :param data: the array of bytes to check
-        :type data: bytes
+        :type data: bytes, or bytes-like object such as mmap or memoryview
 
         :param offset: the offset of the first required byte, counting from pos
         :param length: the number of bytes required
@@ -81,7 +149,7 @@ class BytesUtility:
         Extract the required bytes from the given array of bytes.
 
         :param data: the array of bytes containing the bytes to be extracted
-        :type data: bytes
+        :type data: bytes, or bytes-like object such as mmap or memoryview
 
         :param offset: the offset of the first byte to extract, counting from pos
         :param length: the number of bytes to extract
@@ -90,8 +158,10 @@ class BytesUtility:
         :type length: int
         :type pos: int, optional
 
-        :return: the extracted bytes
-        :rtype: bytes
+        :return: the extracted bytes;
+            (a) a slice of a memoryview is a memoryview, which shares the memory
+            of data instead of copying it
+        :rtype: bytes or memoryview
         '''
         return data[pos+offset:pos+offset+length]
 
@@ -101,7 +171,7 @@ class BytesUtility:
         Extract the required bytes from the given array of bytes and convert to integer.
 
         :param data: the array of bytes containing the bytes to be extracted
-        :type data: bytes
+        :type data: bytes, or bytes-like object such as mmap or memoryview
 
         :param offset: the offset of the first byte to extract, counting from pos
         :param length: the number of bytes to extract
@@ -119,6 +189,86 @@ class BytesUtility:
         '''
         return int.from_bytes(data[pos+offset:pos+offset+length], endian)
     
+    @staticmethod
+    def extract_integer_column(data: bytes, offset: int, length: int, stride: int, pos=0,
+                               endian='little', signed=False, count=-1):
+        '''
+        Extract an integer field from every record in the given array of bytes, as
+        extract_integer() does for a single record.
+
+        The records are stride bytes apart, starting at pos. The bytes of the field
+        are gathered by slicing with a step, without looping over the records, and
+        converted to integers by array.array.
+
+        :param data: the array of bytes containing the records
+        :type data: bytes, or bytes-like object such as mmap or memoryview
+
+        :param offset: the offset of the field in each record
+        :param length: the number of bytes of the field; from 1 to 8
+        :param stride: the number of bytes from the start of a record to the start
+            of the next one
+        :param pos: the starting position of the first record
+        :type offset: int
+        :type length: int
+        :type stride: int
+        :type pos: int, optional
+
+        :param endian: the endian to used for converting the bytes to integer;
+            (a) acceptable values are 'little' and 'big'
+        :param signed: when True, the field is a signed integer
+        :param count: the maximum number of records;
+            (a) negative value means all the records that have the field in data
+        :type endian: str, optional
+        :type signed: bool, optional
+        :type count: int, optional
+
+        :raise: ValueError
+
+        :return: the integers of the field in the records; use
+            numpy.frombuffer(result, dtype=...) for a NumPy array without copying
+        :rtype: array.array
+        '''
+        if length <= 0 or length > 8:
+            raise ValueError(f'length must be from 1 to 8 ({length})')
+        if stride <= 0:
+            raise ValueError(f'stride must be positive ({stride})')
+        if endian not in ('little', 'big'):
+            raise ValueError(f'invalid endian ({endian})')
+        start_pos = pos + offset
+        if start_pos < 0:
+            raise ValueError(f'the field starts before data ({start_pos})')
+        record_count = max((len(data) - start_pos - length) // stride + 1, 0)
+        if count >= 0:
+            record_count = min(record_count, count)
+
+        typecode = BytesUtility.get_array_typecode(length, signed)
+        item_length = array.array(typecode).itemsize
+        items = bytearray(record_count * item_length)
+        if record_count > 0:
+            # - the bytes are placed in little endian order, i.e. the k-th byte of
+            #   each item is the k-th least significant byte
+            span = (record_count - 1) * stride + 1
+            for k in range(length):
+                significance = k if endian == 'little' else length - 1 - k
+                items[significance::item_length] = data[start_pos+k:start_pos+k+span:stride]
+            if signed and item_length > length:
+                # - extend the sign to the bytes that the field does not have
+                sign_bytes = items[length-1::item_length].translate(BytesUtility.sign_table)
+                for k in range(length, item_length):
+                    items[k::item_length] = sign_bytes
+
+        result = array.array(typecode)
+        result.frombytes(items)
+        if sys.byteorder != 'little':
+            result.byteswap()
+        return result
+
+    sign_table = bytes([ 0x00 ] * 0x80 + [ 0xff ] * 0x80)
+    '''
+    The table for bytes.translate() to convert the most significant byte of
+    an integer to the byte that extends its sign.
+    '''
+
     @staticmethod
     def extract_bytes_until(data: bytes, offset: int, marker: bytes, step=1,
                             pos=0, max_search_length=-1,
@@ -127,14 +277,16 @@ class BytesUtility:
         Extract the bytes from the given array of bytes until some specified bytes appear.
 
         :param data: the array of bytes containing the bytes to be extracted
-        :type data: bytes
+        :type data: bytes, or bytes-like object such as mmap or memoryview
 
         :param offset: the offset of the first byte to extract, counting from pos
         :param marker: the specified bytes to search for
         :param step: the number of bytes to advance when searching for marker;
             default is 1
         :param pos: the starting position in the byte stream; default is 0
-        :param max_search_length:
+        :param max_search_length: the number of bytes from the starting position
+            within which the marker must start; zero or negative value means search
+            till the end of data
         :type offset: int
         :type marker: bytes
         :type step: int, optional
@@ -149,12 +301,16 @@ class BytesUtility:
         :type include_marker: bool, optional
         :type empty_if_not_found: bool, optional
 
+        :raise: ValueError if marker is empty, or step is not positive
+
         :return: the extracted bytes
         :rtype: bytes
         '''
         marker_length = len(marker)
         if marker_length <= 0:
             raise ValueError('marker length cannot be zero')
+        if step <= 0:
+            raise ValueError(f'step must be positive ({step})')
         
         start_pos = pos + offset
         if max_search_length > 0:
@@ -163,18 +319,28 @@ class BytesUtility:
         else:
             end_pos = len(data)
 
-        curr_pos = start_pos
-        found = False
-        while curr_pos < end_pos:
-            if data[curr_pos:curr_pos+marker_length] == marker:
-                found = True
-                break
-            curr_pos += step
+        if start_pos >= 0:
+            found_pos = BytesUtility.find_marker(data, marker, start_pos, end_pos, step=step)
+            found = found_pos >= 0
+        else:
+            # - a negative position counts from the end of data in the slices,
+            #   so search one position at a time as before
+            found_pos = start_pos
+            found = False
+            while found_pos < end_pos:
+                if data[found_pos:found_pos+marker_length] == marker:
+                    found = True
+                    break
+                found_pos += step
 
-        curr_length = curr_pos - start_pos
-        if found and include_marker:
-            # add the marker if found
-            curr_length += marker_length
+        if found:
+            curr_length = found_pos - start_pos
+            if include_marker:
+                # add the marker if found
+                curr_length += marker_length
+        else:
+            # - up to the first position of the search after end_pos
+            curr_length = max(end_pos - start_pos + step - 1, 0) // step * step
 
         extracted_bytes = data[start_pos:start_pos+curr_length]
 
@@ -183,6 +349,966 @@ class BytesUtility:
 
         return extracted_bytes
 
+    @staticmethod
+    def find_marker(data: bytes, marker: bytes, start_pos: int, end_pos: int, step=1):
+        '''
+        (Internal) Find the first position of marker in data, at one of the
+        positions start_pos, start_pos + step, start_pos + 2 * step, ... before
+        end_pos, as searched by extract_bytes_until().
+
+        The search is done by data.find(), instead of comparing the bytes at each
+        position. A match may extend beyond end_pos, but not beyond the end of data.
+
+        :meta private:
+        :param data: the array of bytes to search
+        :type data: bytes, or bytes-like object such as mmap or memoryview
+        :param marker: the bytes to search for; cannot be empty
+        :type marker: bytes
+        :param start_pos: the first position to search; cannot be negative
+        :type start_pos: int
+        :param end_pos: the position to end the search
+        :type end_pos: int
+        :param step: the number of bytes between the positions to search
+        :type step: int, optional
+
+        :return: the position of marker, or -1 if it is not found
+        :rtype: int
+        '''
+        end_pos = min(end_pos, len(data))
+        if start_pos >= end_pos:
+            return -1
+        search_end_pos = min(end_pos - 1 + len(marker), len(data))
+        base_pos = 0
+        if not hasattr(data, 'find'):
+            # - memoryview has no find(), so search a copy of the range
+            data = bytes(data[start_pos:search_end_pos])
+            base_pos = start_pos
+        curr_pos = start_pos
+        while curr_pos < end_pos:
+            found_pos = data.find(marker, curr_pos - base_pos, search_end_pos - base_pos)
+            if found_pos < 0:
+                return -1
+            found_pos += base_pos
+            misalignment = (found_pos - start_pos) % step
+            if misalignment == 0:
+                return found_pos
+            # - continue from the next position of the search
+            curr_pos = found_pos + step - misalignment
+        return -1
+
+    @staticmethod
+    def get_array_typecode(length, signed=False):
+        '''
+        (Internal) Get the smallest typecode of array.array for the integers of
+        the given number of bytes.
+
+        :meta private:
+        :param length: the number of bytes of the integers; from 1 to 8
+        :type length: int
+        :param signed: when True, the typecode is for signed integers
+        :type signed: bool, optional
+
+        :raise: ValueError if no typecode has enough bytes
+
+        :return: the typecode
+        :rtype: str
+        '''
+        for typecode in ('bhilq' if signed else 'BHILQ'):
+            if array.array(typecode).itemsize >= length:
+                return typecode
+        raise ValueError(f'no array typecode for integers of {length} bytes')
+
+    # --- Search for Multiple Markers
+
+    class MarkerMatcher:
+        '''
+        A matcher that finds whichever of several markers comes first in an array
+        of bytes, in a single pass over it.
+
+        The markers are compiled once into a regular expression, so the matcher
+        can be reused for any number of arrays of bytes. When more than one marker
+        matches at the same position, the longest one is taken; for example, with
+        the markers b'\\r\\n' and b'\\n', b'a\\r\\n' matches b'\\r\\n' at 1.
+        '''
+
+        def __init__(self, marker_list):
+            '''
+            Initialize the object.
+
+            :param marker_list: the markers to search for
+            :type marker_list: list of bytes
+
+            :raise: ValueError if there is no marker, or a marker is empty
+            '''
+            marker_list = [ bytes(marker) for marker in marker_list ]
+            if len(marker_list) <= 0:
+                raise ValueError('there must be at least one marker')
+            if min(len(marker) for marker in marker_list) <= 0:
+                raise ValueError('marker length cannot be zero')
+            # - the alternatives are tried in order, so the longest one comes first
+            self.marker_list = sorted(set(marker_list), key=len, reverse=True)
+            self.max_marker_length = len(self.marker_list[0])
+            self.pattern = re.compile(b'|'.join(
+                re.escape(marker) for marker in self.marker_list
+            ))
+            return
+
+        def find_first(self, data, start_pos=0, end_pos=-1):
+            '''
+            Find the first marker in data.
+
+            :param data: the array of bytes to search
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+            :param start_pos: the position to start the search
+            :type start_pos: int, optional
+            :param end_pos: the position to end the search; the marker must start
+                before it, but may end after it;
+                (a) negative value means the end of data
+            :type end_pos: int, optional
+
+            :raise: ValueError if start_pos is negative
+
+            :return: (position, marker) of the first marker, or (-1, None) if no
+                marker is found
+            :rtype: tuple
+            '''
+            match = self.pattern.search(data, *self.get_search_range(data, start_pos, end_pos))
+            if match is None or (end_pos >= 0 and match.start() >= end_pos):
+                return -1, None
+            return match.start(), match.group()
+
+        def find_all(self, data, start_pos=0, end_pos=-1):
+            '''
+            Find all the markers in data, in the order of their positions.
+
+            The markers found do not overlap; the search continues after the end
+            of each marker found.
+
+            :param data: see find_first()
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+            :param start_pos: see find_first()
+            :type start_pos: int, optional
+            :param end_pos: see find_first()
+            :type end_pos: int, optional
+
+            :raise: ValueError if start_pos is negative
+
+            :return: (position, marker) of the markers
+            :rtype: generator of tuple
+            '''
+            for match in self.pattern.finditer(
+                data, *self.get_search_range(data, start_pos, end_pos)
+            ):
+                if end_pos >= 0 and match.start() >= end_pos:
+                    break
+                yield match.start(), match.group()
+            return
+
+        def extract_until(self, data, offset, pos=0, max_search_length=-1,
+                          include_marker=False, empty_if_not_found=False):
+            '''
+            Extract the bytes from the given array of bytes until any of the markers
+            appears, as BytesUtility.extract_bytes_until() does for a single marker.
+
+            :param data: the array of bytes containing the bytes to be extracted
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+
+            :param offset: the offset of the first byte to extract, counting from pos
+            :param pos: the starting position in the byte stream; default is 0
+            :param max_search_length: see BytesUtility.extract_bytes_until()
+            :type offset: int
+            :type pos: int, optional
+            :type max_search_length: int, optional
+
+            :param include_marker: see BytesUtility.extract_bytes_until()
+            :param empty_if_not_found: see BytesUtility.extract_bytes_until()
+            :type include_marker: bool, optional
+            :type empty_if_not_found: bool, optional
+
+            :raise: ValueError if pos + offset is negative
+
+            :return: (extracted_bytes, marker), where marker is the marker found,
+                or None if no marker is found
+            :rtype: tuple
+            '''
+            start_pos = pos + offset
+            if max_search_length > 0:
+                end_pos = min(len(data), start_pos + max_search_length)
+            else:
+                end_pos = len(data)
+
+            found_pos, marker = self.find_first(data, start_pos, end_pos)
+            if found_pos >= 0:
+                end_pos = found_pos + len(marker) if include_marker else found_pos
+            elif empty_if_not_found:
+                return b'', None
+            return data[start_pos:max(end_pos, start_pos)], marker
+
+        def get_search_range(self, data, start_pos, end_pos):
+            '''
+            (Internal) Get the range of data for the regular expression to search,
+            which includes the markers that start before end_pos.
+
+            :meta private:
+            :param data: see find_first()
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+            :param start_pos: see find_first()
+            :type start_pos: int
+            :param end_pos: see find_first()
+            :type end_pos: int
+
+            :raise: ValueError if start_pos is negative
+
+            :return: (start_pos, end_pos) of the range
+            :rtype: tuple
+            '''
+            if start_pos < 0:
+                raise ValueError(f'start position cannot be negative ({start_pos})')
+            data_length = len(data)
+            if end_pos < 0:
+                return start_pos, data_length
+            return start_pos, min(end_pos - 1 + self.max_marker_length, data_length)
+
+    # --- Record Layouts
+
+    class RecordLayout:
+        '''
+        A layout of the fields in a fixed-size record, compiled once so that all
+        the fields of a record are extracted in a single call.
+
+        Each field is a tuple (name, offset, length, endian, signed), as the
+        arguments of BytesUtility.extract_integer(); endian and signed are
+        optional, with default 'little' and False. A field with endian None is
+        extracted as bytes instead of an integer.
+
+        The fields are compiled into a struct.Struct. The integers of 1, 2, 4 and 8
+        bytes in the byte order of most fields are converted by struct; the other
+        fields are extracted by struct as bytes, and converted by int.from_bytes().
+        '''
+
+        struct_integer_formats = { 1: 'B', 2: 'H', 4: 'I', 8: 'Q' }
+        '''
+        The struct formats of the unsigned integers of each length; the signed
+        integers use the lowercase formats.
+        '''
+
+        def __init__(self, field_list, record_size=-1):
+            '''
+            Initialize the object.
+
+            :param field_list: the fields of the record;
+                each field is (name, offset, length, endian, signed), where endian
+                and signed are optional
+            :type field_list: list of tuple
+            :param record_size: the number of bytes from the start of a record to
+                the start of the next one, for iter_unpack();
+                (a) zero or negative value means the end of the last field
+            :type record_size: int, optional
+
+            :raise: ValueError if there is no field, a field is not valid, or
+                record_size is smaller than the end of the last field
+            '''
+            if len(field_list) <= 0:
+                raise ValueError('a record layout must have at least one field')
+            self.field_list = []
+            for field in field_list:
+                name, offset, length = field[:3]
+                endian = field[3] if len(field) > 3 else 'little'
+                signed = field[4] if len(field) > 4 else False
+                if offset < 0 or length <= 0:
+                    raise ValueError(f'invalid offset or length of field {name} ({offset}, {length})')
+                if endian not in ('little', 'big', None):
+                    raise ValueError(f'invalid endian of field {name} ({endian})')
+                self.field_list.append((name, offset, length, endian, signed))
+            self.name_list = [ field[0] for field in self.field_list ]
+
+            # - every field has a positive length, so the record is never empty
+            self.size = max([ offset + length for _, offset, length, _, _ in self.field_list ])
+            if record_size <= 0:
+                record_size = self.size
+            if record_size < self.size:
+                raise ValueError(
+                    f'record size is smaller than the end of the last field ({record_size} < {self.size})'
+                )
+            self.record_size = record_size
+            self.compile()
+            return
+
+        def compile(self):
+            '''
+            (Internal) Compile the fields into a struct.Struct, and the conversions
+            of its values to the values of the fields.
+
+            :meta private:
+            :return: no value is returned by this function
+            '''
+            integer_field_list = [
+                field for field in self.field_list
+                if field[3] is not None and field[2] in self.struct_integer_formats and field[2] > 1
+            ]
+            big_endian_count = sum([ 1 for field in integer_field_list if field[3] == 'big' ])
+            endian = 'big' if big_endian_count * 2 > len(integer_field_list) else 'little'
+
+            format_list = [ '>' if endian == 'big' else '<' ]
+            # - (index of the struct value, converter) of each field, in the order
+            #   of field_list; converter is None when the struct value is the value
+            self.conversion_list = [ None ] * len(self.field_list)
+            self.is_overlapped = False
+            curr_pos = 0
+            value_count = 0
+            for index in sorted(range(len(self.field_list)), key=lambda k: self.field_list[k][1]):
+                name, offset, length, field_endian, signed = self.field_list[index]
+                if offset < curr_pos:
+                    # - overlapped fields cannot be described by a struct format
+                    self.is_overlapped = True
+                    break
+                if offset > curr_pos:
+                    format_list.append(f'{offset - curr_pos}x')
+                converter = None
+                if field_endian is None:
+                    format_list.append(f'{length}s')
+                elif length in self.struct_integer_formats and (field_endian == endian or length == 1):
+                    integer_format = self.struct_integer_formats[length]
+                    format_list.append(integer_format.lower() if signed else integer_format)
+                else:
+                    format_list.append(f'{length}s')
+                    converter = BytesUtility.RecordLayout.get_converter(field_endian, signed)
+                self.conversion_list[index] = (value_count, converter)
+                value_count += 1
+                curr_pos = offset + length
+
+            if self.is_overlapped:
+                # - every field is extracted from the bytes of the record
+                self.struct = struct.Struct(f'{self.size}s')
+                self.conversion_list = [
+                    (0, BytesUtility.RecordLayout.get_field_extractor(offset, length, field_endian, signed))
+                    for _, offset, length, field_endian, signed in self.field_list
+                ]
+            else:
+                self.struct = struct.Struct(''.join(format_list))
+            self.record_struct = struct.Struct(
+                self.struct.format + (f'{self.record_size - self.size}x' if self.record_size > self.size else '')
+            )
+            self.is_direct = self.conversion_list == [ (k, None) for k in range(len(self.field_list)) ]
+            return
+
+        def unpack(self, data, pos=0):
+            '''
+            Extract the fields of the record at pos.
+
+            :param data: the array of bytes containing the record
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+            :param pos: the starting position of the record
+            :type pos: int, optional
+
+            :raise: ValueError if data does not have all the bytes of the fields
+
+            :return: the values of the fields, in the order of field_list
+            :rtype: tuple
+            '''
+            if pos < 0 or len(data) < pos + self.size:
+                raise ValueError(f'insufficient bytes for the record at {pos}')
+            values = self.struct.unpack_from(data, pos)
+            if self.is_direct:
+                return values
+            return self.convert(values)
+
+        def unpack_dict(self, data, pos=0):
+            '''
+            Extract the fields of the record at pos, as in unpack().
+
+            :param data: see unpack()
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+            :param pos: see unpack()
+            :type pos: int, optional
+
+            :raise: ValueError, see unpack()
+
+            :return: the values of the fields, keyed by their names
+            :rtype: dict
+            '''
+            return dict(zip(self.name_list, self.unpack(data, pos=pos)))
+
+        def iter_unpack(self, data, pos=0, count=-1):
+            '''
+            Extract the fields of consecutive records, record_size bytes apart.
+
+            Only the complete records, i.e. those with all their record_size bytes
+            in data, are extracted.
+
+            :param data: the array of bytes containing the records
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+            :param pos: the starting position of the first record
+            :type pos: int, optional
+            :param count: the maximum number of records to extract;
+                (a) negative value means till the end of data
+            :type count: int, optional
+
+            :raise: ValueError if pos is negative
+
+            :return: the values of the fields of each record, as in unpack()
+            :rtype: generator of tuple
+            '''
+            if pos < 0:
+                raise ValueError(f'pos must not be negative ({pos})')
+            record_count = max(len(data) - pos, 0) // self.record_size
+            if count >= 0:
+                record_count = min(record_count, count)
+            if record_count <= 0:
+                return
+            end_pos = pos + record_count * self.record_size
+            if pos == 0 and end_pos == len(data):
+                records = data
+            else:
+                records = memoryview(data)[pos:end_pos]
+            if self.is_direct:
+                yield from self.record_struct.iter_unpack(records)
+            else:
+                yield from map(self.convert, self.record_struct.iter_unpack(records))
+            return
+
+        def convert(self, values):
+            '''
+            (Internal) Convert the values unpacked by the struct to the values of
+            the fields.
+
+            :meta private:
+            :param values: the values unpacked by the struct
+            :type values: tuple
+
+            :return: the values of the fields, in the order of field_list
+            :rtype: tuple
+            '''
+            return tuple([
+                values[index] if converter is None else converter(values[index])
+                for index, converter in self.conversion_list
+            ])
+
+        @staticmethod
+        def get_converter(endian, signed):
+            '''
+            (Internal) Get the function that converts the bytes of a field to an
+            integer.
+
+            :meta private:
+            :param endian: 'little' or 'big'
+            :type endian: str
+            :param signed: True if the integer is signed
+            :type signed: bool
+
+            :return: the converter
+            :rtype: function
+            '''
+            return lambda value: int.from_bytes(value, endian, signed=signed)
+
+        @staticmethod
+        def get_field_extractor(offset, length, endian, signed):
+            '''
+            (Internal) Get the function that extracts a field from the bytes of a
+            record, for the layouts with overlapped fields.
+
+            :meta private:
+            :param offset: the offset of the field in the record
+            :type offset: int
+            :param length: the number of bytes of the field
+            :type length: int
+            :param endian: 'little', 'big', or None for a field of bytes
+            :type endian: str or None
+            :param signed: True if the integer is signed
+            :type signed: bool
+
+            :return: the extractor
+            :rtype: function
+            '''
+            if endian is None:
+                return lambda record: record[offset:offset+length]
+            return lambda record: int.from_bytes(record[offset:offset+length], endian, signed=signed)
+
+    # --- Bytes Streams
+
+    default_chunk_size = 1024 * 1024
+    '''
+    The default number of bytes to read at a time in read_chunks().
+    '''
+
+    @staticmethod
+    def read_chunks(source, chunk_size=default_chunk_size, offset=0, length=-1):
+        '''
+        Read a file in chunks of bytes, so that the whole file does not have to
+        be held in memory.
+
+        :param source: the file to read; either the name of the file, or a file
+            object opened in binary mode
+        :type source: str or file object
+
+        :param chunk_size: the number of bytes in each chunk;
+            (a) every chunk has exactly chunk_size bytes, except the last one
+        :type chunk_size: int, optional
+        :param offset: the number of bytes to skip before the first chunk,
+            counting from the start of the file (for a file name), or from the
+            current position (for a file object)
+        :type offset: int, optional
+        :param length: the maximum number of bytes to read;
+            (a) zero or negative value means read till the end of the file
+        :type length: int, optional
+
+        :raise: ValueError
+
+        :return: the chunks of bytes, one at a time
+        :rtype: generator of bytes
+        '''
+        if chunk_size <= 0:
+            raise ValueError(f'chunk_size must be positive ({chunk_size})')
+        if offset < 0:
+            raise ValueError(f'offset cannot be negative ({offset})')
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as fd:
+                yield from BytesUtility.read_chunks(
+                    fd, chunk_size=chunk_size, offset=offset, length=length
+                )
+            return
+
+        fd = source
+        if offset > 0:
+            if fd.seekable():
+                fd.seek(offset, os.SEEK_CUR)
+            else:
+                # skip the bytes by reading them
+                remaining = offset
+                while remaining > 0:
+                    skipped = fd.read(min(remaining, chunk_size))
+                    if not skipped:
+                        return
+                    remaining -= len(skipped)
+
+        remaining = length if length > 0 else -1
+        while remaining != 0:
+            read_size = chunk_size if remaining < 0 else min(chunk_size, remaining)
+            chunk = fd.read(read_size)
+            # - a short read does not mean end of file for pipes or raw files,
+            #   so keep reading until the chunk is full
+            while chunk and len(chunk) < read_size:
+                more = fd.read(read_size - len(chunk))
+                if not more:
+                    break
+                chunk += more
+            if not chunk:
+                break
+            if remaining > 0:
+                remaining -= len(chunk)
+            yield chunk
+            if len(chunk) < read_size:
+                break
+        return
+
+    @staticmethod
+    def write_chunks(chunk_iterable, destination):
+        '''
+        Write chunks of bytes to a file, one chunk at a time, e.g. the chunks
+        generated by read_chunks() or xor_stream().
+
+        :param chunk_iterable: the chunks of bytes to write
+        :type chunk_iterable: iterable of bytes, or bytes-like object
+        :param destination: the file to write; either the name of the file, which
+            is created or overwritten, or a file object opened in binary mode
+        :type destination: str or file object
+
+        :return: the number of bytes written
+        :rtype: int
+        '''
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, 'wb') as fd:
+                return BytesUtility.write_chunks(chunk_iterable, fd)
+
+        byte_count = 0
+        for chunk in chunk_iterable:
+            destination.write(chunk)
+            byte_count += len(chunk)
+        return byte_count
+
+    @staticmethod
+    def xor_stream(source1, source2, chunk_size=default_chunk_size, trancate=True):
+        '''
+        Compute the XOR of two streams of bytes chunk by chunk, as in xor(), so
+        that only a chunk of each stream is held in memory at a time.
+
+        The chunks of the two streams do not have to be of the same sizes.
+
+        :param source1: the stream of bytes 1; either the name of a file, a file
+            object opened in binary mode, an iterable of chunks of bytes, or a
+            bytes-like object as a single chunk
+        :type source1: str, file object, iterable of bytes, or bytes-like object
+        :param source2: the stream of bytes 2
+        :type source2: str, file object, iterable of bytes, or bytes-like object
+
+        :param chunk_size: the number of bytes to read at a time from a file
+        :type chunk_size: int, optional
+        :param trancate: see xor()
+        :type trancate: bool, optional
+
+        :raise: ValueError, see read_chunks()
+
+        :return: the chunks of the XOR of the two streams, one at a time
+        :rtype: generator of bytes
+        '''
+        chunk_iter1 = BytesUtility.iterate_chunks(source1, chunk_size=chunk_size)
+        chunk_iter2 = BytesUtility.iterate_chunks(source2, chunk_size=chunk_size)
+        chunk1 = chunk2 = memoryview(b'')
+        while True:
+            if len(chunk1) <= 0:
+                chunk1 = memoryview(next(chunk_iter1, b''))
+            if len(chunk2) <= 0:
+                chunk2 = memoryview(next(chunk_iter2, b''))
+            if len(chunk1) <= 0 or len(chunk2) <= 0:
+                break
+            length = min(len(chunk1), len(chunk2))
+            yield BytesUtility.xor(chunk1[:length], chunk2[:length])
+            chunk1 = chunk1[length:]
+            chunk2 = chunk2[length:]
+
+        if not trancate:
+            # - the remaining of the longer stream is output as it is
+            if len(chunk1) > 0:
+                yield bytes(chunk1)
+                yield from chunk_iter1
+            elif len(chunk2) > 0:
+                yield bytes(chunk2)
+                yield from chunk_iter2
+        return
+
+    @staticmethod
+    def xor_stream_with_key(source, key, chunk_size=default_chunk_size, key_offset=0):
+        '''
+        Compute the XOR of a stream of bytes with a key that repeats itself, chunk
+        by chunk, so that only a chunk of the stream is held in memory at a time.
+
+        The position in the key carries on from one chunk to the next, so the
+        result does not depend on the sizes of the chunks.
+
+        :param source: the stream of bytes; either the name of a file, a file
+            object opened in binary mode, an iterable of chunks of bytes, or a
+            bytes-like object as a single chunk
+        :type source: str, file object, iterable of bytes, or bytes-like object
+        :param key: the key
+        :type key: bytes, or bytes-like object
+
+        :param chunk_size: the number of bytes to read at a time from a file
+        :type chunk_size: int, optional
+        :param key_offset: the position in the key to XOR with the first byte of
+            the stream, e.g. when the stream starts in the middle of a larger one
+        :type key_offset: int, optional
+
+        :raise: ValueError if the key is empty, or see read_chunks()
+
+        :return: the chunks of the XOR of the stream with the key, one at a time
+        :rtype: generator of bytes
+        '''
+        key_length = len(key)
+        if key_length <= 0:
+            raise ValueError('the key cannot be empty')
+        key = bytes(key)
+        key_pos = key_offset % key_length
+        key_block = memoryview(b'')
+        for chunk in BytesUtility.iterate_chunks(source, chunk_size=chunk_size):
+            chunk_length = len(chunk)
+            if len(key_block) < key_pos + chunk_length:
+                # - the key repeated to cover a chunk at any position in the key
+                key_block = memoryview(key * ((chunk_length + key_length - 1) // key_length + 1))
+            yield BytesUtility.xor(chunk, key_block[key_pos:key_pos+chunk_length])
+            key_pos = (key_pos + chunk_length) % key_length
+        return
+
+    @staticmethod
+    def iterate_chunks(source, chunk_size=default_chunk_size):
+        '''
+        (Internal) Iterate over the chunks of bytes of a stream.
+
+        :meta private:
+        :param source: the stream of bytes; either the name of a file, a file
+            object opened in binary mode, an iterable of chunks of bytes, or a
+            bytes-like object as a single chunk; a file name must be a str or
+            os.PathLike, as bytes are data
+        :type source: str, file object, iterable of bytes, or bytes-like object
+        :param chunk_size: the number of bytes to read at a time from a file
+        :type chunk_size: int, optional
+
+        :raise: ValueError, see read_chunks()
+
+        :return: the chunks of bytes; empty chunks are skipped
+        :rtype: iterator of bytes
+        '''
+        if isinstance(source, (str, os.PathLike)) or hasattr(source, 'read'):
+            return BytesUtility.read_chunks(source, chunk_size=chunk_size)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return iter([ source ] if len(source) > 0 else [])
+        return (chunk for chunk in source if len(chunk) > 0)
+
+    @staticmethod
+    @contextmanager
+    def map_file(filename):
+        '''
+        Map a file into memory as read-only, for use as the array of bytes in the
+        extraction functions and in HexDump.
+
+        Only the pages of the file that are actually accessed are read from disk,
+        so extracting a few bytes from a very large file does not read the whole
+        file.
+
+        Usage: with BytesUtility.map_file(filename) as data: ...
+
+        :param filename: the name of the file
+        :type filename: str
+
+        :return: the content of the file; an empty file gives an empty bytes,
+            as it cannot be mapped, and a file that is not a regular file (e.g. a
+            pipe) is read into a bytes;
+            (a) any memoryview of it must be released before leaving the with block
+        :rtype: mmap.mmap or bytes
+        '''
+        with open(filename, 'rb') as fd:
+            file_stat = os.fstat(fd.fileno())
+            if not stat.S_ISREG(file_stat.st_mode):
+                # - a pipe or device cannot be mapped, so read it instead
+                yield fd.read()
+                return
+            if file_stat.st_size <= 0:
+                yield b''
+                return
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+        return
+
+    # --- Hex String Streams
+
+    class HexEncoder:
+        '''
+        An encoder that converts bytes to a hex string chunk by chunk, with the same
+        result as bytes_to_hex_string() on all the bytes at once.
+        '''
+
+        def __init__(self, sep='', bytes_per_sep=1, total_length=-1):
+            '''
+            Initialize the object.
+
+            :param sep: see bytes_to_hex_string(); as in bytes.hex(), it must be a
+                single character
+            :type sep: str, optional
+            :param bytes_per_sep: see bytes_to_hex_string(); as in bytes.hex(), a
+                positive value counts the bytes from the end, and a negative value
+                counts the bytes from the start
+            :type bytes_per_sep: int, optional
+            :param total_length: the total number of bytes to encode; required when
+                bytes_per_sep is more than 1, as the separators are then placed
+                from the end
+            :type total_length: int, optional
+
+            :raise: ValueError if total_length is required but not given
+            '''
+            if isinstance(sep, bytes):
+                sep = sep.decode()
+            self.sep = sep
+            self.group_length = abs(bytes_per_sep) if len(sep) > 0 else 0
+            if bytes_per_sep > 1 and len(sep) > 0 and total_length < 0:
+                raise ValueError('total_length is required when bytes_per_sep is more than 1')
+            # - a separator is placed before the bytes at the positions
+            #   that are equal to first_group_length modulo group_length
+            self.first_group_length = (
+                total_length % self.group_length if bytes_per_sep > 1 and len(sep) > 0 else 0
+            )
+            self.total_length = total_length
+            self.byte_count = 0
+            return
+
+        def encode(self, data):
+            '''
+            Convert the next chunk of bytes to hex string.
+
+            :param data: the next chunk of bytes
+            :type data: bytes, or bytes-like object such as memoryview
+
+            :return: the hex string of the chunk, with the separators before and in it
+            :rtype: str
+            '''
+            if not isinstance(data, bytes):
+                data = bytes(data)
+            if self.group_length <= 0 or len(data) <= 0:
+                self.byte_count += len(data)
+                return data.hex()
+
+            # - the bytes till the first separator in this chunk
+            head_length = (self.first_group_length - self.byte_count) % self.group_length
+            part_list = []
+            if self.byte_count > 0 and head_length == 0:
+                part_list.append('')
+            if head_length > 0:
+                part_list.append(data[:head_length].hex())
+            if len(data) > head_length:
+                part_list.append(data[head_length:].hex(self.sep, -self.group_length))
+            self.byte_count += len(data)
+            return self.sep.join(part_list)
+
+        def finish(self):
+            '''
+            End the encoding.
+
+            :raise: ValueError if the number of bytes encoded is not total_length
+
+            :return: the rest of the hex string, which is always empty
+            :rtype: str
+            '''
+            if self.total_length >= 0 and self.byte_count != self.total_length:
+                raise ValueError(
+                    f'{self.byte_count} bytes encoded, but total_length is {self.total_length}'
+                )
+            return ''
+
+    class HexDecoder:
+        '''
+        A decoder that converts a hex string to bytes chunk by chunk, with the same
+        result as hex_string_to_bytes() on all the hex string at once.
+
+        Whitespace, including newlines, is ignored anywhere in the hex string, and
+        a separator or a byte may be split between two chunks.
+        '''
+
+        def __init__(self, sep=''):
+            '''
+            Initialize the object.
+
+            :param sep: see hex_string_to_bytes(); any whitespace in it is ignored
+            :type sep: str, optional
+            '''
+            if isinstance(sep, bytes):
+                sep = sep.decode()
+            self.sep = ''.join(sep.split())
+            self.pending = ''
+            return
+
+        def decode(self, hexstr):
+            '''
+            Convert the next chunk of hex string to bytes.
+
+            :param hexstr: the next chunk of hex string
+            :type hexstr: str or bytes
+
+            :raise: ValueError if the hex string is not valid
+
+            :return: the bytes of the chunk; a byte split between two chunks is
+                returned with the later chunk
+            :rtype: bytes
+            '''
+            if isinstance(hexstr, (bytes, bytearray)):
+                hexstr = hexstr.decode('ascii')
+            hexstr = self.pending + ''.join(hexstr.split())
+            if len(self.sep) > 0:
+                hexstr = hexstr.replace(self.sep, '')
+            # - keep the start of a separator, and an odd digit, for the next chunk
+            keep_length = 0
+            for length in range(min(len(self.sep) - 1, len(hexstr)), 0, -1):
+                if hexstr.endswith(self.sep[:length]):
+                    keep_length = length
+                    break
+            if (len(hexstr) - keep_length) % 2 != 0:
+                keep_length += 1
+            self.pending = hexstr[len(hexstr)-keep_length:]
+            return bytes.fromhex(hexstr[:len(hexstr)-keep_length])
+
+        def finish(self):
+            '''
+            End the decoding.
+
+            :raise: ValueError if the hex string ends with an incomplete byte or
+                separator
+
+            :return: the rest of the bytes, which is always empty
+            :rtype: bytes
+            '''
+            if len(self.pending) > 0:
+                raise ValueError(f'incomplete hex string at the end ({self.pending!r})')
+            return b''
+
+    @staticmethod
+    def hex_encode_file(source, destination, sep='', bytes_per_sep=1,
+                        chunk_size=default_chunk_size):
+        '''
+        Convert a binary file to a hex string file chunk by chunk, with the same
+        result as bytes_to_hex_string() on the whole file.
+
+        :param source: the binary file; either the name of the file, or a file
+            object opened in binary mode
+        :type source: str or file object
+        :param destination: the hex string file; either the name of the file, which
+            is created or overwritten, or a file object opened in text mode
+        :type destination: str or file object
+
+        :param sep: see bytes_to_hex_string()
+        :type sep: str, optional
+        :param bytes_per_sep: see HexEncoder
+        :type bytes_per_sep: int, optional
+        :param chunk_size: the number of bytes to read at a time
+        :type chunk_size: int, optional
+
+        :raise: ValueError if bytes_per_sep is more than 1 and the size of the
+            source cannot be known, e.g. for a pipe
+
+        :return: the number of bytes converted
+        :rtype: int
+        '''
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, 'w') as fd:
+                return BytesUtility.hex_encode_file(
+                    source, fd, sep=sep, bytes_per_sep=bytes_per_sep, chunk_size=chunk_size
+                )
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as fd:
+                return BytesUtility.hex_encode_file(
+                    fd, destination, sep=sep, bytes_per_sep=bytes_per_sep, chunk_size=chunk_size
+                )
+
+        total_length = -1
+        if bytes_per_sep > 1 and len(sep) > 0:
+            file_stat = os.fstat(source.fileno())
+            if not stat.S_ISREG(file_stat.st_mode):
+                raise ValueError('bytes_per_sep cannot be more than 1 for a file of unknown size')
+            total_length = file_stat.st_size - source.tell()
+        encoder = BytesUtility.HexEncoder(sep=sep, bytes_per_sep=bytes_per_sep, total_length=total_length)
+        for chunk in BytesUtility.read_chunks(source, chunk_size=chunk_size):
+            destination.write(encoder.encode(chunk))
+        destination.write(encoder.finish())
+        return encoder.byte_count
+
+    @staticmethod
+    def hex_decode_file(source, destination, sep='', chunk_size=default_chunk_size):
+        '''
+        Convert a hex string file to a binary file chunk by chunk, with the same
+        result as hex_string_to_bytes() on the whole file; whitespace and newlines
+        in the hex string are ignored.
+
+        :param source: the hex string file; either the name of the file, or a file
+            object opened in text or binary mode
+        :type source: str or file object
+        :param destination: the binary file; either the name of the file, which is
+            created or overwritten, or a file object opened in binary mode
+        :type destination: str or file object
+
+        :param sep: see hex_string_to_bytes()
+        :type sep: str, optional
+        :param chunk_size: the number of characters to read at a time
+        :type chunk_size: int, optional
+
+        :raise: ValueError if the hex string is not valid
+
+        :return: the number of bytes written
+        :rtype: int
+        '''
+        decoder = BytesUtility.HexDecoder(sep=sep)
+        chunk_iterable = itertools.chain(
+            (decoder.decode(chunk) for chunk in BytesUtility.read_chunks(source, chunk_size=chunk_size)),
+            (decoder.finish() for _ in range(1))
+        )
+        return BytesUtility.write_chunks(chunk_iterable, destination)
+
     # --- Bytes Conversions
     
     @staticmethod
@@ -235,6 +1361,117 @@ class BytesUtility:
         '''
         return int.from_bytes(data, endian, signed=signed)
     
+    @staticmethod
+    def integers_to_bytes(values, length: int, endian='little', signed=False):
+        '''
+        Convert a sequence of integers to bytes, each integer to the same number of
+        bytes, as integer_to_bytes() does for each of them.
+
+        The integers are converted by array.array, with a byteswap for big endian,
+        instead of one call per integer. Lengths that no typecode of array.array
+        has are converted through the next larger typecode; lengths of more than
+        8 bytes are converted by int.to_bytes().
+
+        :param values: the integers to convert
+        :type values: iterable of int, e.g. list or array.array
+
+        :param length: the number of bytes of each integer; must be positive
+        :param endian: the endian of the bytes to output;
+            (a) acceptable values are 'little' and 'big'
+        :param signed: when True, convert to a signed representation
+        :type length: int
+        :type endian: str, optional
+        :type signed: bool, optional
+
+        :raise: ValueError if length is not positive or endian is invalid;
+            OverflowError if an integer does not fit in length bytes
+
+        :return: the bytes of the integers, one after another
+        :rtype: bytes
+        '''
+        if length <= 0:
+            raise ValueError(f'length must be positive ({length})')
+        if endian not in ('little', 'big'):
+            raise ValueError(f'invalid endian ({endian})')
+        if length > 8:
+            return b''.join([ value.to_bytes(length, endian, signed=signed) for value in values ])
+
+        typecode = BytesUtility.get_array_typecode(length, signed)
+        items = array.array(typecode, values)
+        if items.itemsize > length and len(items) > 0:
+            # - array.array only checks the range of the larger typecode
+            if signed:
+                min_value, max_value = -(1 << (length * 8 - 1)), (1 << (length * 8 - 1)) - 1
+            else:
+                min_value, max_value = 0, (1 << (length * 8)) - 1
+            if min(items) < min_value or max(items) > max_value:
+                raise OverflowError(f'integer too big to convert to {length} bytes')
+        if sys.byteorder != endian:
+            items.byteswap()
+        if items.itemsize == length:
+            return items.tobytes()
+
+        # - keep only the least significant bytes of each item
+        item_length = items.itemsize
+        item_bytes = memoryview(items).cast('B')
+        skip_length = item_length - length if endian == 'big' else 0
+        result = bytearray(len(items) * length)
+        for k in range(length):
+            result[k::length] = item_bytes[skip_length+k::item_length]
+        return bytes(result)
+
+    @staticmethod
+    def bytes_to_integers(data: bytes, length: int, endian='little', signed=False):
+        '''
+        Convert bytes to a sequence of integers, each from the same number of bytes,
+        as bytes_to_integer() does for each of them.
+
+        The integers are converted by array.array, with a byteswap for big endian,
+        instead of one call per integer. Lengths that no typecode of array.array
+        has are converted by extract_integer_column(); lengths of more than 8 bytes
+        are converted by int.from_bytes().
+
+        :param data: the bytes to convert
+        :type data: bytes, or bytes-like object such as mmap or memoryview
+
+        :param length: the number of bytes of each integer; must be positive
+        :param endian: the endian of the bytes;
+            (a) acceptable values are 'little' and 'big'
+        :param signed: when True, the bytes are taken to be signed integers;
+            when False, the bytes are taken to be unsigned integers
+        :type length: int
+        :type endian: str, optional
+        :type signed: bool, optional
+
+        :raise: ValueError if length is not positive, the number of bytes is not a
+            multiple of length, or endian is invalid
+
+        :return: the integers; an array.array if length is at most 8, otherwise a list
+        :rtype: array.array or list
+        '''
+        if length <= 0:
+            raise ValueError(f'length must be positive ({length})')
+        if len(data) % length != 0:
+            raise ValueError(f'number of bytes ({len(data)}) is not a multiple of length ({length})')
+        if endian not in ('little', 'big'):
+            raise ValueError(f'invalid endian ({endian})')
+        if length > 8:
+            return [
+                int.from_bytes(data[pos:pos+length], endian, signed=signed)
+                for pos in range(0, len(data), length)
+            ]
+
+        typecode = BytesUtility.get_array_typecode(length, signed)
+        result = array.array(typecode)
+        if result.itemsize != length:
+            return BytesUtility.extract_integer_column(
+                data, 0, length, length, endian=endian, signed=signed
+            )
+        result.frombytes(data)
+        if sys.byteorder != endian:
+            result.byteswap()
+        return result
+
     @staticmethod
     def hex_string_to_bytes(hexstr, sep=''):
         '''
@@ -299,50 +1536,92 @@ class BytesUtility:
         :return: the bytes as represented by the bytes rep
         :rtype: bytes
         '''
-        result = b''
-
         rep = rep[2:-1]
-        rep_len = len(rep)
-        ptr = 0
-
-        while ptr < rep_len:
-            if rep[ptr] != '\\':
-                # a normal byte which is the representation itself
-                this_byte = rep[ptr].encode()
-                result += this_byte
-                if verbose:
-                    print(rep[ptr], this_byte, file=ferr)
-                ptr += 1
-            elif rep[ptr+1] == 'x':
-                # a representation in the form \xhh, where hh is two hexadecimal digits
-                this_byte = binascii.unhexlify(rep[ptr+2:ptr+4])
-                result += this_byte
-                if verbose:
-                    print(rep[ptr:ptr+4], this_byte, file=ferr)
-                ptr += 4
-            else:
-                # a representation such as \r, \n, etc.
-                c = rep[ptr+1]
-                if c == 'r':
-                    this_byte = b'\r'
-                elif c == 'n':
-                    this_byte = b'\n'
-                elif c == 't':
-                    this_byte = b'\t'
-                elif c == '"':
-                    this_byte = b'"'
-                elif c == '\'':
-                    this_byte = b"'"
-                elif c == '\\':
-                    this_byte = b'\\'
+        if not verbose and BytesUtility.is_known_bytes_rep(rep):
+            # - every escape sequence is known, so decode them all at once
+            return codecs.escape_decode(rep.encode())[0]
+
+        # - the literal characters and the escape sequences alternate in part_list
+        part_list = BytesUtility.bytes_rep_pattern.split(rep)
+        if verbose:
+            for index, part in enumerate(part_list):
+                if index % 2 == 0:
+                    for c in part.split('\\')[0]:
+                        print(c, c.encode(), file=ferr)
                 else:
-                    this_byte = b'***unknown(' + rep[ptr:ptr+2].encode() + b')***'
-                result += this_byte
-                if verbose:
-                    print(rep[ptr:ptr+2], this_byte, file=ferr)
-                ptr += 2
+                    print(part, BytesUtility.escape_to_bytes(part), file=ferr)
 
+        escape_dict = BytesUtility.bytes_rep_escape_dict
+        result = b''.join([
+            part.encode() if index % 2 == 0
+            else escape_dict.get(part) or BytesUtility.escape_to_bytes(part)
+            for index, part in enumerate(part_list)
+        ])
+        if part_list[-1].endswith('\\'):
+            raise IndexError('incomplete escape sequence at the end of bytes rep')
         return result
+
+    bytes_rep_pattern = re.compile(r'(\\x.{0,2}|\\.)', re.DOTALL)
+    '''
+    The regular expression to split a bytes rep into the literal characters and
+    the escape sequences.
+    '''
+
+    bytes_rep_unknown_pattern = re.compile(r'\\(?!x[0-9a-fA-F]{2}|[rnt"\'])')
+    '''
+    The regular expression to find an escape sequence that is not known in a
+    bytes rep, after the escaped backslashes are replaced in it.
+    '''
+
+    bytes_rep_escape_dict = {
+        '\\x' + h1 + h2: bytes([ int(h1 + h2, 16) ])
+        for h1 in '0123456789abcdefABCDEF' for h2 in '0123456789abcdefABCDEF'
+    }
+    bytes_rep_escape_dict.update({
+        '\\r': b'\r', '\\n': b'\n', '\\t': b'\t',
+        '\\"': b'"', "\\'": b"'", '\\\\': b'\\',
+    })
+    '''
+    The bytes of the escape sequences in a bytes rep.
+    '''
+
+    @staticmethod
+    def is_known_bytes_rep(rep):
+        '''
+        (Internal) Check that every escape sequence in a bytes rep is known, so
+        that it can be decoded by codecs.escape_decode() with the same result.
+
+        :meta private:
+        :param rep: the bytes rep, without the leading b' and the trailing '
+        :type rep: str
+
+        :return: True if every escape sequence is known
+        :rtype: bool
+        '''
+        # - the escaped backslashes are paired from the left, as they are decoded;
+        #   they are replaced with a character that is not a hexadecimal digit, so
+        #   every backslash left must start a known escape sequence
+        return BytesUtility.bytes_rep_unknown_pattern.search(rep.replace('\\\\', '/')) is None
+
+    @staticmethod
+    def escape_to_bytes(escape):
+        '''
+        (Internal) Convert an escape sequence in a bytes rep to bytes.
+
+        :meta private:
+        :param escape: the escape sequence; for example, '\\\\x0a' or '\\\\n'
+        :type escape: str
+
+        :return: the bytes of the escape sequence, or b'***unknown(...)***' for an
+            escape sequence that is not known
+        :rtype: bytes
+        '''
+        if escape in BytesUtility.bytes_rep_escape_dict:
+            return BytesUtility.bytes_rep_escape_dict[escape]
+        if escape[1] == 'x':
+            # - not 2 hexadecimal digits, which binascii reports as an error
+            return binascii.unhexlify(escape[2:])
+        return b'***unknown(' + escape.encode() + b')***'
     
     @staticmethod
     def bytes_to_bytes_rep(data: bytes):
@@ -0,0 +1,326 @@
+# file: bytes_view.py
+
+'''
+Cursor over an Array of Bytes
+'''
+
+from common_util.bytes_util import BytesUtility
+
+class BytesView:
+    '''
+    A cursor that reads fields one after another from an array of bytes.
+
+    The bytes read are returned as slices of a memoryview of the array of bytes,
+    which share its memory instead of copying it.
+    '''
+
+    def __init__(self, data, pos=0, end_pos=-1, endian='little'):
+        '''
+        Initialize the object.
+
+        :param data: the array of bytes to read
+        :type data: bytes, or bytes-like object such as bytearray, mmap or memoryview
+        :param pos: the starting position of the cursor; the cursor can never be
+            moved before it
+        :type pos: int, optional
+        :param end_pos: the position to stop reading at; negative value means the
+            end of data
+        :type end_pos: int, optional
+        :param endian: the default endian for read_int() and peek_int();
+            (a) acceptable values are 'little' and 'big'
+        :type endian: str, optional
+
+        :raise: ValueError if pos or end_pos is outside data
+        '''
+        self.data = data
+        self.view = memoryview(data)
+        if self.view.format != 'B' or self.view.ndim != 1:
+            self.view = self.view.cast('B')
+        if end_pos < 0:
+            end_pos = len(self.view)
+        if end_pos > len(self.view):
+            raise ValueError(f'end_pos is beyond the end of data ({end_pos})')
+        if pos < 0 or pos > end_pos:
+            raise ValueError(f'pos is outside data ({pos})')
+        self.start_pos = pos
+        self.pos = pos
+        self.end_pos = end_pos
+        self.endian = endian
+        return
+
+    def __len__(self):
+        '''
+        Get the number of bytes from the cursor to end_pos.
+
+        :return: the number of bytes remaining
+        :rtype: int
+        '''
+        return self.end_pos - self.pos
+
+    # --- Position of the Cursor
+
+    def tell(self):
+        '''
+        Get the position of the cursor.
+
+        :return: the position of the cursor in data
+        :rtype: int
+        '''
+        return self.pos
+
+    def seek(self, pos):
+        '''
+        Move the cursor to a position.
+
+        :param pos: the new position of the cursor in data
+        :type pos: int
+
+        :raise: ValueError if pos is before the starting position of the view, or
+            beyond end_pos
+
+        :return: the new position
+        :rtype: int
+        '''
+        if pos < self.start_pos or pos > self.end_pos:
+            raise ValueError(f'pos is outside the view ({pos})')
+        self.pos = pos
+        return self.pos
+
+    def skip(self, length):
+        '''
+        Move the cursor forward.
+
+        :param length: the number of bytes to skip
+        :type length: int
+
+        :raise: ValueError if there are not enough bytes
+
+        :return: the new position
+        :rtype: int
+        '''
+        self.check_sufficient_bytes(length)
+        self.pos += length
+        return self.pos
+
+    def has_sufficient_bytes(self, length, offset=0):
+        '''
+        Check if there are enough bytes after the cursor, as in
+        BytesUtility.has_sufficient_bytes(), but up to end_pos.
+
+        :param length: the number of bytes required
+        :type length: int
+        :param offset: the offset of the first required byte, counting from the
+            cursor
+        :type offset: int, optional
+
+        :return: True if there are enough bytes, otherwise False
+        :rtype: bool
+        '''
+        return offset >= 0 and length >= 0 and self.end_pos >= self.pos + offset + length
+
+    # --- Reading Fields
+
+    def peek(self, length, offset=0):
+        '''
+        Get the bytes after the cursor without moving it.
+
+        :param length: the number of bytes to get
+        :type length: int
+        :param offset: the offset of the first byte to get, counting from the cursor
+        :type offset: int, optional
+
+        :raise: ValueError if there are not enough bytes
+
+        :return: the bytes, which share the memory of data
+        :rtype: memoryview
+        '''
+        self.check_sufficient_bytes(length, offset=offset)
+        start_pos = self.pos + offset
+        return self.view[start_pos:start_pos+length]
+
+    def peek_int(self, length, offset=0, endian=None, signed=False):
+        '''
+        Get the integer after the cursor without moving it.
+
+        :param length: the number of bytes of the integer
+        :type length: int
+        :param offset: the offset of the integer, counting from the cursor
+        :type offset: int, optional
+        :param endian: 'little' or 'big'; None means the endian of the object
+        :type endian: str, optional
+        :param signed: when True, the integer is signed
+        :type signed: bool, optional
+
+        :raise: ValueError if there are not enough bytes
+
+        :return: the integer
+        :rtype: int
+        '''
+        return int.from_bytes(
+            self.peek(length, offset=offset), endian or self.endian, signed=signed
+        )
+
+    def read_bytes(self, length):
+        '''
+        Read the bytes after the cursor, and move the cursor past them.
+
+        :param length: the number of bytes to read
+        :type length: int
+
+        :raise: ValueError if there are not enough bytes
+
+        :return: the bytes, which share the memory of data
+        :rtype: memoryview
+        '''
+        result = self.peek(length)
+        self.pos += length
+        return result
+
+    def read_int(self, length, endian=None, signed=False):
+        '''
+        Read the integer after the cursor, and move the cursor past it.
+
+        :param length: the number of bytes of the integer
+        :type length: int
+        :param endian: 'little' or 'big'; None means the endian of the object
+        :type endian: str, optional
+        :param signed: when True, the integer is signed
+        :type signed: bool, optional
+
+        :raise: ValueError if there are not enough bytes
+
+        :return: the integer
+        :rtype: int
+        '''
+        result = self.peek_int(length, endian=endian, signed=signed)
+        self.pos += length
+        return result
+
+    def read_until(self, marker, step=1, max_search_length=-1,
+                   include_marker=False, empty_if_not_found=False):
+        '''
+        Read the bytes after the cursor until marker, as in
+        BytesUtility.extract_bytes_until(), but up to end_pos.
+
+        If the marker is found, the cursor is moved past the marker, even when the
+        marker is not included in the result. If it is not found, the cursor is
+        moved past the bytes returned; nothing is read if empty_if_not_found is True.
+
+        The search is done by the find() of data. A memoryview has no find(), so a
+        copy of the searched range is searched instead.
+
+        :param marker: the bytes to search for
+        :type marker: bytes
+        :param step: see BytesUtility.extract_bytes_until()
+        :type step: int, optional
+        :param max_search_length: see BytesUtility.extract_bytes_until()
+        :type max_search_length: int, optional
+        :param include_marker: see BytesUtility.extract_bytes_until()
+        :type include_marker: bool, optional
+        :param empty_if_not_found: see BytesUtility.extract_bytes_until()
+        :type empty_if_not_found: bool, optional
+
+        :raise: ValueError if marker is empty, or step is not positive
+
+        :return: the bytes, which share the memory of data
+        :rtype: memoryview
+        '''
+        marker_length = len(marker)
+        if marker_length <= 0:
+            raise ValueError('marker length cannot be zero')
+        if step <= 0:
+            raise ValueError(f'step must be positive ({step})')
+
+        end_pos = self.end_pos
+        if max_search_length > 0:
+            end_pos = min(end_pos, self.pos + max_search_length)
+        # - the marker must be within the view, so search only up to end_pos
+        search_data = self.data if hasattr(self.data, 'find') else self.view
+        found_pos = BytesUtility.find_marker(
+            search_data, marker, self.pos, min(end_pos, self.end_pos - marker_length + 1), step=step
+        )
+
+        if found_pos >= 0:
+            result_length = found_pos - self.pos
+            if include_marker:
+                result_length += marker_length
+            next_pos = found_pos + marker_length
+        elif empty_if_not_found:
+            result_length = 0
+            next_pos = self.pos
+        else:
+            # - up to the first position of the search after end_pos
+            result_length = min(
+                (end_pos - self.pos + step - 1) // step * step, self.end_pos - self.pos
+            )
+            next_pos = self.pos + result_length
+        result = self.view[self.pos:self.pos+result_length]
+        self.pos = next_pos
+        return result
+
+    def read_record(self, layout):
+        '''
+        Read a record after the cursor, and move the cursor past it.
+
+        :param layout: the layout of the record
+        :type layout: BytesUtility.RecordLayout
+
+        :raise: ValueError if there are not enough bytes
+
+        :return: the values of the fields, see BytesUtility.RecordLayout.unpack()
+        :rtype: tuple
+        '''
+        self.check_sufficient_bytes(layout.size)
+        result = layout.unpack(self.view, self.pos)
+        self.pos += layout.size
+        return result
+
+    def read_view(self, length, endian=None):
+        '''
+        Read the bytes after the cursor as a new BytesView, and move the cursor
+        past them; for example, to parse a nested structure of known length.
+
+        The positions in the new BytesView are the same as in this object, but its
+        cursor cannot be moved outside the bytes read.
+
+        :param length: the number of bytes of the new BytesView
+        :type length: int
+        :param endian: the endian of the new BytesView; None means the endian of
+            this object
+        :type endian: str, optional
+
+        :raise: ValueError if there are not enough bytes
+
+        :return: a BytesView over the bytes, sharing the memory of data
+        :rtype: BytesView
+        '''
+        self.check_sufficient_bytes(length)
+        result = BytesView(
+            self.data, pos=self.pos, end_pos=self.pos+length, endian=endian or self.endian
+        )
+        self.pos += length
+        return result
+
+    # --- Internal Functions
+
+    def check_sufficient_bytes(self, length, offset=0):
+        '''
+        (Internal) Raise an exception if there are not enough bytes after the
+        cursor.
+
+        :meta private:
+        :param length: see has_sufficient_bytes()
+        :type length: int
+        :param offset: see has_sufficient_bytes()
+        :type offset: int, optional
+
+        :raise: ValueError if there are not enough bytes
+        '''
+        if not self.has_sufficient_bytes(length, offset=offset):
+            raise ValueError(
+                f'insufficient bytes at {self.pos} for {length} bytes at offset {offset}'
+                f' (only {len(self)} bytes remaining)'
+            )
+        return
+
+# --- end of file --- #
@@ -0,0 +1,48 @@
+# file: executor_util.py
+
+'''
+Utilities for Executors of Tasks
+'''
+
+import collections
+
+class ExecutorUtility:
+    '''
+    A collection of utilities for running tasks in a concurrent.futures.Executor
+    '''
+
+    @staticmethod
+    def map_in_order(executor, function, task_list, max_pending=2):
+        '''
+        Run function for each task in an executor, and return the results in the
+        order of task_list.
+
+        At most max_pending tasks are submitted ahead of the result being
+        returned, so the memory used does not depend on the number of tasks.
+
+        :param executor: the executor to run the function, e.g. a
+            ThreadPoolExecutor or a ProcessPoolExecutor
+        :type executor: concurrent.futures.Executor
+        :param function: the function to run
+        :type function: function
+        :param task_list: (tag, args) of each task, where args are the arguments
+            of function, and tag is returned together with the result
+        :type task_list: iterable of tuple
+        :param max_pending: the maximum number of tasks submitted ahead
+        :type max_pending: int, optional
+
+        :return: (tag, result) of each task
+        :rtype: generator of tuple
+        '''
+        pending = collections.deque()
+        for tag, args in task_list:
+            pending.append((tag, executor.submit(function, *args)))
+            if len(pending) >= max_pending:
+                tag, future = pending.popleft()
+                yield tag, future.result()
+        while len(pending) > 0:
+            tag, future = pending.popleft()
+            yield tag, future.result()
+        return
+
+# --- end of file --- #
@@ -5,7 +5,9 @@ Containers that stores file information
 '''
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from common_util.dir_util import DirectoryUtility
+from common_util.executor_util import ExecutorUtility
 from common_util.file_util import FileUtility
 from common_util.container.multi_level_index import MultiLevelIndex
 
@@ -103,18 +105,47 @@ class FileIndex:
     # - FileIndex Class
 
     INDEX_DIGEST = 0
-    '''Index using MD5 digest'''
+    '''Index using digest of the file content'''
     INDEX_FILENAME = 1
     '''Index using filename'''
         
-    def __init__(self, index_type=INDEX_DIGEST):
+    def __init__(self, index_type=INDEX_DIGEST, algorithm='md5', staged=False,
+                 partial_size=FileUtility.default_partial_size, hash_cache=None):
         '''
         Initialize a FileIndex
 
         :param index_type: the type of index to use as index for file,
             Valid values are FileIndex.INDEX_DIGEST or FileIndex.INDEX_FILENAME.
         :type index_type: int
+        :param algorithm: the hash algorithm for the digests of the files;
+            see FileUtility.create_hash()
+        :type algorithm: str, optional
+        :param staged: when True, only the sizes of the files are taken when they
+            are added, and get_duplicate_file_list() hashes in stages only the
+            files that may be duplicates; see hash_staged_files().
+            Only for FileIndex.INDEX_DIGEST.
+        :type staged: bool, optional
+        :param partial_size: the number of bytes at each end of a file that is
+            hashed in the partial hash stage; see FileUtility.get_file_partial_hash()
+        :type partial_size: int, optional
+        :param hash_cache: the cache of the digests of files; when given, the
+            digests of unchanged files are taken from the cache instead of
+            reading the files
+        :type hash_cache: HashCache, optional
+
+        :raise: ValueError if the algorithm is not supported, or staged is True
+            for FileIndex.INDEX_FILENAME
         '''
+        # - check the algorithm before any file is added
+        FileUtility.create_hash(algorithm)
+        if staged and index_type == FileIndex.INDEX_FILENAME:
+            raise ValueError('staged can only be used with FileIndex.INDEX_DIGEST')
+        self.algorithm = algorithm
+        self.staged = staged
+        self.partial_size = partial_size
+        self.hash_cache = hash_cache
+        # - for staged: file size -> list of [dirname, file, file_size, partial_digest, digest]
+        self.size_index = {}
         self.max_level = 5
         self.index_type = index_type
         if self.index_type == FileIndex.INDEX_FILENAME:
@@ -146,21 +177,18 @@ class FileIndex:
 
         :return: nothing is returned for this function
         '''
-        full_path = os.path.join(dirname, file)
-        digest = FileUtility.get_file_md5_hash(dirname, file)
-        file_size = FileUtility.get_file_size(dirname, file)
-        if self.index_type == FileIndex.INDEX_FILENAME:
-            data_item_key = os.path.basename(full_path)
-        else:
-            data_item_key = digest
-        data_item = self.create_data_item(dirname, file, file_size, digest)
-        self.indexes.add(data_item_key, data_item)
-        if verbose:
-            print(f' - {file}: {file_size} {digest}')
+        if self.staged:
+            file_size = FileUtility.get_file_size(dirname, file)
+            self.size_index.setdefault(file_size, []).append([ dirname, file, file_size, None, None ])
+            if verbose:
+                print(f' - {file}: {file_size}')
+            return
+        file_size, digest = self.get_file_information(dirname, file)
+        self.add_file_information(dirname, file, file_size, digest, verbose=verbose)
         return
-    
+
     def add_from_directory(self, dirname, pattern='*', include_hidden=False,
-                           verbose=False):
+                           workers=1, verbose=False):
         '''
         Add files from a directory to the index
 
@@ -172,6 +200,11 @@ class FileIndex:
         :param include_hidden: when True, include hidden files
         :type include_hidden: bool, optional
 
+        :param workers: the number of threads to compute the digests of the files;
+            the files are still added to the index one by one, in the order they
+            are listed, and at most 4 files per thread are hashed ahead of that
+        :type workers: int, optional
+
         :param verbose: print some debugging information
         :type verbose: bool, optional
 
@@ -181,25 +214,40 @@ class FileIndex:
             dirname, pattern, recursive=True, get_relative_path=True,
             include_hidden=include_hidden
         )
-        for file in file_list:
-            self.add_file(dirname, file, verbose=verbose)
+        if workers <= 1 or self.staged:
+            for file in file_list:
+                self.add_file(dirname, file, verbose=verbose)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                result_list = ExecutorUtility.map_in_order(
+                    executor, self.get_file_information,
+                    ((file, (dirname, file)) for file in file_list),
+                    max_pending=workers * 4
+                )
+                for file, (file_size, digest) in result_list:
+                    self.add_file_information(dirname, file, file_size, digest, verbose=verbose)
         if verbose:
             print('=======')
         return
 
-    def get_duplicate_file_list(self, verbose=False):
+    def get_duplicate_file_list(self, workers=1, verbose=False):
         '''
         Get a list of files with same key
 
+        :param workers: the number of threads to hash the files, when staged is True
+        :type workers: int, optional
+
         :param verbose: print some debugging information
         :type verbose: bool, optional
 
         :return: a list of tuple (count, key, file_information),
             where count is the number of files with same key,
-            key is the key of the files (which could be filename or MD5 digest),
+            key is the key of the files (which could be filename or digest),
             and file_information is the information of the files
         :rtype: tuple
         '''
+        if self.staged:
+            self.hash_staged_files(workers=workers, verbose=verbose)
         duplicate_file_list = []
         for digest, value in self.indexes.iterate_entry():
             # TODO: to check: digest is actually key, which could be filename or digest
@@ -211,9 +259,184 @@ class FileIndex:
                 print(f'({count}) {digest}: {value}')
         return duplicate_file_list
     
+    def hash_staged_files(self, workers=1, verbose=False):
+        '''
+        Hash the files added with staged set to True, that may be duplicates, and
+        add them to the index.
+
+        The files are hashed in stages:
+        (a) a file with a size that no other file has is not hashed;
+        (b) files with the same size are hashed with a partial hash, on the first
+        and last partial_size bytes of the files;
+        (c) files with the same size and the same partial digest are hashed in full,
+        and added to the index.
+
+        Files no larger than 2 * partial_size are hashed in full without the partial
+        hash, which would read the same bytes. A file is hashed at most once in each
+        stage, so this function can be called again after more files are added.
+
+        :param workers: the number of threads to hash the files
+        :type workers: int, optional
+
+        :param verbose: print some debugging information
+        :type verbose: bool, optional
+
+        :return: (partial_count, full_count), the numbers of files hashed in this
+            call with the partial hash and the full hash
+        :rtype: tuple
+        '''
+        # - stage (b): partial hash of the large files with the same size
+        partial_entry_list = [
+            entry
+            for file_size, entry_list in self.size_index.items()
+            if len(entry_list) >= 2 and file_size > 2 * self.partial_size
+            for entry in entry_list if entry[3] is None
+        ]
+        for entry, partial_digest in self.map_entries(
+            self.get_file_partial_digest, partial_entry_list, workers
+        ):
+            entry[3] = partial_digest
+
+        # - stage (c): full hash of the files with the same size and partial digest
+        full_entry_list = []
+        for file_size, entry_list in self.size_index.items():
+            if len(entry_list) < 2:
+                continue
+            entry_group_dict = {}
+            for entry in entry_list:
+                entry_group_dict.setdefault(entry[3], []).append(entry)
+            for entry_group in entry_group_dict.values():
+                if len(entry_group) >= 2:
+                    full_entry_list.extend([ entry for entry in entry_group if entry[4] is None ])
+        for entry, digest in self.map_entries(self.get_file_digest, full_entry_list, workers):
+            entry[4] = digest
+            dirname, file, file_size = entry[0], entry[1], entry[2]
+            self.add_file_information(dirname, file, file_size, digest, verbose=verbose)
+
+        if verbose:
+            file_count = sum([ len(entry_list) for entry_list in self.size_index.values() ])
+            print(f'staged: {file_count} files, {len(partial_entry_list)} partial hashes,'
+                  f' {len(full_entry_list)} full hashes')
+        return len(partial_entry_list), len(full_entry_list)
+
     # --- Internal Functions
 
-    def create_data_item(self, dirname, file, file_size, digest):
+    def map_entries(self, function, entry_list, workers=1):
+        '''
+        (Internal) Run function(dirname, file) for each entry of the staged files,
+        in a thread pool if workers is more than 1
+
+        :meta private:
+        :param function: the function to run
+        :type function: function
+        :param entry_list: the entries [dirname, file, ...]
+        :type entry_list: list of list
+        :param workers: the number of threads
+        :type workers: int, optional
+
+        :return: (entry, result) of each entry, in the order of entry_list
+        :rtype: generator of tuple
+        '''
+        task_list = ((entry, (entry[0], entry[1])) for entry in entry_list)
+        if workers <= 1:
+            for entry, args in task_list:
+                yield entry, function(*args)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for entry, result in ExecutorUtility.map_in_order(
+                executor, function, task_list, max_pending=workers * 4
+            ):
+                yield entry, result
+        return
+
+    def get_file_information(self, dirname, file):
+        '''
+        (Internal) Get the size and digest of a file;
+        this function may run in a thread other than the main thread
+
+        :meta private:
+        :param dirname: directory of the file
+        :param file: name of the file
+        :type dirname: str
+        :type file: str
+
+        :return: (file_size, digest)
+        :rtype: tuple
+        '''
+        digest = self.get_file_digest(dirname, file)
+        file_size = FileUtility.get_file_size(dirname, file)
+        return file_size, digest
+
+    def get_file_digest(self, dirname, file):
+        '''
+        (Internal) Get the digest of a file, from the hash cache if there is one
+
+        :meta private:
+        :param dirname: directory of the file
+        :param file: name of the file
+        :type dirname: str
+        :type file: str
+
+        :return: the digest of the file
+        :rtype: str
+        '''
+        if self.hash_cache is not None:
+            return self.hash_cache.get_file_hash(dirname, file, algorithm=self.algorithm)
+        return FileUtility.get_file_hash(dirname, file, algorithm=self.algorithm)
+
+    def get_file_partial_digest(self, dirname, file):
+        '''
+        (Internal) Get the partial digest of a file, from the hash cache if there
+        is one
+
+        :meta private:
+        :param dirname: directory of the file
+        :param file: name of the file
+        :type dirname: str
+        :type file: str
+
+        :return: the partial digest of the file
+        :rtype: str
+        '''
+        if self.hash_cache is not None:
+            return self.hash_cache.get_file_partial_hash(
+                dirname, file, algorithm=self.algorithm, partial_size=self.partial_size
+            )
+        return FileUtility.get_file_partial_hash(
+            dirname, file, algorithm=self.algorithm, partial_size=self.partial_size
+        )
+
+    def add_file_information(self, dirname, file, file_size, digest, verbose=False):
+        '''
+        (Internal) Add one file to the index with its size and digest
+
+        :meta private:
+        :param dirname: directory of the file
+        :param file: name of the file
+        :param file_size: size of the file
+        :param digest: digest of the file
+        :type dirname: str
+        :type file: str
+        :type file_size: int
+        :type digest: str
+
+        :param verbose: print some debugging information
+        :type verbose: bool, optional
+
+        :return: nothing is returned for this function
+        '''
+        full_path = os.path.join(dirname, file)
+        if self.index_type == FileIndex.INDEX_FILENAME:
+            data_item_key = os.path.basename(full_path)
+        else:
+            data_item_key = digest
+        data_item = self.create_data_item(dirname, file, file_size, digest, self.algorithm)
+        self.indexes.add(data_item_key, data_item)
+        if verbose:
+            print(f' - {file}: {file_size} {digest}')
+        return
+
+    def create_data_item(self, dirname, file, file_size, digest, algorithm):
         '''
         (Internal) Create a data item for inserting into the index
 
@@ -221,15 +444,17 @@ class FileIndex:
         :param dirname: directory name of the file
         :param file: name of the file
         :param file_size: size of the file
-        :param digest: MD5 digest of the file
+        :param digest: digest of the file
+        :param algorithm: hash algorithm of the digest
         :type dirname: str
         :type file: str
         :type file_size: int
         :type digest: str
+        :type algorithm: str
 
-        :return: the tuple (dirname, file, file_size, digest)
+        :return: the tuple (dirname, file, file_size, digest, algorithm)
         :rtype: tuple
         '''
-        return (dirname, file, file_size, digest)
+        return (dirname, file, file_size, digest, algorithm)
 
 # --- end of file --- #
@@ -7,6 +7,11 @@ Utilities for Files
 import os
 import hashlib
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 class FileUtility:
     '''
     A collection of utilities for handling files
@@ -29,24 +34,199 @@ class FileUtility:
         file_size = os.path.getsize(full_filename)
         return file_size
 
+    default_buffer_size = 1024 * 1024
+    '''The default number of bytes to read at a time when hashing a file'''
+
     @staticmethod
-    def get_file_md5_hash(dirname, filename):
+    def get_file_md5_hash(dirname, filename, buffer_size=default_buffer_size):
         '''
         Compute the MD5 digest of a file
 
+        The file is read in chunks of buffer_size bytes into a reused buffer, so
+        the memory used does not depend on the size of the file.
+
         :param dirname: the name of the directory
         :type dirname: str
         :param filename: the name of the file
         :type filename: str
+        :param buffer_size: the number of bytes to read at a time
+        :type buffer_size: int, optional
 
         :return: the MD5 digest of the file
         :rtype: str
         '''
+        return FileUtility.get_file_hash(
+            dirname, filename, algorithm='md5', buffer_size=buffer_size
+        )
+
+    @staticmethod
+    def get_file_hash(dirname, filename, algorithm='md5', buffer_size=default_buffer_size):
+        '''
+        Compute the digest of a file with a hash algorithm
+
+        The file is read in chunks of buffer_size bytes into a reused buffer, so
+        the memory used does not depend on the size of the file.
+
+        :param dirname: the name of the directory
+        :type dirname: str
+        :param filename: the name of the file
+        :type filename: str
+        :param algorithm: the name of the hash algorithm; see create_hash()
+        :type algorithm: str, optional
+        :param buffer_size: the number of bytes to read at a time
+        :type buffer_size: int, optional
+
+        :raise: ValueError if the algorithm is not supported
+
+        :return: the digest of the file, in hex
+        :rtype: str
+        '''
+        full_filename = os.path.join(dirname, filename)
+        data_hash = FileUtility.create_hash(algorithm)
+        with open(full_filename, 'rb', buffering=0) as fd:
+            FileUtility.update_hash_from_file(data_hash, fd, buffer_size=buffer_size)
+        digest = data_hash.hexdigest()
+        return digest
+
+    default_partial_size = 8 * 1024
+    '''The default number of bytes at each end of a file for a partial hash'''
+
+    @staticmethod
+    def get_file_partial_hash(dirname, filename, algorithm='md5',
+                              partial_size=default_partial_size):
+        '''
+        Compute the digest of the first and last partial_size bytes of a file
+
+        Files with the same content have the same partial digest, so files with
+        different partial digests cannot be duplicates. A file of at most
+        2 * partial_size bytes is hashed in full, so its partial digest is the
+        same as its digest from get_file_hash().
+
+        :param dirname: the name of the directory
+        :type dirname: str
+        :param filename: the name of the file
+        :type filename: str
+        :param algorithm: the name of the hash algorithm; see create_hash()
+        :type algorithm: str, optional
+        :param partial_size: the number of bytes to hash at each end of the file
+        :type partial_size: int, optional
+
+        :raise: ValueError if the algorithm is not supported, or partial_size is
+            not positive
+
+        :return: the partial digest of the file, in hex
+        :rtype: str
+        '''
+        if partial_size <= 0:
+            raise ValueError(f'partial_size must be positive ({partial_size})')
         full_filename = os.path.join(dirname, filename)
+        data_hash = FileUtility.create_hash(algorithm)
         with open(full_filename, 'rb') as fd:
-            data = fd.read()
-        data_hash = hashlib.md5(data)
+            file_size = os.fstat(fd.fileno()).st_size
+            if file_size <= 2 * partial_size:
+                FileUtility.update_hash_from_file(data_hash, fd)
+            else:
+                data_hash.update(fd.read(partial_size))
+                fd.seek(file_size - partial_size)
+                data_hash.update(fd.read(partial_size))
         digest = data_hash.hexdigest()
         return digest
 
+    # --- Hash Algorithms
+
+    xxhash_algorithm_list = [ 'xxh32', 'xxh64', 'xxh3_64', 'xxh3_128', 'xxh128' ]
+    '''The hash algorithms from the module xxhash, when it is installed'''
+
+    @staticmethod
+    def create_hash(algorithm='md5'):
+        '''
+        Create a hash object for a hash algorithm
+
+        :param algorithm: the name of the hash algorithm;
+            (a) any algorithm of hashlib with a fixed digest size, e.g. 'md5', 'sha1',
+            'sha256', 'blake2b';
+            (b) 'blake2b-<bits>' or 'blake2s-<bits>' for BLAKE2 with a smaller digest,
+            e.g. 'blake2b-128';
+            (c) 'xxh32', 'xxh64', 'xxh3_64', 'xxh3_128' or 'xxh128', if the module
+            xxhash is installed
+        :type algorithm: str, optional
+
+        :raise: ValueError if the algorithm is not supported
+
+        :return: the hash object, with update() and hexdigest()
+        :rtype: hash object
+        '''
+        name = algorithm.lower()
+        if name in FileUtility.xxhash_algorithm_list:
+            if xxhash is None:
+                raise ValueError(f'hash algorithm {algorithm} requires the module xxhash')
+            return getattr(xxhash, name)()
+        if name.startswith('blake2b-') or name.startswith('blake2s-'):
+            bits = name[len('blake2b-'):]
+            if not bits.isdigit() or int(bits) % 8 != 0:
+                raise ValueError(f'invalid digest size of hash algorithm {algorithm}')
+            constructor = hashlib.blake2b if name.startswith('blake2b') else hashlib.blake2s
+            return constructor(digest_size=int(bits) // 8)
+        if name.startswith('shake_'):
+            raise ValueError(f'hash algorithm {algorithm} has no fixed digest size')
+        try:
+            return hashlib.new(name)
+        except ValueError:
+            raise ValueError(f'unsupported hash algorithm {algorithm}')
+
+    @staticmethod
+    def get_hash_algorithm_list():
+        '''
+        Get the names of the hash algorithms that can be used
+
+        The names 'blake2b-<bits>' and 'blake2s-<bits>' are not listed.
+
+        :return: the names of the hash algorithms, sorted
+        :rtype: list of str
+        '''
+        algorithm_list = [
+            name for name in hashlib.algorithms_available
+            if not name.startswith('shake_') and name == name.lower()
+        ]
+        if xxhash is not None:
+            algorithm_list.extend(FileUtility.xxhash_algorithm_list)
+        return sorted(set(algorithm_list))
+
+    # --- Internal Functions
+
+    @staticmethod
+    def update_hash_from_file(data_hash, fd, buffer_size=default_buffer_size):
+        '''
+        (Internal) Update a hash object with the bytes read from a file, from its
+        current position to its end.
+
+        The bytes are read by readinto() into one buffer that is reused for every
+        chunk, so no new bytes object is created for each chunk.
+
+        :meta private:
+        :param data_hash: the hash object, e.g. from hashlib.md5()
+        :type data_hash: hash object
+        :param fd: the file, opened in binary mode
+        :type fd: file object
+        :param buffer_size: the number of bytes to read at a time
+        :type buffer_size: int, optional
+
+        :raise: ValueError if buffer_size is not positive
+
+        :return: the number of bytes read
+        :rtype: int
+        '''
+        if buffer_size <= 0:
+            raise ValueError(f'buffer_size must be positive ({buffer_size})')
+        buffer = bytearray(buffer_size)
+        buffer_view = memoryview(buffer)
+        byte_count = 0
+        while True:
+            read_length = fd.readinto(buffer)
+            if not read_length:
+                break
+            data_hash.update(buffer_view[:read_length])
+            byte_count += read_length
+        return byte_count
+
 # --- end of file --- #
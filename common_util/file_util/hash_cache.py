@@ -0,0 +1,250 @@
+# file: hash_cache.py
+
+'''
+Persistent cache of file digests
+'''
+
+import os
+import sqlite3
+import threading
+from common_util.file_util import FileUtility
+
+class HashCache:
+    '''
+    A cache of the digests of files, stored in an SQLite database file.
+
+    A digest is keyed by (st_dev, st_ino, st_size, st_mtime_ns) of the file, the
+    hash algorithm, and the kind of hash (full or partial). A file that has not
+    changed since it was hashed is served from the cache without being read; a
+    file that has changed has a different key, so its old digest is never used.
+
+    The object can be shared by several threads.
+    '''
+
+    KIND_FULL = 'full'
+    '''Kind of hash for the digest of the whole file'''
+
+    commit_interval = 1000
+    '''The number of new digests to store before they are committed'''
+
+    def __init__(self, filename):
+        '''
+        Initialize the object, and create the database file if it does not exist
+
+        :param filename: the name of the database file; ':memory:' for a cache
+            that is not stored
+        :type filename: str
+        '''
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS file_hash ('
+            ' st_dev INTEGER, st_ino INTEGER, st_size INTEGER, st_mtime_ns INTEGER,'
+            ' algorithm TEXT, kind TEXT, path TEXT, digest TEXT,'
+            ' PRIMARY KEY (st_dev, st_ino, st_size, st_mtime_ns, algorithm, kind))'
+        )
+        self.connection.commit()
+        self.pending_count = 0
+        self.hit_count = 0
+        self.miss_count = 0
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        '''
+        Get the number of digests in the cache
+
+        :return: the number of digests
+        :rtype: int
+        '''
+        with self.lock:
+            (count,) = self.connection.execute('SELECT COUNT(*) FROM file_hash').fetchone()
+        return count
+
+    # --- Digests of Files
+
+    def get_file_hash(self, dirname, filename, algorithm='md5',
+                      buffer_size=FileUtility.default_buffer_size):
+        '''
+        Get the digest of a file from the cache, or compute it with
+        FileUtility.get_file_hash() and store it in the cache
+
+        :param dirname: the name of the directory
+        :type dirname: str
+        :param filename: the name of the file
+        :type filename: str
+        :param algorithm: see FileUtility.get_file_hash()
+        :type algorithm: str, optional
+        :param buffer_size: see FileUtility.get_file_hash()
+        :type buffer_size: int, optional
+
+        :raise: ValueError if the algorithm is not supported
+
+        :return: the digest of the file, in hex
+        :rtype: str
+        '''
+        return self.get_digest(
+            dirname, filename, algorithm, HashCache.KIND_FULL,
+            lambda: FileUtility.get_file_hash(
+                dirname, filename, algorithm=algorithm, buffer_size=buffer_size
+            )
+        )
+
+    def get_file_partial_hash(self, dirname, filename, algorithm='md5',
+                              partial_size=FileUtility.default_partial_size):
+        '''
+        Get the partial digest of a file from the cache, or compute it with
+        FileUtility.get_file_partial_hash() and store it in the cache
+
+        :param dirname: the name of the directory
+        :type dirname: str
+        :param filename: the name of the file
+        :type filename: str
+        :param algorithm: see FileUtility.get_file_partial_hash()
+        :type algorithm: str, optional
+        :param partial_size: see FileUtility.get_file_partial_hash()
+        :type partial_size: int, optional
+
+        :raise: ValueError if the algorithm is not supported
+
+        :return: the partial digest of the file, in hex
+        :rtype: str
+        '''
+        return self.get_digest(
+            dirname, filename, algorithm, f'partial-{partial_size}',
+            lambda: FileUtility.get_file_partial_hash(
+                dirname, filename, algorithm=algorithm, partial_size=partial_size
+            )
+        )
+
+    # --- Maintenance of the Cache
+
+    def prune(self):
+        '''
+        Remove the digests of files that no longer exist, or that have changed
+        since they were hashed
+
+        :return: the number of digests removed
+        :rtype: int
+        '''
+        with self.lock:
+            row_list = self.connection.execute(
+                'SELECT DISTINCT path, st_dev, st_ino, st_size, st_mtime_ns FROM file_hash'
+            ).fetchall()
+        stale_list = []
+        for path, st_dev, st_ino, st_size, st_mtime_ns in row_list:
+            try:
+                file_key = HashCache.get_file_key(os.stat(path))
+            except OSError:
+                file_key = None
+            if file_key != (st_dev, st_ino, st_size, st_mtime_ns):
+                stale_list.append((path, st_dev, st_ino, st_size, st_mtime_ns))
+        with self.lock:
+            removed_count = 0
+            for stale in stale_list:
+                cursor = self.connection.execute(
+                    'DELETE FROM file_hash WHERE path = ? AND st_dev = ? AND st_ino = ?'
+                    ' AND st_size = ? AND st_mtime_ns = ?', stale
+                )
+                removed_count += cursor.rowcount
+            self.connection.commit()
+            self.pending_count = 0
+        return removed_count
+
+    def commit(self):
+        '''
+        Commit the new digests to the database file
+
+        :return: nothing is returned by this function
+        '''
+        with self.lock:
+            self.connection.commit()
+            self.pending_count = 0
+        return
+
+    def close(self):
+        '''
+        Commit the new digests, and close the database file
+
+        :return: nothing is returned by this function
+        '''
+        with self.lock:
+            if self.connection is not None:
+                self.connection.commit()
+                self.connection.close()
+                self.connection = None
+        return
+
+    # --- Internal Functions
+
+    def get_digest(self, dirname, filename, algorithm, kind, compute_digest):
+        '''
+        (Internal) Get a digest of a file from the cache, or compute it and store
+        it in the cache
+
+        The file is hashed without holding the lock, so several threads can hash
+        files at the same time. The digest is not stored if the file changed while
+        it was hashed, since it may not match either version of the file.
+
+        :meta private:
+        :param dirname: the name of the directory
+        :type dirname: str
+        :param filename: the name of the file
+        :type filename: str
+        :param algorithm: the name of the hash algorithm
+        :type algorithm: str
+        :param kind: the kind of hash, e.g. KIND_FULL
+        :type kind: str
+        :param compute_digest: the function to compute the digest
+        :type compute_digest: function
+
+        :return: the digest
+        :rtype: str
+        '''
+        full_filename = os.path.join(dirname, filename)
+        key = HashCache.get_file_key(os.stat(full_filename)) + (algorithm, kind)
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT digest FROM file_hash WHERE st_dev = ? AND st_ino = ?'
+                ' AND st_size = ? AND st_mtime_ns = ? AND algorithm = ? AND kind = ?', key
+            ).fetchone()
+            if row is not None:
+                self.hit_count += 1
+                return row[0]
+            self.miss_count += 1
+        digest = compute_digest()
+        if HashCache.get_file_key(os.stat(full_filename)) != key[:4]:
+            return digest
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO file_hash VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                key + (os.path.abspath(full_filename), digest)
+            )
+            self.pending_count += 1
+            if self.pending_count >= self.commit_interval:
+                self.connection.commit()
+                self.pending_count = 0
+        return digest
+
+    @staticmethod
+    def get_file_key(file_stat):
+        '''
+        (Internal) Get the key of a file from its stat
+
+        :meta private:
+        :param file_stat: the result of os.stat() of the file
+        :type file_stat: os.stat_result
+
+        :return: (st_dev, st_ino, st_size, st_mtime_ns)
+        :rtype: tuple
+        '''
+        return (file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+
+# --- end of file --- #
@@ -4,9 +4,17 @@
 Output Bytes in Pretty Formats
 '''
 
+import os
 import sys
+import stat
+import array
 import string
 import argparse
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
+from common_util.bytes_util import BytesUtility
+from common_util.executor_util import ExecutorUtility
 
 class HexDump:
     '''
@@ -20,6 +28,33 @@ class HexDump:
     characters like TAB are not included.
     '''
 
+    non_printable_bytes = bytes(range(256)).translate(None, printable.encode())
+    '''
+    The list of byte values that are not in printable.
+    '''
+
+    text_table = bytes.maketrans(non_printable_bytes, b'.' * len(non_printable_bytes))
+    '''
+    The table for bytes.translate() to convert an array of bytes to its text
+    representation, i.e. replacing every byte in non_printable_bytes with '.'.
+    '''
+
+    hex_table = [f'{c:02X}' for c in range(256)]
+    '''
+    The hexadecimal representation of every byte value.
+    '''
+
+    oct_table = [f'{c:03o}' for c in range(256)]
+    '''
+    The octal representation of every byte value.
+    '''
+
+    oct_digit_tables = [bytes(ord(f'{c:03o}'[k]) for c in range(256)) for k in range(3)]
+    '''
+    The tables for bytes.translate() to convert an array of bytes to the first,
+    second and third digit of their octal representation.
+    '''
+
     default_filler_line = f'--------: .....'
     # default_filler_line = f'          <snipped>'
     '''
@@ -27,6 +62,16 @@ class HexDump:
     brief_hexdump().
     '''
 
+    squeeze_line = '*'
+    '''
+    The line that replaces a run of identical lines when squeeze is True.
+    '''
+
+    lines_per_write = 4096
+    '''
+    The default number of lines to write in each call of write() in write_hexdump().
+    '''
+
     DUMPTYPE_HEX = 0
     '''
     Format the bytes as hexadecimal.
@@ -36,16 +81,185 @@ class HexDump:
     Format the bytes as octal.
     '''
 
+    # --- Cache of Formatted Lines
+
+    class LineCache:
+        '''
+        A cache of formatted lines for hexdump(), for dumping windows of the same
+        byte stream over and over, e.g. when paging through it.
+
+        The complete lines are formatted and cached in pages of lines_per_page
+        lines. A page is looked up by its bytes, the label of its first line and
+        the format options, so the cache can be shared by different byte streams,
+        and a byte stream that has been modified is formatted again. The least
+        recently used pages are evicted when more than max_lines lines are cached.
+        '''
+
+        def __init__(self, max_lines=65536, lines_per_page=16):
+            '''
+            Initialize the object.
+
+            :param max_lines: the maximum number of lines to keep in the cache
+            :type max_lines: int, optional
+            :param lines_per_page: the number of lines to format and cache at a time
+            :type lines_per_page: int, optional
+            '''
+            self.max_lines = max_lines
+            self.lines_per_page = max(lines_per_page, 1)
+            self.page_dict = collections.OrderedDict()
+            self.line_count = 0
+            self.hit_count = 0
+            self.miss_count = 0
+            return
+
+        def __len__(self):
+            '''
+            Return the number of lines in the cache.
+
+            :return: the number of lines
+            :rtype: int
+            '''
+            return self.line_count
+
+        def clear(self):
+            '''
+            Remove all the lines from the cache.
+
+            :return: no value is returned by this function
+            '''
+            self.page_dict.clear()
+            self.line_count = 0
+            return
+
+        def format_lines(self, data, start_pos, end_pos, pos_label, sep=' ',
+                         bytes_per_line=16, align_front=True, dump_type=0):
+            '''
+            Format the bytes data[start_pos:end_pos] as lines of hexdump, as
+            HexDump.format_lines() does, taking the complete lines from the cache.
+
+            :param data: the byte stream
+            :type data: bytes, or bytes-like object such as mmap or memoryview
+            :param start_pos: the position of the first byte to format
+            :type start_pos: int
+            :param end_pos: the position after the last byte to format
+            :type end_pos: int
+            :param pos_label: the value of the tag to label data[start_pos]
+            :type pos_label: int
+
+            :param sep: see hexdump()
+            :type sep: str, optional
+            :param bytes_per_line: see hexdump()
+            :type bytes_per_line: int, optional
+            :param align_front: see hexdump()
+            :type align_front: bool, optional
+            :param dump_type: see hexdump()
+            :type dump_type: int, optional
+
+            :return: An array contains the bytes in pretty format
+            :rtype: list of str
+            '''
+            start_pos, end_pos, _ = slice(start_pos, end_pos).indices(len(data))
+            end_pos = max(end_pos, start_pos)
+            # - the complete lines are data[first_pos:last_pos]
+            front_padding_count = pos_label % bytes_per_line if align_front else 0
+            first_pos = start_pos + (-front_padding_count % bytes_per_line)
+            last_pos = first_pos + (end_pos - first_pos) // bytes_per_line * bytes_per_line
+            if last_pos <= first_pos:
+                return HexDump.format_lines(
+                    data[start_pos:end_pos], pos_label, sep=sep,
+                    bytes_per_line=bytes_per_line, align_front=align_front,
+                    dump_type=dump_type
+                )
+            label_delta = pos_label - start_pos
+
+            hexdump_array = []
+            if first_pos > start_pos:
+                hexdump_array.extend(HexDump.format_lines(
+                    data[start_pos:first_pos], pos_label, sep=sep,
+                    bytes_per_line=bytes_per_line, align_front=align_front,
+                    dump_type=dump_type
+                ))
+
+            # - the pages are aligned to the labels, so that they are shared by
+            #   overlapping windows
+            page_size = self.lines_per_page * bytes_per_line
+            first_label = first_pos + label_delta
+            page_pos = first_pos - (first_label - first_label % bytes_per_line) % page_size
+            page_pos = max(page_pos, first_pos % bytes_per_line)
+            while page_pos < last_pos:
+                page_end = min(page_pos + page_size, len(data))
+                page_end -= (page_end - page_pos) % bytes_per_line
+                line_list = self.get_page(
+                    data[page_pos:page_end], page_pos + label_delta,
+                    sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+                )
+                hexdump_array.extend(line_list[
+                    max(first_pos - page_pos, 0) // bytes_per_line :
+                    (min(last_pos, page_end) - page_pos) // bytes_per_line
+                ])
+                page_pos = page_end
+
+            if end_pos > last_pos:
+                hexdump_array.extend(HexDump.format_lines(
+                    data[last_pos:end_pos], last_pos + label_delta, sep=sep,
+                    bytes_per_line=bytes_per_line, align_front=align_front,
+                    dump_type=dump_type
+                ))
+            return hexdump_array
+
+        def get_page(self, page, pos_label, sep=' ', bytes_per_line=16, dump_type=0):
+            '''
+            (Internal) Get the formatted lines of a page from the cache, or format
+            them and put them in the cache.
+
+            :meta private:
+            :param page: the bytes of the page; a multiple of bytes_per_line
+            :type page: bytes, or bytes-like object such as memoryview
+            :param pos_label: the value of the tag to label the first byte of page
+            :type pos_label: int
+
+            :param sep: see hexdump()
+            :type sep: str, optional
+            :param bytes_per_line: see hexdump()
+            :type bytes_per_line: int, optional
+            :param dump_type: see hexdump()
+            :type dump_type: int, optional
+
+            :return: the lines of the page in pretty format
+            :rtype: list of str
+            '''
+            if not isinstance(page, bytes):
+                page = bytes(page)
+            key = (page, pos_label, sep, bytes_per_line, dump_type)
+            line_list = self.page_dict.get(key)
+            if line_list is not None:
+                self.hit_count += 1
+                self.page_dict.move_to_end(key)
+                return line_list
+
+            self.miss_count += 1
+            line_list = HexDump.format_complete_lines(
+                page, page.translate(HexDump.text_table).decode('ascii'),
+                0, len(page), pos_label,
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            )
+            self.page_dict[key] = line_list
+            self.line_count += len(line_list)
+            while self.line_count > self.max_lines and len(self.page_dict) > 1:
+                _, evicted_list = self.page_dict.popitem(last=False)
+                self.line_count -= len(evicted_list)
+            return line_list
+
     @staticmethod
     def hexdump(data, offset=0, length=-1, pos=0,
                 sep=' ', bytes_per_line=16, pos_label=-1, align_front=True,
-                dump_type=DUMPTYPE_HEX):
+                dump_type=DUMPTYPE_HEX, squeeze=False, cache=None):
         '''
         Output byte stream in pretty format, formatting as hexadecimal and text with
         position as tag.
 
         :param data: contains the byte stream to output
-        :type data: bytes
+        :type data: bytes, or bytes-like object such as mmap or memoryview
 
         :param offset: the offset of the first byte to output, counting from pos
         :type offset: int, optional
@@ -70,63 +284,139 @@ class HexDump:
             octal (DUMPTYPE_OCT)
         :type dump_type: int, optional
 
+        :param squeeze: when True, a run of complete lines that are identical to the
+            line before them is output as a single squeeze_line ('*'), like the
+            -C option of the hexdump command;
+            the lines in the run are not formatted at all
+        :type squeeze: bool, optional
+
+        :param cache: the cache to take the formatted lines from, when the same
+            byte stream is dumped repeatedly; the cache is not used with squeeze
+        :type cache: HexDump.LineCache or None, optional
+
         :return: An array contains the byte stream in pretty format
         :rtype: list of str
         '''
         if pos_label < 0:
             pos_label = pos + offset
 
-        if dump_type == HexDump.DUMPTYPE_OCT:
-            # Octal
-            blank_hex_str = '   '
-            data_dump_hex_array = HexDump.to_oct_array(
-                data, offset=offset, length=length, pos=pos
-            )
-        else:
-            # default is hexadecimal
-            blank_hex_str = '  '
-            data_dump_hex_array = HexDump.to_hex_array(
-                data, offset=offset, length=length, pos=pos
+        start_pos, end_pos = HexDump.pos_from_offset(
+            len(data), offset=offset, length=length, pos=pos
+        )
+        if cache is not None and not squeeze:
+            return cache.format_lines(
+                data, start_pos, end_pos, pos_label,
+                sep=sep, bytes_per_line=bytes_per_line, align_front=align_front,
+                dump_type=dump_type
             )
+        return HexDump.format_lines(
+            data[start_pos:end_pos], pos_label,
+            sep=sep, bytes_per_line=bytes_per_line, align_front=align_front,
+            dump_type=dump_type, squeeze=squeeze
+        )
+    
+    @staticmethod
+    def hexdump_stream(source, offset=0, length=-1,
+                       sep=' ', bytes_per_line=16, pos_label=-1, align_front=True,
+                       dump_type=DUMPTYPE_HEX, squeeze=False, previous_line=None,
+                       squeezing=False, chunk_size=BytesUtility.default_chunk_size):
+        '''
+        Output the bytes of a file in pretty format, one line at a time, in the
+        same format as hexdump().
 
-        blank_text_str = ' '
-        data_dump_text = HexDump.to_text(data, offset=offset, length=length, pos=pos)
+        The file is read in chunks of chunk_size bytes, so the memory used does
+        not depend on the size of the file.
 
-        hex_array = []
-        text_str = ''
+        :param source: the file to output; either the name of the file, or a file
+            object opened in binary mode
+        :type source: str or file object
 
-        # Pad at the front to align to bytes_per_line boundary
+        :param offset: the offset of the first byte to output; see
+            BytesUtility.read_chunks();
+            (a) negative value is not allowed
+        :type offset: int, optional
+        :param length: the number of bytes to output;
+            (a) zero or negative value means output till the end of the file
+        :type length: int, optional
+
+        :param sep: the separator to used between the hexadecimal formatting
+        :type sep: bytes, optional
+        :param bytes_per_line: the maximum number of bytes to show per line of output
+        :type bytes_per_line: int, optional
+        :param pos_label: the value of the tag to label the first output byte;
+            (a) negative value means the tag will be computed from offset
+        :type pos_label: int, optional
+        :param align_front: align the front bytes to the proper position base on the
+            boundary indicated by bytes_per_line
+        :type align_front: bool, optional
+
+        :param dump_type: choices to display bytes in hexadecimal (DUMPTYPE_HEX) or
+            octal (DUMPTYPE_OCT)
+        :type dump_type: int, optional
+
+        :param squeeze: see hexdump();
+            (a) runs of identical lines are squeezed across chunks as well
+        :type squeeze: bool, optional
+        :param previous_line: see format_lines(); for continuing the squeeze
+            from the line just before offset
+        :type previous_line: bytes or None, optional
+        :param squeezing: see format_lines()
+        :type squeezing: bool, optional
+
+        :param chunk_size: the number of bytes to read from the file at a time
+        :type chunk_size: int, optional
+
+        :return: the lines of the byte stream in pretty format
+        :rtype: generator of str
+        '''
+        if pos_label < 0:
+            pos_label = offset
+
+        # - lines start at multiples of bytes_per_line when align_front is True,
+        #   otherwise at multiples of bytes_per_line counting from pos_label
+        line_origin = pos_label
         if align_front:
-            front_padding_count = pos_label % bytes_per_line
-            if front_padding_count != 0:
-                hex_array = [blank_hex_str] * front_padding_count
-                text_str = blank_text_str * front_padding_count
-                pos_label = pos_label - (pos_label % bytes_per_line)
-        
-        # Add the hexdump and text representation
-        hex_array.extend(data_dump_hex_array)
-        text_str += data_dump_text
-
-        # Pad at the back to align to bytes_per_line boundary
-        byte_count = len(hex_array)
-        last_line_byte_count = byte_count % bytes_per_line
-        if last_line_byte_count != 0:
-            back_padding_count = bytes_per_line - last_line_byte_count
-            hex_array.extend([blank_hex_str] * back_padding_count)
-            text_str += blank_text_str * back_padding_count
-            byte_count += back_padding_count
-
-        # Output the hexdump as array of text
-        hexdump_array = []
-        for i in range(0, byte_count, bytes_per_line):
-            curr_hex_array = hex_array[i:i+bytes_per_line]
-            curr_text_str = text_str[i:i+bytes_per_line]
-            curr_hex_str = HexDump.hex_array_to_string(curr_hex_array, sep=sep)
-            hexdump_array.append(
-                f'{(i+pos_label):08x}: {curr_hex_str}  |{curr_text_str}|'
+            line_origin -= pos_label % bytes_per_line
+
+        curr_pos_label = pos_label
+        pending = b''
+        has_output = False
+        for chunk in BytesUtility.read_chunks(source, chunk_size=chunk_size,
+                                              offset=offset, length=length):
+            if len(pending) > 0:
+                chunk = pending + chunk
+            # - only output the complete lines; the rest waits for the next chunk
+            end_pos_label = curr_pos_label + len(chunk)
+            complete_length = len(chunk) - (end_pos_label - line_origin) % bytes_per_line
+            if complete_length <= 0:
+                pending = chunk
+                continue
+            hexdump_array = HexDump.format_lines(
+                chunk[:complete_length], curr_pos_label,
+                sep=sep, bytes_per_line=bytes_per_line, align_front=align_front,
+                dump_type=dump_type, squeeze=squeeze, previous_line=previous_line,
+                squeezing=squeezing
             )
-
-        return hexdump_array
+            yield from hexdump_array
+            if squeeze:
+                if (curr_pos_label - line_origin) % bytes_per_line == 0 \
+                    or complete_length > bytes_per_line:
+                    # the last line output is a complete line
+                    previous_line = chunk[complete_length-bytes_per_line:complete_length]
+                if len(hexdump_array) > 0:
+                    squeezing = hexdump_array[-1] == HexDump.squeeze_line
+            has_output = True
+            pending = chunk[complete_length:]
+            curr_pos_label += complete_length
+
+        if len(pending) > 0 or not has_output:
+            # the incomplete last line, or an empty byte stream
+            yield from HexDump.format_lines(
+                pending, curr_pos_label,
+                sep=sep, bytes_per_line=bytes_per_line, align_front=align_front,
+                dump_type=dump_type
+            )
+        return
     
     @staticmethod
     def hexdump_start_and_end(data, byte_count_start=48, byte_count_end=48,
@@ -137,8 +427,10 @@ class HexDump:
         Output the start and end bytes of a byte stream in pretty format, formatting
         as hexadecimal and text with position as tag.
 
-        :param data: the byte stream to output
-        :type data: bytes
+        :param data: the byte stream to output;
+            (a) with a mmap of a file (see BytesUtility.map_file()), only the
+            start and end of the file are read
+        :type data: bytes, or bytes-like object such as mmap or memoryview
 
         :param byte_count_start: the maximum number of bytes to output at the start
         :type byte_count_start: int, optional
@@ -217,6 +509,61 @@ class HexDump:
 
         return hexdump_array
     
+    @staticmethod
+    def hexdump_start_and_end_stream(source, byte_count_start=48, byte_count_end=48,
+                                     chunk_size=BytesUtility.default_chunk_size):
+        '''
+        Output the start and end bytes of a file in pretty format, in the same
+        format as hexdump_start_and_end(), for a file that cannot be mapped into
+        memory, e.g. a pipe.
+
+        The file is read in chunks to its end, but only the start bytes and the
+        chunks that hold the end bytes are kept, so the memory used does not
+        depend on the size of the file.
+
+        :param source: the file to output; either the name of the file, or a file
+            object opened in binary mode
+        :type source: str or file object
+        :param byte_count_start: see hexdump_start_and_end()
+        :type byte_count_start: int, optional
+        :param byte_count_end: see hexdump_start_and_end()
+        :type byte_count_end: int, optional
+        :param chunk_size: the number of bytes to read from the file at a time
+        :type chunk_size: int, optional
+
+        :return: An array contains the indicated portion of the file in pretty format
+        :rtype: list of str
+        '''
+        byte_count_start = max(byte_count_start, 0)
+        byte_count_end = max(byte_count_end, 0)
+        start_bytes = b''
+        end_chunks = collections.deque()
+        end_chunks_length = 0
+        data_length = 0
+        for chunk in BytesUtility.read_chunks(source, chunk_size=chunk_size):
+            data_length += len(chunk)
+            if len(start_bytes) < byte_count_start:
+                start_bytes += chunk[:byte_count_start-len(start_bytes)]
+            end_chunks.append(chunk)
+            end_chunks_length += len(chunk)
+            # - drop the chunks that are no longer needed for the end bytes
+            while len(end_chunks) > 0 and end_chunks_length - len(end_chunks[0]) >= byte_count_end:
+                end_chunks_length -= len(end_chunks.popleft())
+        end_bytes = b''.join(end_chunks)
+        end_bytes = end_bytes[len(end_bytes)-min(byte_count_end, len(end_bytes)):]
+
+        if data_length <= byte_count_start + byte_count_end:
+            # - the end bytes hold all the bytes after the start bytes
+            data = start_bytes + end_bytes[len(end_bytes)-(data_length-len(start_bytes)):]
+            return HexDump.hexdump(data)
+        hexdump_array = []
+        if byte_count_start > 0:
+            hexdump_array.extend(HexDump.hexdump(start_bytes))
+        hexdump_array.append(HexDump.default_filler_line)
+        if byte_count_end > 0:
+            hexdump_array.extend(HexDump.hexdump(end_bytes, pos_label=data_length-byte_count_end))
+        return hexdump_array
+
     @staticmethod
     def brief_hexdump(hexdump_array, start_line=0, end_line=0, filler_line=''):
         '''
@@ -265,7 +612,7 @@ class HexDump:
         Print the hexdump output from the hexdump functions.
 
         :param hexdump_array: the output from the hexdump functions
-        :type hexdump_array: list of str
+        :type hexdump_array: list of str, or generator of str
         :param prefix: the string to print before every line of hexdump_array
         :type prefix: str, optional
         :param fout: the file id of the output (default is sys.stdout)
@@ -273,8 +620,54 @@ class HexDump:
 
         :return: no value is returned by this function
         '''
-        for str in hexdump_array:
-            print(f'{prefix}{str}', file=fout)
+        HexDump.write_hexdump(hexdump_array, prefix=prefix, fout=fout)
+        return
+    
+    @staticmethod
+    def write_hexdump(hexdump_array, prefix='', fout=sys.stdout, binary=False,
+                      lines_per_write=lines_per_write):
+        '''
+        Write the hexdump output from the hexdump functions to a file, each line
+        followed by a newline.
+
+        The lines are joined and written in batches of lines_per_write lines,
+        instead of one print() for each line.
+
+        :param hexdump_array: the output from the hexdump functions, or lines that
+            are already bytes (for binary only)
+        :type hexdump_array: list of str or bytes, or generator of str or bytes
+        :param prefix: the string to write before every line of hexdump_array
+        :type prefix: str, optional
+        :param fout: the file id of the output (default is sys.stdout)
+        :type fout: file id
+
+        :param binary: when True, fout is a file opened in binary mode (e.g.
+            sys.stdout.buffer), bypassing the text layer of the file;
+            (a) lines of str, as output by the hexdump functions, are still
+            encoded as UTF-8, but once per batch of lines instead of once per line;
+            (b) lines of bytes are joined and written without any encoding
+        :type binary: bool, optional
+        :param lines_per_write: the number of lines in each call of fout.write()
+        :type lines_per_write: int, optional
+
+        :return: no value is returned by this function
+        '''
+        line_sep = '\n' + prefix
+        line_sep_bytes = line_sep.encode()
+        prefix_bytes = prefix.encode()
+        hexdump_iter = iter(hexdump_array)
+        while True:
+            batch = list(itertools.islice(hexdump_iter, lines_per_write))
+            if len(batch) <= 0:
+                break
+            if binary and isinstance(batch[0], bytes):
+                fout.write(prefix_bytes + line_sep_bytes.join(batch) + b'\n')
+                continue
+            batch_str = prefix + line_sep.join(batch) + '\n'
+            if binary:
+                fout.write(batch_str.encode())
+            else:
+                fout.write(batch_str)
         return
     
     @staticmethod
@@ -339,12 +732,678 @@ class HexDump:
                     filler_line=filler_line, dump_type=dump_type
                 )
             if curr_label != '':
-                print(f'{curr_label}', file=fout)
-            HexDump.print_hexdump(hexdump_array, prefix=prefix, fout=fout)
-            print(f'{sep_line}', file=fout)
+                fout.write(f'{curr_label}\n')
+            HexDump.write_hexdump(hexdump_array, prefix=prefix, fout=fout)
+            fout.write(f'{sep_line}\n')
             count += 1
         return
     
+    # --- Comparison of Byte Streams
+
+    @staticmethod
+    def hexdump_diff(data1, data2, sep=' ', bytes_per_line=16, dump_type=DUMPTYPE_HEX,
+                     chunk_size=BytesUtility.default_chunk_size):
+        '''
+        Compare two byte streams, and output the lines that are different in pretty
+        format, as in hexdump().
+
+        For each line that is different, the line of data1 is output with the
+        prefix '- ', the line of data2 with the prefix '+ ', and then a line marking
+        the bytes that are different with '^'. A line that only one of the byte
+        streams has is output with its prefix only.
+
+        The byte streams are compared chunk by chunk, and the identical chunks
+        are skipped with a single comparison.
+
+        :param data1: the first byte stream
+        :type data1: bytes, or bytes-like object such as mmap
+        :param data2: the second byte stream
+        :type data2: bytes, or bytes-like object such as mmap
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :param chunk_size: the number of bytes to compare at a time
+        :type chunk_size: int, optional
+
+        :return: An array contains the different lines in pretty format
+        :rtype: list of str
+        '''
+        chunk_size = max(chunk_size - chunk_size % bytes_per_line, bytes_per_line)
+        hexdump_array = []
+        for pos in range(0, max(len(data1), len(data2)), chunk_size):
+            hexdump_array.extend(HexDump.diff_blocks(
+                data1[pos:pos+chunk_size], data2[pos:pos+chunk_size], pos,
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            ))
+        return hexdump_array
+
+    @staticmethod
+    def hexdump_diff_stream(source1, source2, sep=' ', bytes_per_line=16,
+                            dump_type=DUMPTYPE_HEX,
+                            chunk_size=BytesUtility.default_chunk_size):
+        '''
+        Compare two files, and output the lines that are different in pretty
+        format, one line at a time, as in hexdump_diff().
+
+        The files are read in chunks of chunk_size bytes, so the memory used does
+        not depend on the size of the files.
+
+        :param source1: the first file; either the name of the file, or a file
+            object opened in binary mode
+        :type source1: str or file object
+        :param source2: the second file
+        :type source2: str or file object
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :param chunk_size: the number of bytes to read from the files at a time
+        :type chunk_size: int, optional
+
+        :return: the different lines in pretty format
+        :rtype: generator of str
+        '''
+        chunk_size = max(chunk_size - chunk_size % bytes_per_line, bytes_per_line)
+        chunk_pair_list = itertools.zip_longest(
+            BytesUtility.read_chunks(source1, chunk_size=chunk_size),
+            BytesUtility.read_chunks(source2, chunk_size=chunk_size),
+            fillvalue=b''
+        )
+        pos = 0
+        for chunk1, chunk2 in chunk_pair_list:
+            yield from HexDump.diff_blocks(
+                chunk1, chunk2, pos,
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            )
+            pos += chunk_size
+        return
+
+    @staticmethod
+    def diff_blocks(block1, block2, pos_label, sep=' ', bytes_per_line=16,
+                    dump_type=DUMPTYPE_HEX):
+        '''
+        (Internal) Compare two blocks of bytes, and format the lines that are
+        different, as in hexdump_diff().
+
+        :meta private:
+        :param block1: the first block of bytes
+        :type block1: bytes
+        :param block2: the second block of bytes
+        :type block2: bytes
+        :param pos_label: the tag of the first byte of the blocks; a multiple of
+            bytes_per_line
+        :type pos_label: int
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :return: the different lines in pretty format
+        :rtype: list of str
+        '''
+        if block1 == block2:
+            return []
+        hexdump_array = []
+        for line_pos in HexDump.find_different_lines(
+            block1, block2, 0, max(len(block1), len(block2)), bytes_per_line
+        ):
+            line1 = block1[line_pos:line_pos+bytes_per_line]
+            line2 = block2[line_pos:line_pos+bytes_per_line]
+            label_length = 0
+            for line_prefix, line in [ ('- ', line1), ('+ ', line2) ]:
+                if len(line) <= 0:
+                    continue
+                hexdump_line = HexDump.format_lines(
+                    line, pos_label + line_pos,
+                    sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+                )[0]
+                label_length = hexdump_line.index(':')
+                hexdump_array.append(line_prefix + hexdump_line)
+            # - mark the bytes that are different in both the hexadecimal and
+            #   the text representation
+            common_length = min(len(line1), len(line2))
+            line_length = max(len(line1), len(line2))
+            is_different_list = [
+                k < line_length and (k >= common_length or line1[k] != line2[k])
+                for k in range(bytes_per_line)
+            ]
+            hexdump_array.append(HexDump.format_marker_line(
+                is_different_list, label_length + 2, sep=sep, dump_type=dump_type
+            ))
+        return hexdump_array
+
+    @staticmethod
+    def find_different_lines(block1, block2, start_pos, end_pos, bytes_per_line):
+        '''
+        (Internal) Find the lines that are different in two blocks of bytes.
+
+        The range is split into halves recursively, so that the identical parts
+        are skipped with a few comparisons of slices.
+
+        :meta private:
+        :param block1: the first block of bytes
+        :type block1: bytes
+        :param block2: the second block of bytes
+        :type block2: bytes
+        :param start_pos: the start of the range to compare; a multiple of
+            bytes_per_line
+        :type start_pos: int
+        :param end_pos: the end of the range to compare
+        :type end_pos: int
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int
+
+        :return: the positions of the lines that are different
+        :rtype: generator of int
+        '''
+        if block1[start_pos:end_pos] == block2[start_pos:end_pos]:
+            return
+        line_count = (end_pos - start_pos + bytes_per_line - 1) // bytes_per_line
+        if line_count <= 1:
+            yield start_pos
+            return
+        mid_pos = start_pos + (line_count // 2) * bytes_per_line
+        yield from HexDump.find_different_lines(
+            block1, block2, start_pos, mid_pos, bytes_per_line
+        )
+        yield from HexDump.find_different_lines(
+            block1, block2, mid_pos, end_pos, bytes_per_line
+        )
+        return
+
+    # --- Search of Byte Patterns
+
+    @staticmethod
+    def find_pattern(data, pattern, start_pos=0, end_pos=-1):
+        '''
+        Find all the occurrences of a byte pattern in a byte stream.
+
+        The search is done by data.find(), so no byte is examined in Python code.
+        Occurrences may overlap; for example, b'aa' is found at 0, 1 and 2 in b'aaaa'.
+
+        :param data: the byte stream to search
+        :type data: bytes, or bytes-like object such as mmap or memoryview
+        :param pattern: the byte pattern to find; a str is taken as a hex string,
+            for example 'DEADBEEF' or 'DE AD BE EF'
+        :type pattern: bytes or str
+        :param start_pos: the position to start searching
+        :type start_pos: int, optional
+        :param end_pos: the position to end searching; a match must end at or before
+            it; (a) negative value means the end of the byte stream
+        :type end_pos: int, optional
+
+        :raise: ValueError if the pattern is empty, or is not a valid hex string
+
+        :return: the positions of the occurrences
+        :rtype: generator of int
+        '''
+        if isinstance(pattern, str):
+            pattern = BytesUtility.hex_string_to_bytes(pattern)
+        if len(pattern) <= 0:
+            raise ValueError('the pattern to find cannot be empty')
+        if not hasattr(data, 'find'):
+            # - memoryview has no find(), so search a copy of it
+            data = bytes(data)
+        if end_pos < 0:
+            end_pos = len(data)
+        pos = data.find(pattern, start_pos, end_pos)
+        while pos >= 0:
+            yield pos
+            pos = data.find(pattern, pos + 1, end_pos)
+        return
+
+    @staticmethod
+    def hexdump_search(data, pattern, context=16, sep=' ', bytes_per_line=16,
+                       dump_type=DUMPTYPE_HEX, separator_line='--'):
+        '''
+        Find all the occurrences of a byte pattern in a byte stream, and output the
+        bytes around them in pretty format, as in hexdump().
+
+        The lines that contain a match are each followed by a line marking the
+        matched bytes with '^', so a match that spans two lines is shown in full.
+        The lines are labelled with their positions in the byte stream, and the
+        lines of matches that are close to each other are merged; groups of lines
+        that are apart are separated by separator_line, like the output of grep.
+
+        :param data: the byte stream to search
+        :type data: bytes, or bytes-like object such as mmap or memoryview
+        :param pattern: see find_pattern()
+        :type pattern: bytes or str
+        :param context: the number of bytes to output before and after each match;
+            (a) the output is extended to complete lines
+        :type context: int, optional
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+        :param separator_line: the line between two groups of lines
+        :type separator_line: str, optional
+
+        :raise: ValueError, see find_pattern()
+
+        :return: the lines around the matches in pretty format
+        :rtype: generator of str
+        '''
+        if isinstance(pattern, str):
+            pattern = BytesUtility.hex_string_to_bytes(pattern)
+        context = max(context, 0)
+        data_length = len(data)
+        region_start = region_end = -1
+        match_list = []
+        is_first_region = True
+        for match_pos in HexDump.find_pattern(data, pattern):
+            start_pos = max(match_pos - context, 0)
+            start_pos -= start_pos % bytes_per_line
+            end_pos = min(match_pos + len(pattern) + context, data_length)
+            if region_end < start_pos:
+                if len(match_list) > 0:
+                    if not is_first_region:
+                        yield separator_line
+                    yield from HexDump.format_matches(
+                        data, region_start, region_end, match_list, len(pattern),
+                        sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+                    )
+                    is_first_region = False
+                region_start = start_pos
+                match_list = []
+            region_end = max(region_end, end_pos)
+            match_list.append(match_pos)
+        if len(match_list) > 0:
+            if not is_first_region:
+                yield separator_line
+            yield from HexDump.format_matches(
+                data, region_start, region_end, match_list, len(pattern),
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            )
+        return
+
+    @staticmethod
+    def format_matches(data, start_pos, end_pos, match_list, match_length, sep=' ',
+                       bytes_per_line=16, dump_type=DUMPTYPE_HEX):
+        '''
+        (Internal) Format the bytes in a range of a byte stream, marking the
+        matches in the range, as in hexdump_search().
+
+        :meta private:
+        :param data: the byte stream
+        :type data: bytes, or bytes-like object such as mmap or memoryview
+        :param start_pos: the start of the range; a multiple of bytes_per_line
+        :type start_pos: int
+        :param end_pos: the end of the range
+        :type end_pos: int
+        :param match_list: the positions of the matches in the range
+        :type match_list: list of int
+        :param match_length: the number of bytes of each match
+        :type match_length: int
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :return: the lines in pretty format
+        :rtype: list of str
+        '''
+        end_pos += -end_pos % bytes_per_line
+        is_matched = bytearray(end_pos - start_pos)
+        end_pos = min(end_pos, len(data))
+        for match_pos in match_list:
+            match_start = match_pos - start_pos
+            is_matched[match_start:match_start+match_length] = b'\x01' * match_length
+        hexdump_array = []
+        line_list = HexDump.format_lines(
+            data[start_pos:end_pos], start_pos,
+            sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+        )
+        for line_pos, line in zip(range(0, end_pos - start_pos, bytes_per_line), line_list):
+            hexdump_array.append(line)
+            is_matched_list = is_matched[line_pos:line_pos+bytes_per_line]
+            if any(is_matched_list):
+                hexdump_array.append(HexDump.format_marker_line(
+                    is_matched_list, line.index(':'), sep=sep, dump_type=dump_type
+                ))
+        return hexdump_array
+
+    @staticmethod
+    def format_marker_line(is_marked_list, label_length, sep=' ', dump_type=DUMPTYPE_HEX):
+        '''
+        (Internal) Format a line that marks some bytes of the line of hexdump
+        above it with '^', in both the hexadecimal and the text representation.
+
+        :meta private:
+        :param is_marked_list: whether each byte of the line is marked
+        :type is_marked_list: list of bool
+        :param label_length: the number of characters before the ':' that ends
+            the label of the line above
+        :type label_length: int
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :return: the marker line, without trailing spaces
+        :rtype: str
+        '''
+        cell_width = 3 if dump_type == HexDump.DUMPTYPE_OCT else 2
+        cell_marker = '^' * cell_width
+        cell_blank = ' ' * cell_width
+        hex_marker = (' ' * len(sep)).join([
+            cell_marker if is_marked else cell_blank for is_marked in is_marked_list
+        ])
+        text_marker = ''.join([ '^' if is_marked else ' ' for is_marked in is_marked_list ])
+        marker_line = ' ' * (label_length + 2) + hex_marker + '   ' + text_marker
+        return marker_line.rstrip()
+
+    # --- Formatting of Lines
+
+    @staticmethod
+    def format_lines(block, pos_label, sep=' ', bytes_per_line=16, align_front=True,
+                     dump_type=DUMPTYPE_HEX, squeeze=False, previous_line=None,
+                     squeezing=False):
+        '''
+        Format a block of bytes as lines of hexdump.
+
+        This is the formatter used by hexdump(). The lines are rendered with the
+        lookup tables (hex_table, oct_table and text_table), bytes.hex() and
+        bytes.translate(), instead of formatting the bytes one by one.
+
+        :param block: the bytes to format
+        :type block: bytes, or bytes-like object such as memoryview
+        :param pos_label: the value of the tag to label the first byte of block
+        :type pos_label: int
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param align_front: see hexdump()
+        :type align_front: bool, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :param squeeze: see hexdump()
+        :type squeeze: bool, optional
+        :param previous_line: the bytes of the complete line just before block,
+            if block continues from an earlier block
+        :type previous_line: bytes or None, optional
+        :param squeezing: True if previous_line is already part of a squeezed run
+            of lines, i.e. squeeze_line has been output after it or in its place
+        :type squeezing: bool, optional
+
+        :return: An array contains the block in pretty format
+        :rtype: list of str
+        '''
+        if not isinstance(block, (bytes, bytearray)):
+            block = bytes(block)
+        block_length = len(block)
+        text_str = block.translate(HexDump.text_table).decode('ascii')
+
+        front_padding_count = pos_label % bytes_per_line if align_front else 0
+        line_pos_label = pos_label - front_padding_count
+
+        hexdump_array = []
+        curr_pos = 0
+
+        # The first line, if it is padded at the front
+        if front_padding_count != 0:
+            curr_pos = min(bytes_per_line - front_padding_count, block_length)
+            hexdump_array.append(HexDump.format_padded_line(
+                block[:curr_pos], text_str[:curr_pos], line_pos_label, front_padding_count,
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            ))
+            previous_line = None
+
+        # The complete lines in the middle
+        line_count = (block_length - curr_pos) // bytes_per_line
+        end_pos = curr_pos + line_count * bytes_per_line
+        if not squeeze:
+            hexdump_array.extend(HexDump.format_complete_lines(
+                block, text_str, curr_pos, end_pos, pos_label + curr_pos,
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            ))
+            curr_pos = end_pos
+        else:
+            # - format only the lines that are different from the line before,
+            #   and output squeeze_line once in place of each run of identical lines
+            start_pos = curr_pos
+            while curr_pos < end_pos:
+                curr_line = block[curr_pos:curr_pos+bytes_per_line]
+                if curr_line != previous_line:
+                    previous_line = curr_line
+                    squeezing = False
+                    curr_pos += bytes_per_line
+                    continue
+                hexdump_array.extend(HexDump.format_complete_lines(
+                    block, text_str, start_pos, curr_pos, pos_label + start_pos,
+                    sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+                ))
+                if not squeezing:
+                    hexdump_array.append(HexDump.squeeze_line)
+                    squeezing = True
+                curr_pos = HexDump.skip_repeated_lines(block, curr_pos, end_pos, curr_line)
+                start_pos = curr_pos
+            hexdump_array.extend(HexDump.format_complete_lines(
+                block, text_str, start_pos, curr_pos, pos_label + start_pos,
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            ))
+
+        # The last line, if it is incomplete
+        if curr_pos < block_length:
+            hexdump_array.append(HexDump.format_padded_line(
+                block[curr_pos:], text_str[curr_pos:], pos_label + curr_pos, 0,
+                sep=sep, bytes_per_line=bytes_per_line, dump_type=dump_type
+            ))
+
+        return hexdump_array
+
+    @staticmethod
+    def format_complete_lines(block, text_str, start_pos, end_pos, pos_label,
+                              sep=' ', bytes_per_line=16, dump_type=DUMPTYPE_HEX):
+        '''
+        (Internal) Format the complete lines in block[start_pos:end_pos].
+
+        :meta private:
+        :param block: the bytes to format
+        :type block: bytes
+        :param text_str: the text representation of the whole block
+        :type text_str: str
+        :param start_pos: the position of the first byte to format in block
+        :type start_pos: int
+        :param end_pos: the position after the last byte to format in block;
+            (a) (end_pos - start_pos) must be a multiple of bytes_per_line
+        :type end_pos: int
+        :param pos_label: the tag of the first line
+        :type pos_label: int
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :return: the lines in pretty format
+        :rtype: list of str
+        '''
+        line_count = (end_pos - start_pos) // bytes_per_line
+        if line_count <= 0:
+            return []
+        hex_str, cell_width = HexDump.format_cells(
+            block[start_pos:end_pos], sep=sep, dump_type=dump_type
+        )
+        line_width = cell_width * bytes_per_line
+        hex_line_width = line_width - len(sep)
+        label_list = HexDump.format_labels(pos_label, line_count, bytes_per_line)
+        return [
+            f'{label}: {hex_str[k:k+hex_line_width]}  |{text_str[j:j+bytes_per_line]}|'
+            for label, j, k in zip(
+                label_list,
+                range(start_pos, end_pos, bytes_per_line),
+                range(0, line_width * line_count, line_width)
+            )
+        ]
+
+    @staticmethod
+    def skip_repeated_lines(block, start_pos, end_pos, line):
+        '''
+        (Internal) Find the end of a run of lines that are identical to line.
+
+        The run is compared in blocks of doubling size, so that a long run is
+        skipped with a few comparisons of slices.
+
+        :meta private:
+        :param block: the bytes containing the lines
+        :type block: bytes
+        :param start_pos: the position of the first line of the run in block
+        :type start_pos: int
+        :param end_pos: the position after the last complete line in block
+        :type end_pos: int
+        :param line: the bytes of the repeated line
+        :type line: bytes
+
+        :return: the position of the first line after the run
+        :rtype: int
+        '''
+        line_length = len(line)
+        curr_pos = start_pos
+        run_line_count = 1
+        while curr_pos < end_pos:
+            run_line_count = min(run_line_count, (end_pos - curr_pos) // line_length)
+            run_length = run_line_count * line_length
+            if block[curr_pos:curr_pos+run_length] == line * run_line_count:
+                curr_pos += run_length
+                run_line_count *= 2
+            elif run_line_count > 1:
+                # - the run ends in this block, so search again with a smaller block
+                run_line_count //= 2
+            else:
+                break
+        return curr_pos
+
+    @staticmethod
+    def format_cells(block, sep=' ', dump_type=DUMPTYPE_HEX):
+        '''
+        (Internal) Format every byte in the block and join them with sep.
+
+        :meta private:
+        :param block: the bytes to format
+        :type block: bytes
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :return: (cells_str, cell_width), where cells_str is the formatted bytes
+            joined with sep, and cell_width is the width taken by one byte
+            together with the following sep
+        :rtype: tuple of (str, int)
+        '''
+        if dump_type == HexDump.DUMPTYPE_OCT:
+            # - write each of the three digits of every byte into its place
+            #   in between the separators
+            sep_bytes = sep.encode()
+            cell_size = 3 + len(sep_bytes)
+            cells = bytearray((b'000' + sep_bytes) * len(block))
+            for k, digit_table in enumerate(HexDump.oct_digit_tables):
+                cells[k::cell_size] = block.translate(digit_table)
+            cells_str = cells[:len(cells)-len(sep_bytes)].decode()
+            return cells_str, 3 + len(sep)
+        if len(sep) == 0:
+            cells_str = block.hex().upper()
+        else:
+            # - the hexadecimal digits never contain space, so any separator
+            #   can replace it after upper()
+            cells_str = block.hex(' ').upper()
+            if sep != ' ':
+                cells_str = cells_str.replace(' ', sep)
+        return cells_str, 2 + len(sep)
+
+    @staticmethod
+    def format_labels(first_pos_label, line_count, bytes_per_line):
+        '''
+        (Internal) Format the tags of consecutive lines, i.e. f'{pos_label:08x}'.
+
+        :meta private:
+        :param first_pos_label: the tag of the first line
+        :type first_pos_label: int
+        :param line_count: the number of lines
+        :type line_count: int
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int
+
+        :return: the formatted tags
+        :rtype: list of str
+        '''
+        last_pos_label = first_pos_label + (line_count - 1) * bytes_per_line
+        label_range = range(first_pos_label, last_pos_label + 1, bytes_per_line)
+        label_array = array.array('I')
+        if first_pos_label < 0 or last_pos_label >= 2**32 or label_array.itemsize != 4:
+            return [f'{pos_label:08x}' for pos_label in label_range]
+        # - the big endian bytes of a 32-bit tag in hexadecimal is the same as
+        #   f'{pos_label:08x}', so all the tags can be formatted with one bytes.hex()
+        label_array.extend(label_range)
+        if sys.byteorder == 'little':
+            label_array.byteswap()
+        return label_array.tobytes().hex(' ', 4).split(' ')
+
+    @staticmethod
+    def format_padded_line(line, line_text, line_pos_label, front_padding_count,
+                           sep=' ', bytes_per_line=16, dump_type=DUMPTYPE_HEX):
+        '''
+        (Internal) Format one line that is padded at the front and/or the back.
+
+        :meta private:
+        :param line: the bytes in the line
+        :type line: bytes
+        :param line_text: the text representation of line
+        :type line_text: str
+        :param line_pos_label: the tag of the line
+        :type line_pos_label: int
+        :param front_padding_count: the number of blank bytes in front of line
+        :type front_padding_count: int
+
+        :param sep: see hexdump()
+        :type sep: str, optional
+        :param bytes_per_line: see hexdump()
+        :type bytes_per_line: int, optional
+        :param dump_type: see hexdump()
+        :type dump_type: int, optional
+
+        :return: the line in pretty format
+        :rtype: str
+        '''
+        if dump_type == HexDump.DUMPTYPE_OCT:
+            blank_hex_str = '   '
+            cell_table = HexDump.oct_table
+        else:
+            blank_hex_str = '  '
+            cell_table = HexDump.hex_table
+        back_padding_count = bytes_per_line - front_padding_count - len(line)
+        hex_array = [blank_hex_str] * front_padding_count
+        hex_array.extend(map(cell_table.__getitem__, line))
+        hex_array.extend([blank_hex_str] * back_padding_count)
+        hex_str = HexDump.hex_array_to_string(hex_array, sep=sep)
+        text_str = ' ' * front_padding_count + line_text + ' ' * back_padding_count
+        return f'{line_pos_label:08x}: {hex_str}  |{text_str}|'
+
     # --- Conversions to Hexadecimal
 
     @staticmethod
@@ -391,7 +1450,7 @@ class HexDump:
         :rtype: list of str
         '''
         start_pos, end_pos = HexDump.pos_from_offset(len(data), offset=offset, length=length, pos=pos)
-        hex_array = [f'{c:02X}' for c in data[start_pos:end_pos]]
+        hex_array = list(map(HexDump.hex_table.__getitem__, data[start_pos:end_pos]))
         return hex_array
     
     # --- Conversions to Octal
@@ -440,7 +1499,7 @@ class HexDump:
         :rtype: list of str
         '''
         start_pos, end_pos = HexDump.pos_from_offset(len(data), offset=offset, length=length, pos=pos)
-        oct_array = [f'{c:03o}' for c in data[start_pos:end_pos]]
+        oct_array = list(map(HexDump.oct_table.__getitem__, data[start_pos:end_pos]))
         return oct_array
     
     # --- Conversions to Text
@@ -464,8 +1523,8 @@ class HexDump:
         :rtype: str
         '''
         start_pos, end_pos = HexDump.pos_from_offset(len(data), offset=offset, length=length, pos=pos)
-        text_array = [HexDump.char_to_text(c) for c in data[start_pos:end_pos]]
-        return ''.join(text_array)
+        text_bytes = bytes(data[start_pos:end_pos])
+        return text_bytes.translate(HexDump.text_table).decode('ascii')
     
     # --- Internal Functions
     
@@ -510,20 +1569,21 @@ class HexDump:
         if sep_length <= 0 or HexDump.is_space(sep):
             # - special cases when separator is empty ('') or all spaces (' ')
             return sep.join(hex_array)
-        result = ''
         if len(hex_array) <= 0:
-            return result
+            return ''
+        blank_sep = ' ' * sep_length
+        result = []
         for i in range(len(hex_array) - 1):
-            result += hex_array[i]
+            result.append(hex_array[i])
             # - insert separator only between two hex strings that are
             #   not empty (i.e. space)
             # - otherwise insert the equivalent amount of space instead
             if HexDump.is_space(hex_array[i]) or HexDump.is_space(hex_array[i+1]):
-                result += ' ' * sep_length
+                result.append(blank_sep)
             else:
-                result += sep
-        result += hex_array[-1]
-        return result
+                result.append(sep)
+        result.append(hex_array[-1])
+        return ''.join(result)
 
     @staticmethod
     def is_space(string):
@@ -599,6 +1659,306 @@ class HexDump:
                 end_pos = start_pos + length
         return start_pos, end_pos
     
+    # --- Hexdump of Files
+
+    parallel_part_size = 1024 * 1024
+    '''
+    The number of bytes of a file to format in one task in print_files().
+    '''
+
+    @staticmethod
+    def print_files(filename_list, offset=0, length=-1, squeeze=False, jobs=1,
+                    part_size=parallel_part_size, fout=sys.stdout, binary=False):
+        '''
+        Print the hexdump of a list of files, each after a line with its name.
+
+        :param filename_list: the names of the files
+        :type filename_list: list of str
+
+        :param offset: the offset of the first byte to output in each file;
+            (a) the file is read from offset onwards, not from its start
+        :type offset: int, optional
+        :param length: the number of bytes to output from each file;
+            (a) zero or negative value means output till the end of the file
+        :type length: int, optional
+        :param squeeze: see hexdump()
+        :type squeeze: bool, optional
+
+        :param jobs: the number of processes to format the files;
+            (a) when more than 1, the files are split into parts of part_size bytes,
+            which are formatted in a process pool and printed in order;
+            (b) a file that is not a regular file, e.g. a pipe, has no known size
+            and may not be read twice, so it is always formatted in this process
+        :type jobs: int, optional
+        :param part_size: the number of bytes of a file to format in one task;
+            (a) it is rounded down to a multiple of 16 bytes, i.e. the bytes in
+            a line of hexdump
+        :type part_size: int, optional
+
+        :param fout: the file id of the output (default is sys.stdout)
+        :type fout: file id
+        :param binary: see write_hexdump()
+        :type binary: bool, optional
+
+        :return: no value is returned by this function
+        '''
+        if jobs <= 1:
+            for file in filename_list:
+                HexDump.print_file(
+                    file, offset=offset, length=length, squeeze=squeeze, fout=fout, binary=binary
+                )
+            return
+
+        bytes_per_line = 16
+        part_size = max(part_size - part_size % bytes_per_line, bytes_per_line)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # - the regular files in a run are formatted in the process pool,
+            #   and the other files are formatted here in between the runs
+            for is_regular, file_run in itertools.groupby(filename_list, HexDump.is_regular_file):
+                if not is_regular:
+                    for file in file_run:
+                        HexDump.print_file(
+                            file, offset=offset, length=length, squeeze=squeeze,
+                            fout=fout, binary=binary
+                        )
+                    continue
+                part_list = HexDump.iterate_file_parts(
+                    list(file_run), part_size, offset=offset, length=length
+                )
+                result_list = ExecutorUtility.map_in_order(
+                    executor, HexDump.hexdump_file_part,
+                    (
+                        (
+                            (file, part_offset == offset, is_last),
+                            (file, part_offset, part_length, squeeze, offset)
+                        )
+                        for file, part_offset, part_length, is_last in part_list
+                    ),
+                    max_pending=jobs * 2
+                )
+                for (file, is_first, is_last), hexdump_str in result_list:
+                    output_array = []
+                    if is_first:
+                        output_array.append(f'=== file: {file}')
+                    if hexdump_str != '':
+                        output_array.append(hexdump_str)
+                    if is_last:
+                        output_array.append('')
+                    HexDump.write_hexdump(output_array, fout=fout, binary=binary)
+        return
+
+    @staticmethod
+    def print_file(filename, offset=0, length=-1, squeeze=False, fout=sys.stdout, binary=False):
+        '''
+        Print the hexdump of a file after a line with its name, reading the file
+        in chunks as in hexdump_stream().
+
+        :param filename: the name of the file
+        :type filename: str
+        :param offset: see print_files()
+        :type offset: int, optional
+        :param length: see print_files()
+        :type length: int, optional
+        :param squeeze: see hexdump()
+        :type squeeze: bool, optional
+
+        :param fout: the file id of the output (default is sys.stdout)
+        :type fout: file id
+        :param binary: see write_hexdump()
+        :type binary: bool, optional
+
+        :return: no value is returned by this function
+        '''
+        HexDump.write_hexdump([ f'=== file: {filename}' ], fout=fout, binary=binary)
+        HexDump.write_hexdump(
+            HexDump.hexdump_stream(filename, offset=offset, length=length, squeeze=squeeze),
+            fout=fout, binary=binary
+        )
+        HexDump.write_hexdump([ '' ], fout=fout, binary=binary)
+        return
+
+    @staticmethod
+    def print_files_start_and_end(filename_list, byte_count_start=48, byte_count_end=48,
+                                  fout=sys.stdout, binary=False):
+        '''
+        Print the start and end bytes of a list of files, each after a line
+        with its name, as in hexdump_start_and_end().
+
+        Each regular file is mapped into memory, so only the bytes that are output
+        are read from the file. Other files, e.g. pipes, are read to the end with
+        hexdump_start_and_end_stream(), keeping only the bytes that are output.
+
+        :param filename_list: the names of the files
+        :type filename_list: list of str
+        :param byte_count_start: see hexdump_start_and_end()
+        :type byte_count_start: int, optional
+        :param byte_count_end: see hexdump_start_and_end()
+        :type byte_count_end: int, optional
+
+        :param fout: the file id of the output (default is sys.stdout)
+        :type fout: file id
+        :param binary: see write_hexdump()
+        :type binary: bool, optional
+
+        :return: no value is returned by this function
+        '''
+        for file in filename_list:
+            output_array = [ f'=== file: {file}' ]
+            if not HexDump.is_regular_file(file):
+                output_array.extend(HexDump.hexdump_start_and_end_stream(
+                    file, byte_count_start=byte_count_start, byte_count_end=byte_count_end
+                ))
+            else:
+                with BytesUtility.map_file(file) as data:
+                    output_array.extend(HexDump.hexdump_start_and_end(
+                        data, byte_count_start=byte_count_start, byte_count_end=byte_count_end
+                    ))
+            output_array.append('')
+            HexDump.write_hexdump(output_array, fout=fout, binary=binary)
+        return
+
+    @staticmethod
+    def print_files_search(filename_list, pattern, context=16, fout=sys.stdout, binary=False):
+        '''
+        Print the bytes around the occurrences of a byte pattern in a list of
+        files, each after a line with its name, as in hexdump_search().
+
+        Each file is mapped into memory, and searched without being read into
+        a bytes object.
+
+        :param filename_list: the names of the files
+        :type filename_list: list of str
+        :param pattern: see find_pattern()
+        :type pattern: bytes or str
+        :param context: see hexdump_search()
+        :type context: int, optional
+
+        :param fout: the file id of the output (default is sys.stdout)
+        :type fout: file id
+        :param binary: see write_hexdump()
+        :type binary: bool, optional
+
+        :raise: ValueError, see find_pattern()
+
+        :return: no value is returned by this function
+        '''
+        if isinstance(pattern, str):
+            pattern = BytesUtility.hex_string_to_bytes(pattern)
+        for file in filename_list:
+            HexDump.write_hexdump([ f'=== file: {file}' ], fout=fout, binary=binary)
+            with BytesUtility.map_file(file) as data:
+                HexDump.write_hexdump(
+                    HexDump.hexdump_search(data, pattern, context=context),
+                    fout=fout, binary=binary
+                )
+            HexDump.write_hexdump([ '' ], fout=fout, binary=binary)
+        return
+
+    @staticmethod
+    def hexdump_file_part(filename, offset, length, squeeze=False, start_offset=0):
+        '''
+        (Internal) Format a part of a file, as a task in print_files().
+
+        When squeeze is True, the two lines before offset are read to continue
+        the squeeze from the previous part.
+
+        :meta private:
+        :param filename: the name of the file
+        :type filename: str
+        :param offset: the offset of the part
+        :type offset: int
+        :param length: the length of the part; zero or negative value means
+            till the end of the file
+        :type length: int
+        :param squeeze: see hexdump()
+        :type squeeze: bool, optional
+        :param start_offset: the offset of the first part of the file; the bytes
+            before it are not part of the hexdump
+        :type start_offset: int, optional
+
+        :return: the lines of hexdump joined with newlines
+        :rtype: str
+        '''
+        bytes_per_line = 16
+        with open(filename, 'rb') as fd:
+            previous_line = None
+            squeezing = False
+            # - the number of bytes to skip from the current position of the file
+            skip_length = offset
+            if squeeze and offset - bytes_per_line >= start_offset:
+                before_offset = max(offset - 2 * bytes_per_line, start_offset)
+                fd.seek(before_offset)
+                lines_before = fd.read(offset - before_offset)
+                previous_line = lines_before[-bytes_per_line:]
+                # - the line before offset is already squeezed if it is
+                #   the same as the line before it
+                squeezing = lines_before[:bytes_per_line] == previous_line \
+                    and len(lines_before) == 2 * bytes_per_line
+                skip_length = 0
+            hexdump_array = list(HexDump.hexdump_stream(
+                fd, offset=skip_length, length=length, pos_label=offset, squeeze=squeeze,
+                previous_line=previous_line, squeezing=squeezing
+            ))
+        return '\n'.join(hexdump_array)
+
+    @staticmethod
+    def is_regular_file(filename):
+        '''
+        (Internal) Check if a file is a regular file, i.e. it has a known size
+        and can be read from any offset, unlike a pipe or a device.
+
+        :meta private:
+        :param filename: the name of the file
+        :type filename: str
+
+        :return: True if the file is a regular file; False if it is not, or if it
+            cannot be accessed
+        :rtype: bool
+        '''
+        try:
+            return stat.S_ISREG(os.stat(filename).st_mode)
+        except OSError:
+            return False
+
+    @staticmethod
+    def iterate_file_parts(filename_list, part_size, offset=0, length=-1):
+        '''
+        (Internal) Split the bytes to output of a list of files into parts.
+
+        Every part, except the first one, starts at a multiple of part_size.
+        The files must be regular files, see is_regular_file().
+
+        :meta private:
+        :param filename_list: the names of the files
+        :type filename_list: list of str
+        :param part_size: the number of bytes in each part
+        :type part_size: int
+        :param offset: see print_files()
+        :type offset: int, optional
+        :param length: see print_files()
+        :type length: int, optional
+
+        :return: (filename, part_offset, part_length, is_last) of each part;
+            the last part has a part_length of -1 when length is zero or negative,
+            i.e. till the end of the file
+        :rtype: generator of tuple
+        '''
+        for file in filename_list:
+            end_offset = os.path.getsize(file)
+            if length > 0:
+                end_offset = min(end_offset, offset + length)
+            part_offset = offset
+            part_end_offset = (offset // part_size + 1) * part_size
+            while part_end_offset < end_offset:
+                yield (file, part_offset, part_end_offset - part_offset, False)
+                part_offset = part_end_offset
+                part_end_offset += part_size
+            if length > 0:
+                yield (file, part_offset, max(end_offset - part_offset, 0), True)
+            else:
+                yield (file, part_offset, -1, True)
+        return
+
     # --- Main function
 
     @staticmethod
@@ -618,17 +1978,116 @@ class HexDump:
         )
         parser.add_argument('filename', nargs='+',
                             help='file to show')
+        parser.add_argument('-s', '--squeeze', action='store_true', default=False,
+                            help='show a run of identical lines as a single "*"')
+        parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help='number of processes to format the files')
+        parser.add_argument('-o', '--offset', type=HexDump.parse_integer, default=0,
+                            help='offset of the first byte to show (e.g. 4096 or 0x1000)')
+        parser.add_argument('-n', '--length', type=HexDump.parse_integer, default=-1,
+                            help='number of bytes to show')
+        parser.add_argument('--head-bytes', type=HexDump.parse_integer, default=-1,
+                            help='show only this number of bytes at the start of the file')
+        parser.add_argument('--tail-bytes', type=HexDump.parse_integer, default=-1,
+                            help='show only this number of bytes at the end of the file')
+        parser.add_argument('-d', '--diff', action='store_true', default=False,
+                            help='show only the lines that are different in two files')
+        parser.add_argument('--search', metavar='HEXSTRING',
+                            help='show only the bytes around each occurrence of the '
+                                 'byte pattern (e.g. "DEADBEEF" or "DE AD BE EF")')
+        parser.add_argument('-C', '--context', type=HexDump.parse_integer, default=None,
+                            help='number of bytes to show before and after each '
+                                 'occurrence in --search (default: 16)')
         args = parser.parse_args()
 
-        for file in args.filename:
-            print(f'=== file: {file}')
-            with open(file, 'rb') as fd:
-                data = fd.read()
-            hexdump_array = HexDump.hexdump(data)
-            HexDump.print_hexdump(hexdump_array)
-            print()
+        if args.context is not None:
+            if args.search is None:
+                parser.error('argument -C/--context: not allowed without --search')
+            if args.context < 0:
+                parser.error('argument -C/--context: cannot be negative')
+        else:
+            args.context = 16
+
+        if args.diff:
+            if len(args.filename) != 2:
+                parser.error('argument -d/--diff: requires exactly two files')
+            if args.offset != 0 or args.length > 0 or args.squeeze or args.jobs > 1 \
+                or args.head_bytes >= 0 or args.tail_bytes >= 0 or args.search is not None:
+                parser.error(
+                    'argument -d/--diff: not allowed with -o/--offset, -n/--length, '
+                    '-s/--squeeze, -j/--jobs, --head-bytes, --tail-bytes or --search'
+                )
+            file1, file2 = args.filename
+            HexDump.write_hexdump(
+                [ f'=== diff: {file1} {file2}' ], fout=sys.stdout.buffer, binary=True
+            )
+            HexDump.write_hexdump(
+                HexDump.hexdump_diff_stream(file1, file2),
+                fout=sys.stdout.buffer, binary=True
+            )
+            sys.stdout.buffer.flush()
+            return
+
+        if args.search is not None:
+            if args.offset != 0 or args.length > 0 or args.squeeze or args.jobs > 1 \
+                or args.head_bytes >= 0 or args.tail_bytes >= 0:
+                parser.error(
+                    'argument --search: not allowed with -o/--offset, -n/--length, '
+                    '-s/--squeeze, -j/--jobs, --head-bytes or --tail-bytes'
+                )
+            try:
+                pattern = BytesUtility.hex_string_to_bytes(args.search)
+            except ValueError:
+                pattern = b''
+            if len(pattern) <= 0:
+                parser.error('argument --search: expected a non-empty hex string')
+            HexDump.print_files_search(
+                args.filename, pattern, context=args.context,
+                fout=sys.stdout.buffer, binary=True
+            )
+            sys.stdout.buffer.flush()
+            return
+
+        if args.offset < 0:
+            parser.error('argument -o/--offset: cannot be negative')
+        if args.head_bytes >= 0 or args.tail_bytes >= 0:
+            if args.offset > 0 or args.length > 0 or args.squeeze or args.jobs > 1:
+                parser.error(
+                    'arguments --head-bytes/--tail-bytes: not allowed with '
+                    '-o/--offset, -n/--length, -s/--squeeze or -j/--jobs'
+                )
+            HexDump.print_files_start_and_end(
+                args.filename,
+                byte_count_start=max(args.head_bytes, 0),
+                byte_count_end=max(args.tail_bytes, 0),
+                fout=sys.stdout.buffer, binary=True
+            )
+        else:
+            HexDump.print_files(
+                args.filename, offset=args.offset, length=args.length,
+                squeeze=args.squeeze, jobs=args.jobs,
+                fout=sys.stdout.buffer, binary=True
+            )
+        sys.stdout.buffer.flush()
         return
     
+    @staticmethod
+    def parse_integer(value):
+        '''
+        (Internal) Convert a command line argument to an integer, which can be
+        in decimal, or in hexadecimal with the prefix '0x'.
+
+        :meta private:
+        :param value: the command line argument
+        :type value: str
+
+        :raise: ValueError
+
+        :return: the integer
+        :rtype: int
+        '''
+        return int(value, 0)
+    
 if __name__ == '__main__':
     HexDump.main()
 
@@ -0,0 +1,69 @@
+# file: bytes_util_benchmark.py
+
+'''
+Benchmark of BytesUtility.extract_bytes_until() against a search that
+compares the bytes at each position, on a large array of bytes with the
+marker near its end.
+
+usage: python tests/bytes_util_benchmark.py [--size <bytes>] [--step <step>]
+'''
+
+import time
+import argparse
+from common_util.bytes_util import BytesUtility
+
+def extract_bytes_until_by_loop(data, offset, marker, step=1):
+    '''
+    The search of extract_bytes_until() before it was done by data.find().
+    '''
+    marker_length = len(marker)
+    curr_pos = offset
+    end_pos = len(data)
+    while curr_pos < end_pos:
+        if data[curr_pos:curr_pos+marker_length] == marker:
+            return data[offset:curr_pos]
+        curr_pos += step
+    return data[offset:curr_pos]
+
+def run_benchmark(name, function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed_time = time.perf_counter() - start_time
+    print(f'{name:<24} {elapsed_time:10.4f} seconds, {len(result)} bytes extracted')
+    return elapsed_time, result
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='bytes_util_benchmark',
+        description='Benchmark of BytesUtility.extract_bytes_until().'
+    )
+    parser.add_argument('--size', type=int, default=100 * 1024 * 1024,
+                        help='number of bytes to search')
+    parser.add_argument('--step', type=int, default=1,
+                        help='number of bytes to advance when searching')
+    args = parser.parse_args()
+
+    marker = b'\xde\xad\xbe\xef'
+    # - partial markers everywhere, and the marker near the end
+    data = bytearray(b'\xde\xad\x00\x00' * (args.size // 4))
+    marker_pos = len(data) - 4096
+    data[marker_pos:marker_pos+len(marker)] = marker
+    data = bytes(data)
+    print(f'searching {len(data)} bytes for {marker.hex()} at {marker_pos}, step {args.step}')
+
+    find_time, find_result = run_benchmark(
+        'extract_bytes_until()', BytesUtility.extract_bytes_until,
+        data, 0, marker, step=args.step
+    )
+    loop_time, loop_result = run_benchmark(
+        'loop over positions', extract_bytes_until_by_loop,
+        data, 0, marker, step=args.step
+    )
+    assert find_result == loop_result
+    print(f'speedup: {loop_time / find_time:.1f}x')
+    return
+
+if __name__ == '__main__':
+    main()
+
+# --- end of file --- #
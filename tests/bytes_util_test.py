@@ -1,6 +1,9 @@
 # file: bytes_util_test.py
 
 import unittest
+import io
+import os
+import tempfile
 from common_util.bytes_util import BytesUtility
 
 class BytesUtilityTest(unittest.TestCase):
@@ -17,6 +20,34 @@ class BytesUtilityTest(unittest.TestCase):
         self.assertEqual(BytesUtility.xor(b, a, trancate=False), r2)
         return
     
+    def test_xor_large(self):
+        a = os.urandom(BytesUtility.xor_block_size * 2 + 100)
+        b = os.urandom(BytesUtility.xor_block_size + 7)
+        r1 = bytes([ v1 ^ v2 for v1, v2 in zip(a, b) ])
+        r2 = r1 + a[len(b):]
+        self.assertEqual(BytesUtility.xor(a, b), r1)
+        self.assertEqual(BytesUtility.xor(a, b, trancate=False), r2)
+        self.assertEqual(BytesUtility.xor(bytearray(b), memoryview(a)), r1)
+        self.assertEqual(BytesUtility.xor(memoryview(b), bytearray(a), trancate=False), r2)
+        self.assertEqual(BytesUtility.xor(b'', a, trancate=False), a)
+        return
+
+    def test_xor_into(self):
+        a = b'abcde'
+        b = b'abcdefg'
+        out = bytearray(b'#' * 10)
+        self.assertEqual(BytesUtility.xor_into(a, b, out), 5)
+        self.assertEqual(out, b'\x00\x00\x00\x00\x00#####')
+        self.assertEqual(BytesUtility.xor_into(b, a, out, trancate=False), 7)
+        self.assertEqual(out, b'\x00\x00\x00\x00\x00fg###')
+        self.assertRaises(ValueError, BytesUtility.xor_into, a, b, bytearray(6), trancate=False)
+
+        # - XOR in place
+        data = bytearray(b'\x01\x02\x03')
+        BytesUtility.xor_into(data, b'\x01\x01', data, trancate=False)
+        self.assertEqual(data, b'\x00\x03\x03')
+        return
+    
     def test_has_sufficient_bytes(self):
         test_bytes = b'\x00' * 5
         # [ <offset>, <length>, <pos>, <expected_value> ]
@@ -147,6 +178,60 @@ class BytesUtilityTest(unittest.TestCase):
         self.assertEqual(bytes_value, all_bytes)
         return
     
+    def test_bytes_rep_to_bytes_04(self):
+        data = os.urandom(100000) + bytes(range(256)) + b'\\x41\\\\x'
+        self.assertEqual(BytesUtility.bytes_rep_to_bytes(repr(data)), data)
+
+        # [ <bytes rep>, <expected result> ]
+        test_cases = [
+            [ "b'\\\\x41'", b'\\x41' ],
+            [ "b'\\\\\\x41'", b'\\A' ],
+            [ "b'\\x4A\\xfF'", b'J\xff' ],
+            [ "b'\\z\\\\z\\x41\\n'", b'***unknown(\\z)***\\zA\n' ],
+        ]
+        for rep, expected_result in test_cases:
+            self.assertEqual(BytesUtility.bytes_rep_to_bytes(rep), expected_result)
+        self.assertRaises(ValueError, BytesUtility.bytes_rep_to_bytes, "b'\\xg0'")
+        self.assertRaises(IndexError, BytesUtility.bytes_rep_to_bytes, "b'ab\\'")
+
+        ferr = io.StringIO()
+        result = BytesUtility.bytes_rep_to_bytes("b'a\\x01\\z'", verbose=True, ferr=ferr)
+        self.assertEqual(result, b'a\x01***unknown(\\z)***')
+        self.assertEqual(
+            ferr.getvalue(),
+            "a b'a'\n\\x01 b'\\x01'\n\\z b'***unknown(\\\\z)***'\n"
+        )
+        return
+
+    def test_extract_integer_column(self):
+        data = bytes(range(40)) + b'\xff' * 8
+        # [ <offset>, <length>, <stride>, <pos>, <endian>, <signed>, <count>, <expected result> ]
+        test_cases = [
+            [ 0, 1, 10, 0, 'little', False, -1, [ 0, 10, 20, 30, 255 ] ],
+            [ 2, 2, 10, 0, 'little', False, -1, [ 0x0302, 0x0d0c, 0x1716, 0x2120, 0xffff ] ],
+            [ 2, 2, 10, 0, 'big', False, -1, [ 0x0203, 0x0c0d, 0x1617, 0x2021, 0xffff ] ],
+            [ 2, 2, 10, 0, 'big', True, -1, [ 0x0203, 0x0c0d, 0x1617, 0x2021, -1 ] ],
+            [ 1, 3, 10, 5, 'little', True, 2, [ 0x080706, 0x121110 ] ],
+            [ 0, 3, 16, 0, 'big', True, -1, [ 0x000102, 0x101112, 0x202122 ] ],
+            [ 5, 3, 20, 20, 'big', True, -1, [ 0x191a1b, -1 ] ],
+            [ 0, 8, 8, 0, 'little', False, -1, [ int.from_bytes(data[k:k+8], 'little') for k in range(0, 48, 8) ] ],
+            [ 0, 5, 8, 40, 'little', True, -1, [ -1 ] ],
+            [ 0, 4, 4, 46, 'little', False, -1, [] ],
+            [ 0, 4, 4, 0, 'little', False, 0, [] ],
+        ]
+        for offset, length, stride, pos, endian, signed, count, expected_result in test_cases:
+            for test_data in [ data, memoryview(data) ]:
+                result = BytesUtility.extract_integer_column(
+                    test_data, offset, length, stride, pos=pos, endian=endian, signed=signed, count=count
+                )
+                self.assertEqual(result.tolist(), expected_result)
+        self.assertRaises(ValueError, BytesUtility.extract_integer_column, data, 0, 9, 16)
+        self.assertRaises(ValueError, BytesUtility.extract_integer_column, data, 0, 4, 0)
+        # - the field starts before data
+        self.assertRaises(ValueError, BytesUtility.extract_integer_column, data, 0, 2, 4, pos=-8)
+        self.assertRaises(ValueError, BytesUtility.extract_integer_column, data, -1, 2, 4)
+        return
+
     def test_extract_bytes_until(self):
         # character count:
         #       '0         1          2         3         4                  5         6                  '
@@ -219,6 +304,326 @@ class BytesUtilityTest(unittest.TestCase):
 
         return
 
+    def test_extract_bytes_until_03(self):
+        # character count:
+        #        0         1         2
+        #        01234567890123456789012345
+        data = b'ab..cd..ab..ef..abcdefghij'
+
+        # [ <offset>, <marker>, <step>, <max_search_length>, <expected result> ]
+        test_cases = [
+            # the marker is only found at the positions offset + n * step
+            [ 0, b'cd', 1, -1, data[:4] ],
+            [ 0, b'cd', 4, -1, data[:4] ],
+            [ 0, b'cd', 8, -1, data ],
+            [ 1, b'cd', 2, -1, data[1:] ],
+            [ 4, b'..', 4, -1, data[4:] ],
+            [ 2, b'cd', 2, -1, data[2:4] ],
+            # max_search_length limits the start of the marker, not its end
+            [ 0, b'cd', 1, 4, data[:4] ],
+            [ 0, b'cd', 1, 5, data[:4] ],
+            [ 0, b'gh', 1, 23, data[:22] ],
+            # not found: up to the first position of the search at or after
+            # max_search_length, or the end of data
+            [ 0, b'cd', 1, 3, data[:3] ],
+            [ 0, b'cd', 5, 3, data[:5] ],
+            [ 0, b'zz', 7, -1, data ],
+            [ 1, b'ij', 3, 5, data[1:7] ],
+        ]
+        for offset, marker, step, max_search_length, expected_result in test_cases:
+            for test_data in [ data, bytearray(data), memoryview(data) ]:
+                result = BytesUtility.extract_bytes_until(
+                    test_data, offset, marker, step=step, max_search_length=max_search_length
+                )
+                self.assertEqual(bytes(result), expected_result)
+
+        self.assertRaises(ValueError, BytesUtility.extract_bytes_until, data, 0, b'cd', step=0)
+        self.assertRaises(ValueError, BytesUtility.extract_bytes_until, data, 0, b'')
+        return
+
+    def test_marker_matcher(self):
+        data = b'GET / HTTP/1.1\r\nHost: x\n\nbody\x00\x00\x00'
+        matcher = BytesUtility.MarkerMatcher([ b'\n', b'\r\n', b'\n\n', b'\x00\x00' ])
+        self.assertEqual(matcher.find_first(data), (14, b'\r\n'))
+        self.assertEqual(matcher.find_first(data, 16), (23, b'\n\n'))
+        self.assertEqual(matcher.find_first(data, 16, 23), (-1, None))
+        self.assertEqual(matcher.find_first(data, 16, 24), (23, b'\n\n'))
+        self.assertEqual(matcher.find_first(data, 30), (30, b'\x00\x00'))
+        self.assertEqual(matcher.find_first(data, 31), (-1, None))
+        self.assertEqual(
+            list(matcher.find_all(data)),
+            [ (14, b'\r\n'), (23, b'\n\n'), (29, b'\x00\x00') ]
+        )
+        self.assertEqual(list(matcher.find_all(data, 15, 29)), [ (15, b'\n'), (23, b'\n\n') ])
+
+        # [ <offset>, <max_search_length>, <include_marker>, <empty_if_not_found>, <expected result> ]
+        test_cases = [
+            [ 0, -1, False, False, (data[:14], b'\r\n') ],
+            [ 0, -1, True, False, (data[:16], b'\r\n') ],
+            [ 16, -1, True, False, (data[16:25], b'\n\n') ],
+            [ 16, 7, True, False, (data[16:23], None) ],
+            [ 16, 8, True, False, (data[16:25], b'\n\n') ],
+            [ 16, 7, True, True, (b'', None) ],
+            [ 31, -1, False, False, (data[31:], None) ],
+        ]
+        for offset, max_search_length, include_marker, empty_if_not_found, expected_result in test_cases:
+            for test_data in [ data, memoryview(data) ]:
+                result, marker = matcher.extract_until(
+                    test_data, offset, max_search_length=max_search_length,
+                    include_marker=include_marker, empty_if_not_found=empty_if_not_found
+                )
+                self.assertEqual((bytes(result), marker), expected_result)
+
+        self.assertRaises(ValueError, BytesUtility.MarkerMatcher, [])
+        self.assertRaises(ValueError, BytesUtility.MarkerMatcher, [ b'\n', b'' ])
+        self.assertRaises(ValueError, matcher.find_first, data, -1)
+        return
+
+    def test_record_layout(self):
+        data = bytes(range(64))
+        field_list = [
+            ('version', 0, 1),
+            ('length', 2, 2, 'big'),
+            ('id', 4, 4, 'big', False),
+            ('offset', 8, 3, 'little', True),
+            ('tag', 11, 2, None),
+            ('flags', 13, 2),
+        ]
+        layout = BytesUtility.RecordLayout(field_list, record_size=16)
+        self.assertEqual(layout.size, 15)
+        for pos in [ 0, 16, 20, 49 ]:
+            expected_result = tuple([
+                BytesUtility.extract_bytes(data, offset, length, pos=pos) if endian is None
+                else int.from_bytes(data[pos+offset:pos+offset+length], endian, signed=signed)
+                for _, offset, length, endian, signed in layout.field_list
+            ])
+            self.assertEqual(layout.unpack(data, pos=pos), expected_result)
+            self.assertEqual(
+                layout.unpack_dict(data, pos=pos),
+                dict(zip([ field[0] for field in field_list ], expected_result))
+            )
+        self.assertEqual(layout.unpack(data)[3], 0x0a0908)
+        self.assertEqual(layout.unpack(b'\xff' * 16)[3], -1)
+        self.assertRaises(ValueError, layout.unpack, data, 50)
+
+        result = list(layout.iter_unpack(data))
+        self.assertEqual(result, [ layout.unpack(data, pos=pos) for pos in [ 0, 16, 32, 48 ] ])
+        result = list(layout.iter_unpack(memoryview(data), pos=1, count=2))
+        self.assertEqual(result, [ layout.unpack(data, pos=pos) for pos in [ 1, 17 ] ])
+        self.assertEqual(len(list(layout.iter_unpack(data, pos=1))), 3)
+        self.assertRaises(ValueError, lambda: list(layout.iter_unpack(data, pos=-8)))
+
+        # - overlapped fields, and fields in any order
+        layout = BytesUtility.RecordLayout([ ('b', 2, 2, 'big'), ('a', 0, 4), ('c', 3, 1, None) ])
+        self.assertEqual(layout.unpack(data, pos=4), (0x0607, 0x07060504, b'\x07'))
+        self.assertEqual(list(layout.iter_unpack(data[:9])), [ (0x0203, 0x03020100, b'\x03'), (0x0607, 0x07060504, b'\x07') ])
+
+        self.assertRaises(ValueError, BytesUtility.RecordLayout, [ ('a', 0, 0) ])
+        self.assertRaises(ValueError, BytesUtility.RecordLayout, [])
+        self.assertRaises(ValueError, BytesUtility.RecordLayout, [], record_size=8)
+        self.assertRaises(ValueError, BytesUtility.RecordLayout, [ ('a', 0, 2, 'middle') ])
+        self.assertRaises(ValueError, BytesUtility.RecordLayout, [ ('a', 0, 4) ], record_size=2)
+        return
+
+    def test_read_chunks(self):
+        data = bytes([v % 256 for v in range(100)])
+        # [ <chunk_size>, <offset>, <length>, <expected_chunk_lengths> ]
+        test_cases = [
+            [ 30, 0, -1, [ 30, 30, 30, 10 ] ],
+            [ 50, 0, -1, [ 50, 50 ] ],
+            [ 30, 15, -1, [ 30, 30, 25 ] ],
+            [ 30, 15, 40, [ 30, 10 ] ],
+            [ 30, 0, 200, [ 30, 30, 30, 10 ] ],
+            [ 30, 100, -1, [] ],
+            [ 30, 150, 10, [] ],
+        ]
+        for chunk_size, offset, length, expected_chunk_lengths in test_cases:
+            chunks = list(BytesUtility.read_chunks(
+                io.BytesIO(data), chunk_size=chunk_size, offset=offset, length=length
+            ))
+            self.assertEqual([len(chunk) for chunk in chunks], expected_chunk_lengths)
+            end = offset + length if length > 0 else len(data)
+            self.assertEqual(b''.join(chunks), data[offset:end])
+        with self.assertRaises(ValueError):
+            list(BytesUtility.read_chunks(io.BytesIO(data), chunk_size=0))
+        return
+
+    def test_xor_stream(self):
+        a = os.urandom(1000)
+        b = os.urandom(700)
+        a_chunks = [ a[:1], a[1:300], b'', a[300:] ]
+        for chunk_size in [ 1, 64, 4096 ]:
+            for trancate in [ True, False ]:
+                expected_result = BytesUtility.xor(a, b, trancate=trancate)
+                result = b''.join(BytesUtility.xor_stream(
+                    a_chunks, io.BytesIO(b), chunk_size=chunk_size, trancate=trancate
+                ))
+                self.assertEqual(result, expected_result)
+                result = b''.join(BytesUtility.xor_stream(
+                    io.BytesIO(b), io.BytesIO(a), chunk_size=chunk_size, trancate=trancate
+                ))
+                self.assertEqual(result, expected_result)
+
+        key = b'key'
+        expected_result = BytesUtility.xor(a, key * 400)
+        for chunk_size in [ 1, 2, 64, 4096 ]:
+            result = b''.join(BytesUtility.xor_stream_with_key(
+                io.BytesIO(a), key, chunk_size=chunk_size
+            ))
+            self.assertEqual(result, expected_result)
+        result = b''.join(BytesUtility.xor_stream_with_key(a_chunks, key))
+        self.assertEqual(result, expected_result)
+        # - a bytes-like source is data, not the name of a file
+        self.assertEqual(list(BytesUtility.xor_stream(b'\x01\x02', b'\x03\x04')), [ b'\x02\x06' ])
+        result = b''.join(BytesUtility.xor_stream(bytearray(a), memoryview(b), trancate=False))
+        self.assertEqual(result, BytesUtility.xor(a, b, trancate=False))
+        self.assertEqual(b''.join(BytesUtility.xor_stream_with_key(a, key)), expected_result)
+        self.assertEqual(list(BytesUtility.xor_stream_with_key(b'', key)), [])
+        result = b''.join(BytesUtility.xor_stream_with_key([ a[5:] ], key, key_offset=5))
+        self.assertEqual(result, expected_result[5:])
+        self.assertRaises(ValueError, lambda: list(BytesUtility.xor_stream_with_key([ a ], b'')))
+        return
+
+    def test_write_chunks(self):
+        data = os.urandom(5000)
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'xor.bin')
+            byte_count = BytesUtility.write_chunks(
+                BytesUtility.xor_stream_with_key(
+                    BytesUtility.read_chunks(io.BytesIO(data), chunk_size=1000), b'\xff'
+                ),
+                filename
+            )
+            self.assertEqual(byte_count, len(data))
+            byte_count = BytesUtility.write_chunks(
+                BytesUtility.xor_stream(filename, io.BytesIO(data), chunk_size=333),
+                filename + '.2'
+            )
+            self.assertEqual(byte_count, len(data))
+            with open(filename + '.2', 'rb') as fd:
+                self.assertEqual(fd.read(), b'\xff' * len(data))
+        return
+
+    def test_hex_encoder_and_decoder(self):
+        data = os.urandom(1000)
+        for sep, bytes_per_sep in [ ('', 1), ('-', 1), (' ', 4), (':', -3), (':', 0) ]:
+            hexstr = BytesUtility.bytes_to_hex_string(data, sep=sep, bytes_per_sep=bytes_per_sep)
+            for chunk_size in [ 1, 3, 7, 64 ]:
+                encoder = BytesUtility.HexEncoder(
+                    sep=sep, bytes_per_sep=bytes_per_sep, total_length=len(data)
+                )
+                hex_list = [
+                    encoder.encode(data[pos:pos+chunk_size])
+                    for pos in range(0, len(data), chunk_size)
+                ]
+                hex_list.append(encoder.finish())
+                self.assertEqual(''.join(hex_list), hexstr)
+                decoder = BytesUtility.HexDecoder(sep=sep)
+                bytes_list = [
+                    decoder.decode(hexstr[pos:pos+chunk_size])
+                    for pos in range(0, len(hexstr), chunk_size)
+                ]
+                bytes_list.append(decoder.finish())
+                self.assertEqual(b''.join(bytes_list), data)
+        # - separators and bytes split between chunks, with whitespace
+        decoder = BytesUtility.HexDecoder(sep='::')
+        self.assertEqual(decoder.decode('be:'), b'\xbe')
+        self.assertEqual(decoder.decode(':e\nf:'), b'\xef')
+        self.assertEqual(decoder.decode(b':0 0'), b'\x00')
+        self.assertEqual(decoder.finish(), b'')
+        decoder = BytesUtility.HexDecoder()
+        self.assertEqual(decoder.decode('abc'), b'\xab')
+        self.assertRaises(ValueError, decoder.finish)
+        self.assertRaises(ValueError, BytesUtility.HexEncoder, sep='-', bytes_per_sep=2)
+        encoder = BytesUtility.HexEncoder(sep='-', bytes_per_sep=2, total_length=3)
+        self.assertEqual(encoder.encode(b'\xbe\xef'), 'be-ef')
+        self.assertRaises(ValueError, encoder.finish)
+        return
+
+    def test_hex_file(self):
+        data = os.urandom(5000)
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'data.bin')
+            with open(filename, 'wb') as fd:
+                fd.write(data)
+            byte_count = BytesUtility.hex_encode_file(
+                filename, filename + '.hex', sep=' ', bytes_per_sep=4, chunk_size=999
+            )
+            self.assertEqual(byte_count, len(data))
+            with open(filename + '.hex') as fd:
+                self.assertEqual(fd.read(), data.hex(' ', 4))
+            byte_count = BytesUtility.hex_decode_file(
+                filename + '.hex', filename + '.2', sep=' ', chunk_size=333
+            )
+            self.assertEqual(byte_count, len(data))
+            with open(filename + '.2', 'rb') as fd:
+                self.assertEqual(fd.read(), data)
+        destination = io.BytesIO()
+        BytesUtility.hex_decode_file(io.StringIO('de ad\nbe ef\n'), destination)
+        self.assertEqual(destination.getvalue(), b'\xde\xad\xbe\xef')
+        return
+
+    def test_integers_to_bytes(self):
+        for length in range(1, 11):
+            for endian in [ 'little', 'big' ]:
+                for signed in [ False, True ]:
+                    if signed:
+                        value_list = [ 0, 1, -1, -(1 << (length * 8 - 1)), (1 << (length * 8 - 1)) - 1 ]
+                    else:
+                        value_list = [ 0, 1, 0x5a, (1 << (length * 8)) - 1 ]
+                    data = BytesUtility.integers_to_bytes(value_list, length, endian=endian, signed=signed)
+                    self.assertEqual(data, b''.join([
+                        BytesUtility.integer_to_bytes(value, length, endian=endian, signed=signed)
+                        for value in value_list
+                    ]))
+                    self.assertEqual(
+                        list(BytesUtility.bytes_to_integers(data, length, endian=endian, signed=signed)),
+                        value_list
+                    )
+                    self.assertRaises(
+                        OverflowError, BytesUtility.integers_to_bytes,
+                        value_list + [ 1 << (length * 8) ], length, endian=endian, signed=signed
+                    )
+        self.assertEqual(BytesUtility.integers_to_bytes([], 3), b'')
+        self.assertEqual(list(BytesUtility.bytes_to_integers(b'', 2)), [])
+        self.assertEqual(
+            list(BytesUtility.bytes_to_integers(memoryview(b'\x00\x01\x00\x02'), 2, endian='big')),
+            [ 1, 2 ]
+        )
+        self.assertRaises(ValueError, BytesUtility.integers_to_bytes, [ 1 ], 0)
+        self.assertRaises(ValueError, BytesUtility.bytes_to_integers, b'\x00\x01\x02', 2)
+        self.assertRaises(ValueError, BytesUtility.bytes_to_integers, b'\x00\x01', 2, endian='middle')
+        return
+
+    def test_map_file(self):
+        data = b'The quick brown fox\njumps over the lazy dog.\x00\x01\x02\x03'
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'data.bin')
+            with open(filename, 'wb') as fd:
+                fd.write(data)
+            with BytesUtility.map_file(filename) as mapped_data:
+                for buffer in [ mapped_data, memoryview(data) ]:
+                    self.assertEqual(len(buffer), len(data))
+                    self.assertEqual(
+                        BytesUtility.has_sufficient_bytes(buffer, 4, 10, pos=2), True
+                    )
+                    self.assertEqual(
+                        bytes(BytesUtility.extract_bytes(buffer, 4, 5)), b'quick'
+                    )
+                    self.assertEqual(
+                        BytesUtility.extract_integer(buffer, len(data) - 4, 4, endian='big'), 0x00010203
+                    )
+                    self.assertEqual(
+                        bytes(BytesUtility.extract_bytes_until(buffer, 0, b'\n')),
+                        b'The quick brown fox'
+                    )
+            empty_filename = os.path.join(tmp_dir, 'empty.bin')
+            with open(empty_filename, 'wb') as fd:
+                pass
+            with BytesUtility.map_file(empty_filename) as mapped_data:
+                self.assertEqual(len(mapped_data), 0)
+        return
+
 if __name__ == '__main__':
     unittest.main()
 
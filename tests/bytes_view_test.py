@@ -0,0 +1,81 @@
+# file: bytes_view_test.py
+
+import unittest
+from common_util.bytes_util import BytesUtility
+from common_util.bytes_view import BytesView
+
+class BytesViewTest(unittest.TestCase):
+
+    def test_read(self):
+        data = bytearray(b'\x01\x02\x03\x04\xff\xfeHello\x00World\x00')
+        view = BytesView(data)
+        self.assertEqual(len(view), len(data))
+        self.assertEqual(view.has_sufficient_bytes(4), True)
+        self.assertEqual(view.has_sufficient_bytes(4, offset=len(data) - 3), False)
+        self.assertEqual(view.peek_int(2), 0x0201)
+        self.assertEqual(view.read_int(2, endian='big'), 0x0102)
+        self.assertEqual(view.tell(), 2)
+        self.assertEqual(bytes(view.peek(2)), b'\x03\x04')
+        self.assertEqual(view.read_int(2), 0x0403)
+        self.assertEqual(view.read_int(2, signed=True), -257)
+        self.assertEqual(bytes(view.read_until(b'\x00')), b'Hello')
+        self.assertEqual(view.tell(), 12)
+        field = view.read_bytes(5)
+        self.assertIsInstance(field, memoryview)
+        self.assertEqual(bytes(field), b'World')
+        # - the field shares the memory of data
+        data[12] = ord('w')
+        self.assertEqual(bytes(field), b'world')
+        self.assertEqual(view.skip(1), len(data))
+        self.assertEqual(len(view), 0)
+        self.assertRaises(ValueError, view.read_bytes, 1)
+        self.assertEqual(view.seek(6), 6)
+        self.assertEqual(bytes(view.read_until(b'\x00', include_marker=True)), b'Hello\x00')
+        self.assertRaises(ValueError, view.seek, len(data) + 1)
+        return
+
+    def test_read_until(self):
+        data = b'abcd--efgh--ijkl'
+        view = BytesView(data, end_pos=11)
+        self.assertEqual(bytes(view.read_until(b'--')), b'abcd')
+        self.assertEqual(view.tell(), 6)
+        # - the marker is beyond end_pos
+        self.assertEqual(bytes(view.read_until(b'--', empty_if_not_found=True)), b'')
+        self.assertEqual(view.tell(), 6)
+        self.assertEqual(bytes(view.read_until(b'--')), b'efgh-')
+        self.assertEqual(view.tell(), 11)
+        view = BytesView(memoryview(data), pos=1)
+        self.assertEqual(bytes(view.read_until(b'--', step=2)), b'bcd--efgh--ijkl')
+        self.assertRaises(ValueError, view.read_until, b'')
+        return
+
+    def test_read_nested(self):
+        # - records of a 1-byte type, a 2-byte big endian length, and the value
+        data = b'\x01\x00\x02AB\x02\x00\x04\x10\x00\x00\x00\x03\x00\x00'
+        layout = BytesUtility.RecordLayout([ ('type', 0, 1), ('length', 1, 2, 'big') ])
+        view = BytesView(data)
+        record_list = []
+        while view.has_sufficient_bytes(3):
+            record_type, length = view.read_record(layout)
+            value_view = view.read_view(length)
+            record_list.append((record_type, bytes(value_view.read_bytes(len(value_view)))))
+        self.assertEqual(record_list, [ (1, b'AB'), (2, b'\x10\x00\x00\x00'), (3, b'') ])
+        view = BytesView(data, pos=5)
+        view.skip(3)
+        sub_view = view.read_view(4)
+        self.assertEqual(sub_view.read_int(4), 0x10)
+        self.assertRaises(ValueError, sub_view.read_int, 1)
+        # - the sub-view cannot be moved outside the bytes read
+        self.assertEqual(sub_view.seek(8), 8)
+        self.assertRaises(ValueError, sub_view.seek, 7)
+        self.assertRaises(ValueError, sub_view.seek, 0)
+        self.assertRaises(ValueError, sub_view.seek, 13)
+        self.assertEqual(sub_view.read_int(4), 0x10)
+        self.assertRaises(ValueError, BytesView, data, pos=-1)
+        self.assertRaises(ValueError, BytesView, data, end_pos=len(data) + 1)
+        return
+
+if __name__ == '__main__':
+    unittest.main()
+
+# --- end of file --- #
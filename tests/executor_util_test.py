@@ -0,0 +1,29 @@
+# file: executor_util_test.py
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from common_util.executor_util import ExecutorUtility
+
+class ExecutorUtilityTest(unittest.TestCase):
+
+    def test_map_in_order(self):
+        submitted_list = []
+        def task_list():
+            for i in range(10):
+                submitted_list.append(i)
+                yield i, (i, 3)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result_list = ExecutorUtility.map_in_order(
+                executor, pow, task_list(), max_pending=3
+            )
+            self.assertEqual(next(result_list), (0, 0))
+            # - only max_pending tasks are submitted ahead of the first result
+            self.assertEqual(submitted_list, [0, 1, 2])
+            self.assertEqual(list(result_list), [(i, i ** 3) for i in range(1, 10)])
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(list(ExecutorUtility.map_in_order(executor, pow, [])), [])
+
+if __name__ == '__main__':
+    unittest.main()
+
+# --- end of file --- #
@@ -1,6 +1,8 @@
 # file: file_index_test.py
 
 import unittest
+import os
+import tempfile
 from common_util.dir_util import DirectoryUtility
 from common_util.file_util.file_index import FileIndex
 
@@ -27,6 +29,76 @@ class FileIndexKeyGeneratorTest(unittest.TestCase):
                 print()
         return
     
+class FileIndexTest(unittest.TestCase):
+
+    def test_get_duplicate_file_list(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            create_test_files(dirname)
+            for algorithm in [ 'md5', 'blake2b-128' ]:
+                indexes = FileIndex(algorithm=algorithm)
+                indexes.add_from_directory(dirname)
+                duplicate_file_list = indexes.get_duplicate_file_list()
+                self.assertEqual(get_duplicate_filenames(duplicate_file_list), [
+                    [ 'a.bin', 'c.bin', os.path.join('sub', 'd.bin') ],
+                    [ 'empty_1.bin', 'empty_2.bin' ],
+                ])
+                for count, digest, value in duplicate_file_list:
+                    for data_item in value:
+                        self.assertEqual(data_item[3:], (digest, algorithm))
+            for workers in [ 2, 8 ]:
+                indexes = FileIndex()
+                indexes.add_from_directory(dirname, workers=workers)
+                self.assertEqual(
+                    get_duplicate_filenames(indexes.get_duplicate_file_list()),
+                    get_duplicate_filenames(duplicate_file_list)
+                )
+            for workers in [ 1, 4 ]:
+                indexes = FileIndex(staged=True, partial_size=1000)
+                indexes.add_from_directory(dirname)
+                self.assertEqual(
+                    get_duplicate_filenames(indexes.get_duplicate_file_list(workers=workers)),
+                    get_duplicate_filenames(duplicate_file_list)
+                )
+            # - b.bin has the same size as a.bin, but differs in its last byte;
+            #   e.bin has a unique size and is never hashed
+            self.assertEqual(indexes.hash_staged_files(), (0, 0))
+            indexes = FileIndex(staged=True, partial_size=1000)
+            indexes.add_from_directory(dirname)
+            self.assertEqual(indexes.hash_staged_files(), (4, 5))
+            with open(os.path.join(dirname, 'f.bin'), 'wb') as fd:
+                fd.write(b'E' * 100)
+            indexes.add_file(dirname, 'f.bin')
+            self.assertEqual(indexes.hash_staged_files(), (0, 2))
+            self.assertEqual(len(indexes.get_duplicate_file_list()), 3)
+            self.assertRaises(ValueError, FileIndex, index_type=FileIndex.INDEX_FILENAME, staged=True)
+            indexes = FileIndex(index_type=FileIndex.INDEX_FILENAME)
+            indexes.add_from_directory(dirname)
+            self.assertEqual(len(indexes.get_duplicate_file_list()), 0)
+        self.assertRaises(ValueError, FileIndex, algorithm='unknown')
+        return
+
+def create_test_files(dirname):
+    '''
+    Create files with duplicates in dirname; a.bin, c.bin and sub/d.bin are the
+    same, and so are the two empty files.
+    '''
+    content_list = [
+        ('a.bin', b'A' * 5000), ('b.bin', b'A' * 4999 + b'B'), ('c.bin', b'A' * 5000),
+        (os.path.join('sub', 'd.bin'), b'A' * 5000), ('e.bin', b'E' * 100),
+        ('empty_1.bin', b''), ('empty_2.bin', b''),
+    ]
+    os.makedirs(os.path.join(dirname, 'sub'))
+    for filename, content in content_list:
+        with open(os.path.join(dirname, filename), 'wb') as fd:
+            fd.write(content)
+    return
+
+def get_duplicate_filenames(duplicate_file_list):
+    return sorted([
+        sorted([ data_item[1] for data_item in value ])
+        for count, digest, value in duplicate_file_list
+    ])
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,76 @@
+# file: file_util_test.py
+
+import unittest
+import os
+import hashlib
+import tempfile
+from common_util.file_util import FileUtility
+
+class FileUtilityTest(unittest.TestCase):
+
+    def test_get_file_md5_hash(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            for file_size in [ 0, 1, 1000, 4096, 100000 ]:
+                data = os.urandom(file_size)
+                filename = f'data_{file_size}.bin'
+                with open(os.path.join(dirname, filename), 'wb') as fd:
+                    fd.write(data)
+                self.assertEqual(FileUtility.get_file_size(dirname, filename), file_size)
+                for buffer_size in [ 1, 4096, FileUtility.default_buffer_size ]:
+                    self.assertEqual(
+                        FileUtility.get_file_md5_hash(dirname, filename, buffer_size=buffer_size),
+                        hashlib.md5(data).hexdigest()
+                    )
+            self.assertRaises(
+                ValueError, FileUtility.get_file_md5_hash, dirname, filename, buffer_size=0
+            )
+        return
+
+    def test_get_file_hash(self):
+        data = os.urandom(10000)
+        with tempfile.TemporaryDirectory() as dirname:
+            with open(os.path.join(dirname, 'data.bin'), 'wb') as fd:
+                fd.write(data)
+            for algorithm, data_hash in [
+                ('md5', hashlib.md5(data)),
+                ('sha256', hashlib.sha256(data)),
+                ('blake2b', hashlib.blake2b(data)),
+                ('blake2b-128', hashlib.blake2b(data, digest_size=16)),
+                ('blake2s-64', hashlib.blake2s(data, digest_size=8)),
+            ]:
+                self.assertEqual(
+                    FileUtility.get_file_hash(dirname, 'data.bin', algorithm=algorithm, buffer_size=999),
+                    data_hash.hexdigest()
+                )
+            for algorithm in FileUtility.get_hash_algorithm_list():
+                digest = FileUtility.get_file_hash(dirname, 'data.bin', algorithm=algorithm)
+                self.assertGreater(len(digest), 0)
+            for algorithm in [ 'unknown', 'blake2b-7', 'blake2b-x', 'shake_128' ]:
+                self.assertRaises(
+                    ValueError, FileUtility.get_file_hash, dirname, 'data.bin', algorithm=algorithm
+                )
+        return
+
+    def test_get_file_partial_hash(self):
+        data = os.urandom(10000)
+        with tempfile.TemporaryDirectory() as dirname:
+            with open(os.path.join(dirname, 'data.bin'), 'wb') as fd:
+                fd.write(data)
+            self.assertEqual(
+                FileUtility.get_file_partial_hash(dirname, 'data.bin', partial_size=1000),
+                hashlib.md5(data[:1000] + data[-1000:]).hexdigest()
+            )
+            # - a small file is hashed in full
+            self.assertEqual(
+                FileUtility.get_file_partial_hash(dirname, 'data.bin', algorithm='sha1', partial_size=5000),
+                hashlib.sha1(data).hexdigest()
+            )
+            self.assertRaises(
+                ValueError, FileUtility.get_file_partial_hash, dirname, 'data.bin', partial_size=0
+            )
+        return
+
+if __name__ == '__main__':
+    unittest.main()
+
+# --- end of file --- #
@@ -0,0 +1,105 @@
+# file: hash_cache_test.py
+
+import unittest
+import os
+import hashlib
+import tempfile
+from common_util.file_util.file_index import FileIndex
+from common_util.file_util.hash_cache import HashCache
+
+class HashCacheTest(unittest.TestCase):
+
+    def test_get_file_hash(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            cache_filename = os.path.join(dirname, 'cache.sqlite')
+            filename = os.path.join(dirname, 'data.bin')
+            write_file(filename, b'A' * 10000)
+            with HashCache(cache_filename) as hash_cache:
+                for i in range(2):
+                    self.assertEqual(
+                        hash_cache.get_file_hash(dirname, 'data.bin'),
+                        hashlib.md5(b'A' * 10000).hexdigest()
+                    )
+                    self.assertEqual(
+                        hash_cache.get_file_partial_hash(dirname, 'data.bin', partial_size=1000),
+                        hashlib.md5(b'A' * 2000).hexdigest()
+                    )
+                hash_cache.get_file_hash(dirname, 'data.bin', algorithm='sha1')
+                self.assertEqual((hash_cache.hit_count, hash_cache.miss_count), (2, 3))
+                self.assertEqual(len(hash_cache), 3)
+            # - the digests are kept in the database file
+            with HashCache(cache_filename) as hash_cache:
+                hash_cache.get_file_hash(dirname, 'data.bin')
+                self.assertEqual((hash_cache.hit_count, hash_cache.miss_count), (1, 0))
+                # - a changed file is hashed again
+                file_stat = os.stat(filename)
+                write_file(filename, b'B' * 10000)
+                os.utime(filename, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1000000000))
+                self.assertEqual(
+                    hash_cache.get_file_hash(dirname, 'data.bin'),
+                    hashlib.md5(b'B' * 10000).hexdigest()
+                )
+                self.assertEqual((hash_cache.hit_count, hash_cache.miss_count), (1, 1))
+                self.assertEqual(len(hash_cache), 4)
+                # - only the digest of the current file is kept
+                self.assertEqual(hash_cache.prune(), 3)
+                self.assertEqual(len(hash_cache), 1)
+                os.remove(filename)
+                self.assertEqual(hash_cache.prune(), 1)
+                self.assertEqual(len(hash_cache), 0)
+        return
+
+    def test_file_changed_while_hashing(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'data.bin')
+            write_file(filename, b'A' * 10000)
+            def compute_digest():
+                # - the file is changed after it was read
+                digest = hashlib.md5(b'A' * 10000).hexdigest()
+                write_file(filename, b'B' * 20000)
+                return digest
+            with HashCache(':memory:') as hash_cache:
+                self.assertEqual(
+                    hash_cache.get_digest(dirname, 'data.bin', 'md5', HashCache.KIND_FULL, compute_digest),
+                    hashlib.md5(b'A' * 10000).hexdigest()
+                )
+                # - the digest is not stored, so the file is hashed again
+                self.assertEqual(len(hash_cache), 0)
+                self.assertEqual(
+                    hash_cache.get_file_hash(dirname, 'data.bin'),
+                    hashlib.md5(b'B' * 20000).hexdigest()
+                )
+                self.assertEqual((hash_cache.hit_count, hash_cache.miss_count), (0, 2))
+                self.assertEqual(len(hash_cache), 1)
+        return
+
+    def test_file_index(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            data_dirname = os.path.join(dirname, 'data')
+            os.makedirs(data_dirname)
+            for i in range(6):
+                write_file(os.path.join(data_dirname, f'{i}.bin'), bytes([ i % 3 ]) * 5000)
+            write_file(os.path.join(data_dirname, 'unique.bin'), b'U' * 100)
+            with HashCache(os.path.join(dirname, 'cache.sqlite')) as hash_cache:
+                for staged in [ False, True ]:
+                    for workers in [ 1, 4 ]:
+                        indexes = FileIndex(staged=staged, partial_size=1000, hash_cache=hash_cache)
+                        indexes.add_from_directory(data_dirname, workers=workers)
+                        duplicate_file_list = indexes.get_duplicate_file_list(workers=workers)
+                        self.assertEqual(
+                            sorted([ count for count, digest, value in duplicate_file_list ]),
+                            [ 2, 2, 2 ]
+                        )
+                # - 7 full hashes, and 6 partial hashes for the staged index
+                self.assertEqual(hash_cache.miss_count, 13)
+        return
+
+def write_file(filename, content):
+    with open(filename, 'wb') as fd:
+        fd.write(content)
+    return
+
+if __name__ == '__main__':
+    unittest.main()
+
+# --- end of file --- #
@@ -2,6 +2,12 @@
 
 import unittest
 import random
+import io
+import os
+import tempfile
+import subprocess
+import sys
+from common_util.bytes_util import BytesUtility
 from common_util.hexdump import HexDump
 
 class HexDumpTest(unittest.TestCase):
@@ -314,6 +320,45 @@ class HexDumpTest(unittest.TestCase):
         self.assertEqual(hexdump_array_oct[0], expected_result_02)
         return
     
+    def test_hexdump_format_lines(self):
+        data = bytes(range(0x2e, 0x2e+40))
+        # [ <kwargs>, <expected_result> ]
+        test_cases = [
+            [
+                { 'offset': 3, 'sep': 'ab', 'bytes_per_line': 8 },
+                [
+                    '00000000:             31ab32ab33ab34ab35  |   12345|',
+                    '00000008: 36ab37ab38ab39ab3Aab3Bab3Cab3D  |6789:;<=|',
+                    '00000010: 3Eab3Fab40ab41ab42ab43ab44ab45  |>?@ABCDE|',
+                    '00000018: 46ab47ab48ab49ab4Aab4Bab4Cab4D  |FGHIJKLM|',
+                    '00000020: 4Eab4Fab50ab51ab52ab53ab54ab55  |NOPQRSTU|',
+                ],
+            ],
+            [
+                { 'offset': 3, 'sep': '..', 'bytes_per_line': 8, 'dump_type': HexDump.DUMPTYPE_OCT },
+                [
+                    '00000000:                061..062..063..064..065  |   12345|',
+                    '00000008: 066..067..070..071..072..073..074..075  |6789:;<=|',
+                    '00000010: 076..077..100..101..102..103..104..105  |>?@ABCDE|',
+                    '00000018: 106..107..110..111..112..113..114..115  |FGHIJKLM|',
+                    '00000020: 116..117..120..121..122..123..124..125  |NOPQRSTU|',
+                ],
+            ],
+            [
+                { 'pos_label': 0xfffffff8, 'bytes_per_line': 8, 'length': 20 },
+                [
+                    'fffffff8: 2E 2F 30 31 32 33 34 35  |./012345|',
+                    '100000000: 36 37 38 39 3A 3B 3C 3D  |6789:;<=|',
+                    '100000008: 3E 3F 40 41              |>?@A    |',
+                ],
+            ],
+            [ { 'offset': 100, 'pos_label': 5 }, [ '00000000: ' + ' ' * 47 + '  |' + ' ' * 16 + '|' ] ],
+            [ { 'offset': 100, 'pos_label': 16 }, [] ],
+        ]
+        for kwargs, expected_result in test_cases:
+            self.assertEqual(HexDump.hexdump(data, **kwargs), expected_result)
+        return
+    
     def test_hexdump_start_and_end(self):
         verbose = True
         if verbose:
@@ -411,6 +456,389 @@ class HexDumpTest(unittest.TestCase):
             print(f'=== test end hexdump_and_print() ===')
         return
     
+    def test_hexdump_stream(self):
+        data = bytes([v % 256 for v in range(1000)])
+        # [ <kwargs> ]
+        test_cases = [
+            {}, { 'offset': 50 }, { 'length': 333 }, { 'offset': 50, 'length': 333 },
+            { 'offset': 5, 'pos_label': 0xbeef }, { 'sep': '..', 'bytes_per_line': 11 },
+            { 'offset': 7, 'align_front': False }, { 'offset': 7, 'length': 1 },
+            { 'offset': 3, 'dump_type': HexDump.DUMPTYPE_OCT },
+            { 'offset': 999 }, { 'offset': 1000 }, { 'offset': 2000, 'pos_label': 5 },
+        ]
+        for kwargs in test_cases:
+            expected_result = HexDump.hexdump(data, **kwargs)
+            for chunk_size in [ 1, 7, 16, 100, 4096 ]:
+                result = list(HexDump.hexdump_stream(
+                    io.BytesIO(data), chunk_size=chunk_size, **kwargs
+                ))
+                self.assertEqual(result, expected_result)
+        return
+    
+    def test_hexdump_stream_file(self):
+        data = bytes([v % 256 for v in range(300)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'data.bin')
+            with open(filename, 'wb') as fd:
+                fd.write(data)
+            result = list(HexDump.hexdump_stream(filename, chunk_size=64))
+        self.assertEqual(result, HexDump.hexdump(data))
+        return
+    
+    def test_hexdump_squeeze(self):
+        data = bytes(40) + b'abcd' * 8 + bytes(20) + b'xyz'
+        expected_result = [
+            '00000000: 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00  |................|',
+            '*',
+            '00000020: 00 00 00 00 00 00 00 00 61 62 63 64 61 62 63 64  |........abcdabcd|',
+            '00000030: 61 62 63 64 61 62 63 64 61 62 63 64 61 62 63 64  |abcdabcdabcdabcd|',
+            '00000040: 61 62 63 64 61 62 63 64 00 00 00 00 00 00 00 00  |abcdabcd........|',
+            '00000050: 00 00 00 00 00 00 00 00 00 00 00 00 78 79 7A     |............xyz |',
+        ]
+        self.assertEqual(HexDump.hexdump(data, squeeze=True), expected_result)
+        self.assertEqual(HexDump.hexdump(data), HexDump.hexdump(data, squeeze=False))
+        for chunk_size in [ 1, 7, 16, 100 ]:
+            result = list(HexDump.hexdump_stream(
+                io.BytesIO(data), squeeze=True, chunk_size=chunk_size
+            ))
+            self.assertEqual(result, expected_result)
+
+        # a run across chunks is squeezed into one line
+        data = b'\x01' * 16 + bytes(1024) + b'\x01' * 16
+        for chunk_size in [ 16, 33, 64 ]:
+            result = list(HexDump.hexdump_stream(
+                io.BytesIO(data), squeeze=True, chunk_size=chunk_size
+            ))
+            self.assertEqual(result, HexDump.hexdump(data, squeeze=True))
+            self.assertEqual(result.count(HexDump.squeeze_line), 1)
+            self.assertEqual(len(result), 4)
+
+        # the padded first and last lines are never squeezed
+        data = bytes(48)
+        result = HexDump.hexdump(data, pos_label=8, squeeze=True)
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result[2], HexDump.squeeze_line)
+        return
+    
+    def test_print_files_parallel(self):
+        data_list = [
+            bytes([v % 256 for v in range(1000)]),
+            b'',
+            bytes(100) + b'abc' * 50 + bytes(300) + b'xyz' * 7,
+            b'\x01' * 64 + bytes(64) + b'\x01' * 64,
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename_list = []
+            for i, data in enumerate(data_list):
+                filename = os.path.join(tmp_dir, f'data_{i}.bin')
+                with open(filename, 'wb') as fd:
+                    fd.write(data)
+                filename_list.append(filename)
+            # [ <offset>, <length> ]
+            range_list = [ [ 0, -1 ], [ 5, -1 ], [ 40, 100 ], [ 37, 500 ], [ 900, 300 ] ]
+            for squeeze in [ False, True ]:
+                for offset, length in range_list:
+                    fout_expected = io.StringIO()
+                    HexDump.print_files(
+                        filename_list, offset=offset, length=length, squeeze=squeeze,
+                        fout=fout_expected
+                    )
+                    for part_size in [ 16, 32, 100, 4096 ]:
+                        fout = io.StringIO()
+                        HexDump.print_files(
+                            filename_list, offset=offset, length=length, squeeze=squeeze,
+                            jobs=2, part_size=part_size, fout=fout
+                        )
+                        self.assertEqual(fout.getvalue(), fout_expected.getvalue())
+        return
+    
+    def test_print_files_parallel_pipe(self):
+        data = bytes([v % 256 for v in range(1000)]) + bytes(500)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'data.bin')
+            with open(filename, 'wb') as fd:
+                fd.write(data)
+            for option_list in [ [], [ '-s' ], [ '-o', '40', '-n', '700' ] ]:
+                # - /dev/stdin is a pipe, which cannot seek and has no size
+                result_list = [
+                    subprocess.run(
+                        [ sys.executable, '-m', 'common_util.hexdump' ] + option_list
+                        + jobs_option + [ filename, '/dev/stdin', filename ],
+                        input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+                    ).stdout
+                    for jobs_option in [ [], [ '-j', '2' ] ]
+                ]
+                self.assertEqual(result_list[0], result_list[1])
+                # - the pipe has the same bytes as the file
+                section_list = [
+                    section.split(b'\n', 1)[1] for section in result_list[0].split(b'=== file: ')[1:]
+                ]
+                self.assertEqual(len(section_list), 3)
+                self.assertEqual(section_list[0], section_list[1])
+                self.assertEqual(section_list[0], section_list[2])
+        return
+
+    def test_print_files_offset_and_start_and_end(self):
+        data = bytes([v % 256 for v in range(1000)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'data.bin')
+            with open(filename, 'wb') as fd:
+                fd.write(data)
+
+            fout = io.StringIO()
+            HexDump.print_files([ filename ], offset=37, length=100, fout=fout)
+            expected_result = [ f'=== file: {filename}' ]
+            expected_result.extend(HexDump.hexdump(data, offset=37, length=100))
+            expected_result.extend([ '', '' ])
+            self.assertEqual(fout.getvalue().split('\n'), expected_result)
+
+            # [ <byte_count_start>, <byte_count_end> ]
+            test_cases = [ [ 48, 48 ], [ 100, 0 ], [ 0, 33 ], [ 600, 600 ] ]
+            for byte_count_start, byte_count_end in test_cases:
+                fout = io.StringIO()
+                HexDump.print_files_start_and_end(
+                    [ filename ], byte_count_start=byte_count_start,
+                    byte_count_end=byte_count_end, fout=fout
+                )
+                expected_result = [ f'=== file: {filename}' ]
+                expected_result.extend(HexDump.hexdump_start_and_end(
+                    data, byte_count_start=byte_count_start, byte_count_end=byte_count_end
+                ))
+                expected_result.extend([ '', '' ])
+                self.assertEqual(fout.getvalue().split('\n'), expected_result)
+        return
+    
+    def test_hexdump_start_and_end_stream(self):
+        for data_length in [ 0, 1, 47, 48, 95, 96, 97, 100, 1000, 5000 ]:
+            data = bytes([v % 251 for v in range(data_length)])
+            # [ <byte_count_start>, <byte_count_end> ]
+            test_cases = [ [ 48, 48 ], [ 100, 0 ], [ 0, 33 ], [ 600, 600 ], [ 0, 0 ], [ 5, 3000 ] ]
+            for byte_count_start, byte_count_end in test_cases:
+                expected_result = HexDump.hexdump_start_and_end(
+                    data, byte_count_start=byte_count_start, byte_count_end=byte_count_end
+                )
+                for chunk_size in [ 1, 10, 64, 4096 ]:
+                    self.assertEqual(
+                        HexDump.hexdump_start_and_end_stream(
+                            io.BytesIO(data), byte_count_start=byte_count_start,
+                            byte_count_end=byte_count_end, chunk_size=chunk_size
+                        ),
+                        expected_result
+                    )
+        # - from a pipe, on the command line
+        data = bytes([v % 256 for v in range(1000)])
+        result = subprocess.run(
+            [ sys.executable, '-m', 'common_util.hexdump', '--head-bytes', '20',
+             '--tail-bytes', '40', '/dev/stdin' ],
+            input=data, stdout=subprocess.PIPE, check=True
+        ).stdout.decode().split('\n')
+        self.assertEqual(
+            result[1:-2], HexDump.hexdump_start_and_end(data, byte_count_start=20, byte_count_end=40)
+        )
+        result = subprocess.run(
+            [ sys.executable, '-m', 'common_util.hexdump', '--head-bytes', '20', '-j', '2',
+             '/dev/stdin' ],
+            input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self.assertNotEqual(result.returncode, 0)
+        return
+
+    def test_main_conflicting_options(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'data.bin')
+            with open(filename, 'wb') as fd:
+                fd.write(bytes(100))
+            option_list_list = [
+                [ '-d', '-o', '16' ], [ '-d', '-n', '16' ], [ '-d', '-s' ], [ '-d', '-j', '2' ],
+                [ '-d', '--head-bytes', '16' ], [ '-d', '--tail-bytes', '16' ],
+                [ '-d', '--search', '00' ],
+                [ '--search', '00', '-o', '16' ], [ '--search', '00', '-n', '16' ],
+                [ '--search', '00', '-s' ], [ '--search', '00', '-j', '2' ],
+                [ '--search', '00', '--head-bytes', '16' ], [ '--search', '00', '--tail-bytes', '16' ],
+                [ '-C', '2' ], [ '-d', '-C', '2' ],
+            ]
+            for option_list in option_list_list:
+                argument_list = [ filename, filename ] if '-d' in option_list else [ filename ]
+                result = subprocess.run(
+                    [ sys.executable, '-m', 'common_util.hexdump' ] + option_list + argument_list,
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                )
+                self.assertEqual(result.returncode, 2, option_list)
+                self.assertIn(b'not allowed', result.stderr)
+            result = subprocess.run(
+                [ sys.executable, '-m', 'common_util.hexdump', '--search', '00', '-C', '-5', filename ],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            self.assertEqual(result.returncode, 2)
+            self.assertIn(b'cannot be negative', result.stderr)
+            result = subprocess.run(
+                [ sys.executable, '-m', 'common_util.hexdump', '--search', '00', '-C', '2', filename ],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            self.assertEqual(result.returncode, 0)
+        return
+
+    def test_write_hexdump(self):
+        data = bytes([v % 256 for v in range(1000)])
+        hexdump_array = HexDump.hexdump(data)
+        for prefix in [ '', '  ', '> ' ]:
+            expected_result = ''.join([ f'{prefix}{line}\n' for line in hexdump_array ])
+            fout = io.StringIO()
+            HexDump.print_hexdump(hexdump_array, prefix=prefix, fout=fout)
+            self.assertEqual(fout.getvalue(), expected_result)
+            for lines_per_write in [ 1, 7, 63, 64, 1000 ]:
+                fout = io.StringIO()
+                HexDump.write_hexdump(
+                    iter(hexdump_array), prefix=prefix, fout=fout,
+                    lines_per_write=lines_per_write
+                )
+                self.assertEqual(fout.getvalue(), expected_result)
+                fout = io.BytesIO()
+                HexDump.write_hexdump(
+                    hexdump_array, prefix=prefix, fout=fout, binary=True,
+                    lines_per_write=lines_per_write
+                )
+                self.assertEqual(fout.getvalue(), expected_result.encode())
+                fout = io.BytesIO()
+                HexDump.write_hexdump(
+                    [ line.encode() for line in hexdump_array ], prefix=prefix, fout=fout,
+                    binary=True, lines_per_write=lines_per_write
+                )
+                self.assertEqual(fout.getvalue(), expected_result.encode())
+        fout = io.StringIO()
+        HexDump.write_hexdump([], fout=fout)
+        self.assertEqual(fout.getvalue(), '')
+        return
+    
+    def test_hexdump_diff(self):
+        data1 = bytes(range(100))
+        data2 = data1[:17] + b'\xff' + data1[18:] + b'xyz'
+        expected_result = [
+            '- 00000010: 10 11 12 13 14 15 16 17 18 19 1A 1B 1C 1D 1E 1F  |................|',
+            '+ 00000010: 10 FF 12 13 14 15 16 17 18 19 1A 1B 1C 1D 1E 1F  |................|',
+            '               ^^                                              ^',
+            '- 00000060: 60 61 62 63                                      |`abc            |',
+            '+ 00000060: 60 61 62 63 78 79 7A                             |`abcxyz         |',
+            '                        ^^ ^^ ^^                                  ^^^',
+        ]
+        self.assertEqual(HexDump.hexdump_diff(data1, data2), expected_result)
+        self.assertEqual(HexDump.hexdump_diff(data1, data1), [])
+        self.assertEqual(HexDump.hexdump_diff(b'', b''), [])
+
+        result = HexDump.hexdump_diff(data1, data1[:40])
+        self.assertEqual(len(result), 3 + 4 * 2)
+        self.assertEqual(result[-2], '- 00000060: 60 61 62 63                                      |`abc            |')
+
+        for chunk_size in [ 1, 16, 40, 4096 ]:
+            for data_a, data_b in [ (data1, data2), (data2, data1), (data1, data1[:40]) ]:
+                expected_result = HexDump.hexdump_diff(data_a, data_b, dump_type=HexDump.DUMPTYPE_OCT)
+                self.assertEqual(
+                    HexDump.hexdump_diff(
+                        data_a, data_b, dump_type=HexDump.DUMPTYPE_OCT, chunk_size=chunk_size
+                    ),
+                    expected_result
+                )
+                result = list(HexDump.hexdump_diff_stream(
+                    io.BytesIO(data_a), io.BytesIO(data_b), dump_type=HexDump.DUMPTYPE_OCT,
+                    chunk_size=chunk_size
+                ))
+                self.assertEqual(result, expected_result)
+        return
+    
+    def test_hexdump_search(self):
+        data = bytes(range(256)) * 3
+        self.assertEqual(list(HexDump.find_pattern(data, '0F 10')), [ 15, 271, 527 ])
+        self.assertEqual(list(HexDump.find_pattern(memoryview(data), b'\x0f\x10')), [ 15, 271, 527 ])
+        self.assertEqual(list(HexDump.find_pattern(b'aaaa', b'aa')), [ 0, 1, 2 ])
+        self.assertEqual(list(HexDump.find_pattern(data, b'zzz')), [])
+        self.assertRaises(ValueError, lambda: list(HexDump.find_pattern(data, b'')))
+
+        expected_result = [
+            '00000000: 00 01 02 03 04 05 06 07 08 09 0A 0B 0C 0D 0E 0F  |................|',
+            '                                                       ^^                  ^',
+            '00000010: 10 11 12 13 14 15 16 17 18 19 1A 1B 1C 1D 1E 1F  |................|',
+            '          ^^                                                ^',
+            '--',
+            '00000100: 00 01 02 03 04 05 06 07 08 09 0A 0B 0C 0D 0E 0F  |................|',
+        ]
+        result = list(HexDump.hexdump_search(data, '0F 10', context=4))
+        self.assertEqual(len(result), 14)
+        self.assertEqual(result[:len(expected_result)], expected_result)
+
+        # - matches close to each other are shown in a single group of lines
+        result = list(HexDump.hexdump_search(data, b'\x20', context=256))
+        self.assertEqual([ line for line in result if ':' in line ], HexDump.hexdump(data))
+        self.assertEqual(len(result), len(HexDump.hexdump(data)) + 3)
+
+        # - a match at the end of a partial line
+        result = list(HexDump.hexdump_search(data[:20], b'\x13', context=0))
+        self.assertEqual(result, [
+            '00000010: 10 11 12 13                                      |....            |',
+            '                   ^^                                          ^',
+        ])
+        return
+    
+    def test_hexdump_line_cache(self):
+        data = bytes([ random.randint(0, 255) for _ in range(1000) ])
+        cache = HexDump.LineCache(max_lines=20, lines_per_page=4)
+        test_data_list = [
+            { 'offset':0 },
+            { 'offset':100, 'length':200 },
+            { 'offset':90, 'length':200 },
+            { 'offset':100, 'length':200, 'pos_label':5 },
+            { 'offset':7, 'length':500, 'align_front':False },
+            { 'offset':-50, 'length':30 },
+            { 'offset':33, 'length':400, 'sep':'', 'bytes_per_line':7 },
+            { 'offset':33, 'length':400, 'dump_type':HexDump.DUMPTYPE_OCT },
+            { 'offset':200, 'length':10 },
+            { 'offset':2000, 'length':10 },
+        ]
+        for test_data in test_data_list * 2:
+            with self.subTest(test_data=test_data):
+                self.assertEqual(
+                    HexDump.hexdump(data, cache=cache, **test_data),
+                    HexDump.hexdump(data, **test_data)
+                )
+                self.assertLessEqual(len(cache), 20)
+        self.assertGreater(cache.hit_count, 0)
+
+        # - the cache is looked up by the bytes, so a modified byte stream is
+        #   formatted again
+        cache = HexDump.LineCache()
+        data = bytearray(data)
+        HexDump.hexdump(data, cache=cache)
+        hit_count = cache.hit_count
+        data[500] ^= 0xff
+        self.assertEqual(HexDump.hexdump(data, cache=cache), HexDump.hexdump(data))
+        self.assertEqual(cache.miss_count, 4 + 1)
+        self.assertEqual(cache.hit_count, hit_count + 3)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        return
+    
+    def test_hexdump_mmap(self):
+        data = bytes([v % 256 for v in range(1000)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'data.bin')
+            with open(filename, 'wb') as fd:
+                fd.write(data)
+            with BytesUtility.map_file(filename) as mapped_data:
+                self.assertEqual(
+                    HexDump.hexdump(mapped_data, offset=50, length=100),
+                    HexDump.hexdump(data, offset=50, length=100)
+                )
+                self.assertEqual(
+                    HexDump.hexdump_start_and_end(mapped_data, pos_label=0xbeef),
+                    HexDump.hexdump_start_and_end(data, pos_label=0xbeef)
+                )
+                view = memoryview(mapped_data)
+                self.assertEqual(
+                    HexDump.hexdump(view, offset=-70, dump_type=HexDump.DUMPTYPE_OCT),
+                    HexDump.hexdump(data, offset=-70, dump_type=HexDump.DUMPTYPE_OCT)
+                )
+                view.release()
+        return
+    
 if __name__ == '__main__':
     unittest.main()
 
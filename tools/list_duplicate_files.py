@@ -1,13 +1,17 @@
 # file: list_duplicate_files.py
 
 import argparse
+from common_util.file_util import FileUtility
 from common_util.file_util.file_index import FileIndex
+from common_util.file_util.hash_cache import HashCache
 
 def list_duplicate_files(dirname_list, pattern='*',
-                         by='digest', include_hidden=False, verbose=False):
+                         by='digest', algorithm='md5', include_hidden=False,
+                         workers=1, staged=True, hash_cache=None, verbose=False):
     if verbose:
         print(f'dirname_list: {dirname_list}')
         print(f'pattern: {pattern}')
+        print(f'algorithm: {algorithm}')
 
     index_type_list = {
         'digest': FileIndex.INDEX_DIGEST,
@@ -15,14 +19,18 @@ def list_duplicate_files(dirname_list, pattern='*',
     }
 
     index_type = index_type_list.get(by, FileIndex.INDEX_DIGEST)
-    indexes = FileIndex(index_type=index_type)
+    # - staged hashing only applies to duplication by digest
+    staged = staged and index_type == FileIndex.INDEX_DIGEST
+    indexes = FileIndex(
+        index_type=index_type, algorithm=algorithm, staged=staged, hash_cache=hash_cache
+    )
     for dirname in dirname_list:
         indexes.add_from_directory(
             dirname, pattern=pattern, include_hidden=include_hidden,
-            verbose=verbose
+            workers=workers, verbose=verbose
         )
 
-    duplicate_file_list = indexes.get_duplicate_file_list(verbose=verbose)
+    duplicate_file_list = indexes.get_duplicate_file_list(workers=workers, verbose=verbose)
 
     print(f'Result:')
     for count, digest, value in duplicate_file_list:
@@ -46,14 +54,48 @@ def main():
     parser.add_argument('-b', '--by', choices=['digest', 'filename'],
                         default='digest',
                         help='attribute to determine duplication')
+    parser.add_argument('--algorithm', default='md5',
+                        help='hash algorithm for the digest of files, e.g. md5, sha256,'
+                        ' blake2b-128, or xxh3_128 if xxhash is installed'
+                        f' (available: {", ".join(FileUtility.get_hash_algorithm_list())})')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of threads to compute the digests of files')
+    parser.add_argument('--no-staged', dest='staged', action='store_false', default=True,
+                        help='hash every file in full, instead of only the files with'
+                        ' the same size and the same partial digest')
+    parser.add_argument('--cache', default=None,
+                        help='file of the hash cache, to reuse the digests of unchanged'
+                        ' files from earlier runs')
+    parser.add_argument('--prune-cache', action='store_true', default=False,
+                        help='remove the digests of deleted or changed files from the'
+                        ' hash cache before checking for duplicates')
     parser.add_argument('-v', '--verbose', action='store_true', default=False,
                         help='show more information while running')
     args = parser.parse_args()
 
-    list_duplicate_files(
-        args.dirname, pattern=args.pattern,
-        by=args.by, include_hidden=args.include_hidden, verbose=args.verbose
-    )
+    try:
+        FileUtility.create_hash(args.algorithm)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.prune_cache and args.cache is None:
+        parser.error('--prune-cache requires --cache')
+
+    hash_cache = None
+    if args.cache is not None:
+        hash_cache = HashCache(args.cache)
+    try:
+        if args.prune_cache:
+            removed_count = hash_cache.prune()
+            print(f'Pruned {removed_count} digests from the hash cache')
+        list_duplicate_files(
+            args.dirname, pattern=args.pattern,
+            by=args.by, algorithm=args.algorithm,
+            include_hidden=args.include_hidden, workers=args.workers,
+            staged=args.staged, hash_cache=hash_cache, verbose=args.verbose
+        )
+    finally:
+        if hash_cache is not None:
+            hash_cache.close()
 
     return
 